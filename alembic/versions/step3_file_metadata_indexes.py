@@ -0,0 +1,34 @@
+"""step3_file_metadata_indexes
+
+Revision ID: step3_file_indexes
+Revises: step2_users
+Create Date: 2025-09-01 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'step3_file_indexes'
+down_revision: Union[str, None] = 'step2_users'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Expired file cleanup: WHERE expires_at <= now
+    op.create_index(op.f('ix_file_storage_metadata_expires_at'), 'file_storage_metadata', ['expires_at'])
+    # User file listing: WHERE user_id = ? ORDER BY created_at DESC
+    op.create_index('ix_file_storage_metadata_user_created', 'file_storage_metadata', ['user_id', 'created_at'])
+    # User file listing by type: WHERE user_id = ? AND file_type = ? ORDER BY created_at DESC
+    op.create_index('ix_file_storage_metadata_user_type_created', 'file_storage_metadata',
+                    ['user_id', 'file_type', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_file_storage_metadata_user_type_created', table_name='file_storage_metadata')
+    op.drop_index('ix_file_storage_metadata_user_created', table_name='file_storage_metadata')
+    op.drop_index(op.f('ix_file_storage_metadata_expires_at'), table_name='file_storage_metadata')
@@ -0,0 +1,109 @@
+"""step4_corpus_files
+
+Revision ID: step4_corpus_files
+Revises: step3_file_indexes
+Create Date: 2025-09-08 12:00:00.000000
+
+Existing single-file tasks become corpora of one file. Their files were
+saved under the API's local upload directory (or at arbitrary storage
+keys), while everything from this revision on reads corpus files from
+``{user_id}/corpus/{task_id}/{corpus_file_id}.{ext}``, so the migration
+copies each task's files to the computed paths in storage (audio with its
+seek index) and points the task at the copies. Files that can't be found
+are reported and left as they are; the originals are never deleted.
+"""
+import io
+import logging
+import os
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'step4_corpus_files'
+down_revision: Union[str, None] = 'step3_file_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+alignment_status = sa.Enum('PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', name='alignmentstatus')
+
+
+def upgrade() -> None:
+    op.create_table('corpus_files',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('original_audio_filename', sa.String(length=255), nullable=False),
+        sa.Column('original_text_filename', sa.String(length=255), nullable=False),
+        sa.Column('status', alignment_status, nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['task_id'], ['alignment_queue.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_corpus_files_id'), 'corpus_files', ['id'])
+    op.create_index(op.f('ix_corpus_files_task_id'), 'corpus_files', ['task_id'])
+
+    # Existing single-file tasks become corpora of one file
+    op.execute("""
+        INSERT INTO corpus_files (task_id, original_audio_filename, original_text_filename, status, error_message)
+        SELECT id, original_audio_filename, original_text_filename, status, error_message FROM alignment_queue
+    """)
+    _copy_legacy_files()
+
+    # Task paths now only mirror the first corpus file and are set after it is inserted
+    op.alter_column('alignment_queue', 'audio_file_path', existing_type=sa.String(length=500), nullable=True)
+    op.alter_column('alignment_queue', 'text_file_path', existing_type=sa.String(length=500), nullable=True)
+
+
+def _read_legacy_file(storage, path: Optional[str]) -> Optional[bytes]:
+    if not path:
+        return None
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            return f.read()
+    return storage.download_file(path)
+
+
+def _copy_legacy_files() -> None:
+    """Copy the files of migrated tasks to their corpus file paths."""
+    from api.domains.alignment.audio import store_corpus_audio
+    from api.domains.alignment.paths import corpus_file_path, file_extension
+    from shared.storage import minio_service
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("""
+        SELECT q.id, q.user_id, q.audio_file_path, q.text_file_path,
+               c.id AS corpus_file_id, c.original_audio_filename, c.original_text_filename
+        FROM alignment_queue q JOIN corpus_files c ON c.task_id = q.id
+        WHERE q.user_id IS NOT NULL
+    """)).fetchall()
+    for row in rows:
+        audio = _read_legacy_file(minio_service, row.audio_file_path)
+        text = _read_legacy_file(minio_service, row.text_file_path)
+        if audio is None or text is None:
+            logger.warning(f"Files of task {row.id} not found, not copied")
+            continue
+        audio_extension = file_extension(row.original_audio_filename)
+        audio_path = corpus_file_path(row.user_id, row.id, row.corpus_file_id, audio_extension)
+        text_path = corpus_file_path(row.user_id, row.id, row.corpus_file_id, file_extension(row.original_text_filename))
+        if not (store_corpus_audio(minio_service, audio_path, audio, audio_extension)
+                and minio_service.upload_file(text_path, io.BytesIO(text), len(text), "text/plain")):
+            logger.warning(f"Files of task {row.id} could not be copied")
+            continue
+        connection.execute(
+            sa.text("UPDATE alignment_queue SET audio_file_path = :audio, text_file_path = :text WHERE id = :id"),
+            {"audio": audio_path, "text": text_path, "id": row.id}
+        )
+
+
+def downgrade() -> None:
+    op.alter_column('alignment_queue', 'text_file_path', existing_type=sa.String(length=500), nullable=False)
+    op.alter_column('alignment_queue', 'audio_file_path', existing_type=sa.String(length=500), nullable=False)
+    op.drop_index(op.f('ix_corpus_files_task_id'), table_name='corpus_files')
+    op.drop_index(op.f('ix_corpus_files_id'), table_name='corpus_files')
+    op.drop_table('corpus_files')
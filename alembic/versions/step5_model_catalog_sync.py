@@ -0,0 +1,57 @@
+"""step5_model_catalog_sync
+
+Revision ID: step5_model_sync
+Revises: step4_corpus_files
+Create Date: 2025-09-10 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'step5_model_sync'
+down_revision: Union[str, None] = 'step4_corpus_files'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Removed models are soft-deleted so that tasks referencing them stay valid
+    op.add_column('mfa_models', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_mfa_models_deleted_at'), 'mfa_models', ['deleted_at'])
+
+    # Catalog sync upserts by (name, model_type, version); drop duplicates left by earlier syncs,
+    # keeping the lowest id. Tasks referencing a duplicate are repointed to the kept model first.
+    for column in ('acoustic_model_id', 'dictionary_model_id', 'g2p_model_id'):
+        op.execute(f"""
+            UPDATE alignment_queue task
+            JOIN mfa_models duplicate ON duplicate.id = task.{column}
+            JOIN (
+                SELECT name, model_type, version, MIN(id) AS id
+                FROM mfa_models
+                GROUP BY name, model_type, version
+            ) kept
+              ON kept.name = duplicate.name
+             AND kept.model_type = duplicate.model_type
+             AND kept.version = duplicate.version
+            SET task.{column} = kept.id
+            WHERE kept.id < duplicate.id
+        """)
+    op.execute("""
+        DELETE duplicate FROM mfa_models duplicate
+        JOIN mfa_models kept
+          ON kept.name = duplicate.name
+         AND kept.model_type = duplicate.model_type
+         AND kept.version = duplicate.version
+         AND kept.id < duplicate.id
+    """)
+    op.create_unique_constraint('uq_mfa_models_name_type_version', 'mfa_models', ['name', 'model_type', 'version'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_mfa_models_name_type_version', 'mfa_models', type_='unique')
+    op.drop_index(op.f('ix_mfa_models_deleted_at'), table_name='mfa_models')
+    op.drop_column('mfa_models', 'deleted_at')
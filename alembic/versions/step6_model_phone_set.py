@@ -0,0 +1,27 @@
+"""step6_model_phone_set
+
+Revision ID: step6_model_phone_set
+Revises: step5_model_sync
+Create Date: 2025-09-12 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'step6_model_phone_set'
+down_revision: Union[str, None] = 'step5_model_sync'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Phone set from the model's meta.json in the mfa-models repository
+    op.add_column('mfa_models', sa.Column('phone_set', sa.String(length=50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('mfa_models', 'phone_set')
@@ -0,0 +1,41 @@
+"""step7_catalog_refreshes
+
+Revision ID: step7_catalog_refreshes
+Revises: step6_model_phone_set
+Create Date: 2025-09-14 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'step7_catalog_refreshes'
+down_revision: Union[str, None] = 'step6_model_phone_set'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('catalog_refreshes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='refreshstatus'), nullable=False),
+        sa.Column('active', sa.Boolean(), nullable=True),
+        sa.Column('updated_models', sa.Integer(), nullable=True),
+        sa.Column('updated_languages', sa.Integer(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        # Single-flight: only one refresh can be active
+        sa.UniqueConstraint('active')
+    )
+    op.create_index(op.f('ix_catalog_refreshes_id'), 'catalog_refreshes', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_catalog_refreshes_id'), table_name='catalog_refreshes')
+    op.drop_table('catalog_refreshes')
@@ -0,0 +1,28 @@
+"""step8_alignment_enqueued_at
+
+Revision ID: step8_alignment_enqueued_at
+Revises: step7_catalog_refreshes
+Create Date: 2025-09-21 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'step8_alignment_enqueued_at'
+down_revision: Union[str, None] = 'step7_catalog_refreshes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('alignment_queue', sa.Column('enqueued_at', sa.DateTime(timezone=True), nullable=True))
+    # Existing tasks are not known to be lost, don't re-publish them
+    op.execute("UPDATE alignment_queue SET enqueued_at = created_at WHERE celery_task_id IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('alignment_queue', 'enqueued_at')
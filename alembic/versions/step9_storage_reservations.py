@@ -0,0 +1,28 @@
+"""step9_storage_reservations
+
+Revision ID: step9_storage_reservations
+Revises: step8_alignment_enqueued_at
+Create Date: 2025-09-28 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'step9_storage_reservations'
+down_revision: Union[str, None] = 'step8_alignment_enqueued_at'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('reserved_storage', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('reserved_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'reserved_at')
+    op.drop_column('users', 'reserved_storage')
@@ -1,9 +1,15 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from typing import AsyncIterator, Dict
 import os
+import threading
 from dotenv import load_dotenv
 
+from api.db_pool import PoolSettings, timed_pool_class
+
 load_dotenv()
 
 # Database configuration
@@ -15,14 +21,108 @@ MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "align")
 
 DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
 
-engine = create_engine(DATABASE_URL)
+# Async drivers for the sync drivers used by DATABASE_URL
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Return ``url`` with its driver replaced by the matching asyncio driver."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+# Optional read replica; same credentials and schema as the primary
+MYSQL_REPLICA_HOST = os.getenv("MYSQL_REPLICA_HOST")
+MYSQL_REPLICA_PORT = os.getenv("MYSQL_REPLICA_PORT", MYSQL_PORT)
+REPLICA_DATABASE_URL = (
+    f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_REPLICA_HOST}:{MYSQL_REPLICA_PORT}/{MYSQL_DATABASE}"
+    if MYSQL_REPLICA_HOST else None
+)
+
+# Pool sizing for this process: "api" or "worker"
+DB_POOL_ROLE = os.getenv("DB_POOL_ROLE", "api")
+pool_settings = PoolSettings.from_env(DB_POOL_ROLE)
+
+# Sync engine: sync endpoints, scripts and Celery workers
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=timed_pool_class("primary"),
+    **pool_settings.engine_options()
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engine = create_engine(
+    REPLICA_DATABASE_URL,
+    poolclass=timed_pool_class("replica"),
+    **pool_settings.engine_options()
+) if REPLICA_DATABASE_URL else None
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine else None
+
 Base = declarative_base()
 
+# Async engines for async endpoints; created on first use so that processes
+# which never touch them (workers, scripts) don't need the async driver
+ASYNC_DATABASE_URLS = {"primary": ASYNC_DATABASE_URL}
+if REPLICA_DATABASE_URL:
+    ASYNC_DATABASE_URLS["replica"] = to_async_url(REPLICA_DATABASE_URL)
+
+_async_engines: Dict[str, AsyncEngine] = {}
+_async_session_factories: Dict[str, async_sessionmaker] = {}
+_async_engine_lock = threading.Lock()
+
+
+def get_async_engine(name: str = "primary") -> AsyncEngine:
+    if name not in _async_engines:
+        with _async_engine_lock:
+            if name not in _async_engines:
+                async_engine = create_async_engine(
+                    ASYNC_DATABASE_URLS[name],
+                    poolclass=timed_pool_class(f"{name}_async", async_driver=True),
+                    **pool_settings.engine_options()
+                )
+                _async_session_factories[name] = async_sessionmaker(
+                    async_engine, autoflush=False, expire_on_commit=False
+                )
+                _async_engines[name] = async_engine
+    return _async_engines[name]
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    get_async_engine()
+    return _async_session_factories["primary"]()
+
+
+def ReplicaAsyncSessionLocal() -> AsyncSession:
+    get_async_engine("replica")
+    return _async_session_factories["replica"]()
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections, e.g. on application shutdown."""
+    with _async_engine_lock:
+        engines = list(_async_engines.values())
+        _async_engines.clear()
+        _async_session_factories.clear()
+    for async_engine in engines:
+        await async_engine.dispose()
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,186 @@
+"""
+Database connection pool configuration and metrics.
+
+Pool sizing comes from the environment, per process role: ``DB_POOL_ROLE``
+selects the role (``api`` or ``worker``), ``DB_POOL_*`` sets values for all
+roles and ``API_DB_POOL_*`` / ``WORKER_DB_POOL_*`` override them for one.
+Connections are pre-pinged and recycled before MySQL's ``wait_timeout``
+closes them, which is what causes "server has gone away" errors.
+
+Pools are instrumented to record how long checkouts wait for a connection,
+so the pool can be sized from data. ``render_prometheus`` exposes the
+counters in the Prometheus text format.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Defaults per role: API processes serve many concurrent requests, worker
+# processes run one task at a time
+ROLE_DEFAULTS = {
+    "api": {"size": 10, "max_overflow": 20},
+    "worker": {"size": 2, "max_overflow": 2},
+}
+
+# Upper bounds (seconds) of the checkout wait histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _env(role: str, name: str, default: str) -> str:
+    return os.getenv(f"{role.upper()}_DB_POOL_{name}", os.getenv(f"DB_POOL_{name}", default))
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Sizing and connection lifetime settings of one engine's pool."""
+    size: int = 10
+    max_overflow: int = 20
+    timeout: float = 10.0
+    recycle: int = 1800
+    pre_ping: bool = True
+
+    @classmethod
+    def from_env(cls, role: str = "api") -> "PoolSettings":
+        defaults = ROLE_DEFAULTS.get(role, ROLE_DEFAULTS["api"])
+        return cls(
+            size=int(_env(role, "SIZE", str(defaults["size"]))),
+            max_overflow=int(_env(role, "MAX_OVERFLOW", str(defaults["max_overflow"]))),
+            timeout=float(_env(role, "TIMEOUT", "10")),
+            recycle=int(_env(role, "RECYCLE", "1800")),
+            pre_ping=_env(role, "PRE_PING", "true").lower() == "true",
+        )
+
+    def engine_options(self) -> Dict:
+        """Keyword arguments for ``create_engine`` / ``create_async_engine``."""
+        return {
+            "pool_size": self.size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.timeout,
+            "pool_recycle": self.recycle,
+            "pool_pre_ping": self.pre_ping,
+        }
+
+
+@dataclass
+class PoolMetrics:
+    """Checkout counters of one pool."""
+    name: str
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    wait_buckets: List[int] = field(default_factory=lambda: [0] * len(WAIT_BUCKETS))
+    pool: Optional[QueuePool] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_checkout(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if waited <= bound:
+                    self.wait_buckets[i] += 1
+
+    def snapshot(self) -> Dict:
+        """Counters together with the pool's current state."""
+        pool = self.pool
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_buckets": dict(zip(WAIT_BUCKETS, self.wait_buckets)),
+                "size": pool.size() if pool else 0,
+                "checked_out": pool.checkedout() if pool else 0,
+                "overflow": max(0, pool.overflow()) if pool else 0,
+                "checked_in": pool.checkedin() if pool else 0,
+            }
+
+
+_registry: Dict[str, PoolMetrics] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = PoolMetrics(name)
+        return _registry[name]
+
+
+def all_pool_metrics() -> List[PoolMetrics]:
+    with _registry_lock:
+        return list(_registry.values())
+
+
+class _TimedPoolMixin:
+    """Records how long each checkout waited for a connection."""
+
+    metrics_name = "default"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Also runs for the pool that replaces this one on dispose()
+        get_pool_metrics(self.metrics_name).pool = self
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            get_pool_metrics(self.metrics_name).record_checkout(0, timed_out=True)
+            raise
+        get_pool_metrics(self.metrics_name).record_checkout(time.perf_counter() - started)
+        return connection
+
+
+def timed_pool_class(name: str, async_driver: bool = False) -> type:
+    """Return a queue pool class that reports its metrics as ``name``."""
+    base = AsyncAdaptedQueuePool if async_driver else QueuePool
+    return type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"metrics_name": name})
+
+
+def render_prometheus() -> str:
+    """Render the metrics of all pools in the Prometheus text format."""
+    lines = [
+        "# HELP db_pool_checkouts_total Connections checked out of the pool.",
+        "# TYPE db_pool_checkouts_total counter",
+        "# HELP db_pool_checkout_timeouts_total Checkouts that failed waiting for a connection.",
+        "# TYPE db_pool_checkout_timeouts_total counter",
+        "# HELP db_pool_checkout_wait_seconds Time spent waiting for a connection.",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+        "# HELP db_pool_checkout_wait_seconds_max Longest wait for a connection.",
+        "# TYPE db_pool_checkout_wait_seconds_max gauge",
+        "# HELP db_pool_size Configured number of persistent connections.",
+        "# TYPE db_pool_size gauge",
+        "# HELP db_pool_checked_out Connections currently in use.",
+        "# TYPE db_pool_checked_out gauge",
+        "# HELP db_pool_overflow Connections currently open beyond the pool size.",
+        "# TYPE db_pool_overflow gauge",
+    ]
+    for metrics in all_pool_metrics():
+        data = metrics.snapshot()
+        label = f'pool="{metrics.name}"'
+        lines.append(f"db_pool_checkouts_total{{{label}}} {data['checkouts']}")
+        lines.append(f"db_pool_checkout_timeouts_total{{{label}}} {data['timeouts']}")
+        for bound, count in data["wait_buckets"].items():
+            lines.append(f'db_pool_checkout_wait_seconds_bucket{{{label},le="{bound}"}} {count}')
+        lines.append(f'db_pool_checkout_wait_seconds_bucket{{{label},le="+Inf"}} {data["checkouts"]}')
+        lines.append(f"db_pool_checkout_wait_seconds_sum{{{label}}} {data['wait_seconds_total']:.6f}")
+        lines.append(f"db_pool_checkout_wait_seconds_count{{{label}}} {data['checkouts']}")
+        lines.append(f"db_pool_checkout_wait_seconds_max{{{label}}} {data['wait_seconds_max']:.6f}")
+        lines.append(f"db_pool_size{{{label}}} {data['size']}")
+        lines.append(f"db_pool_checked_out{{{label}}} {data['checked_out']}")
+        lines.append(f"db_pool_overflow{{{label}}} {data['overflow']}")
+    return "\n".join(lines) + "\n"
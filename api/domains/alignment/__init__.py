@@ -1,5 +1,8 @@
-from .models import AlignmentQueue, AlignmentStatus
-from .schemas import AlignmentQueueCreate, AlignmentQueueUpdate, AlignmentQueueResponse, ModelParameter
+from .models import AlignmentQueue, AlignmentStatus, CorpusFile
+from .schemas import (
+    AlignmentQueueCreate, AlignmentQueueUpdate, AlignmentQueueResponse, AlignmentBatchEntry, AlignmentBatchResponse, CorpusFileResponse,
+    ModelParameter
+)
 from .crud import (
     create_alignment_task,
     get_alignment_task,
@@ -0,0 +1,121 @@
+"""
+Audio segment extraction backed by precomputed seek indexes.
+"""
+
+import io
+import logging
+from typing import Optional
+
+from shared.audio.seek_index import (
+    SeekIndex,
+    build_seek_index,
+    build_wav_seek_index,
+    seek_index_path_for,
+    SeekIndexError,
+    WAV_HEADER_PROBE_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Longest segment served by the segment endpoint, in seconds
+MAX_SEGMENT_DURATION = 300.0
+
+AUDIO_CONTENT_TYPES = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+}
+
+
+class AudioSegment:
+    """Playable audio segment with its frame-aligned boundaries."""
+
+    def __init__(self, content: bytes, media_type: str, start: float, end: float):
+        self.content = content
+        self.media_type = media_type
+        self.start = start
+        self.end = end
+
+
+def _store_seek_index(storage, audio_path: str, index: SeekIndex) -> None:
+    data = index.to_json()
+    if not storage.upload_file(seek_index_path_for(audio_path), io.BytesIO(data), len(data), "application/json"):
+        logger.warning(f"Failed to store seek index for {audio_path}")
+
+
+def store_corpus_audio(storage, audio_path: str, data: bytes, extension: str) -> bool:
+    """
+    Upload a corpus audio file together with its seek index.
+
+    A file that cannot be indexed is still stored; its index will be
+    rebuilt (and fail) on first segment request.
+
+    Returns:
+        bool: True if the audio itself was uploaded
+    """
+    content_type = AUDIO_CONTENT_TYPES.get(extension, "application/octet-stream")
+    if not storage.upload_file(audio_path, io.BytesIO(data), len(data), content_type):
+        return False
+
+    try:
+        _store_seek_index(storage, audio_path, build_seek_index(data, extension))
+    except SeekIndexError as e:
+        logger.warning(f"Could not index audio {audio_path}: {e}")
+    return True
+
+
+def load_seek_index(storage, audio_path: str, extension: str) -> Optional[SeekIndex]:
+    """
+    Load the seek index of an audio object, building it if it is missing.
+
+    WAV indexes are rebuilt from a ranged read of the header; MP3 indexes
+    need one full read, after which the index is stored for later requests.
+
+    Returns:
+        SeekIndex: Index of the audio, None if the audio doesn't exist
+    """
+    raw = storage.download_file(seek_index_path_for(audio_path))
+    if raw is not None:
+        return SeekIndex.from_json(raw)
+
+    size = storage.get_file_size(audio_path)
+    if size is None:
+        return None
+
+    if extension == "wav":
+        header = storage.download_range(audio_path, 0, min(size, WAV_HEADER_PROBE_SIZE))
+        if header is None:
+            return None
+        index = build_wav_seek_index(header, size)
+    else:
+        data = storage.download_file(audio_path)
+        if data is None:
+            return None
+        index = build_seek_index(data, extension)
+
+    _store_seek_index(storage, audio_path, index)
+    return index
+
+
+def read_audio_segment(storage, audio_path: str, extension: str,
+                       start: float, end: float) -> Optional[AudioSegment]:
+    """
+    Read the ``[start, end]`` seconds of a stored audio file.
+
+    Returns:
+        AudioSegment: Playable segment, None if the audio doesn't exist
+    """
+    index = load_seek_index(storage, audio_path, extension)
+    if index is None:
+        return None
+
+    offset, length, actual_start, actual_end = index.byte_range(start, end)
+    data = storage.download_range(audio_path, offset, length) if length else b""
+    if data is None:
+        return None
+
+    return AudioSegment(
+        content=index.segment_prefix(len(data)) + data,
+        media_type=index.media_type,
+        start=actual_start,
+        end=actual_end,
+    )
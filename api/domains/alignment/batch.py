@@ -0,0 +1,121 @@
+"""
+Batch submission of alignment tasks.
+
+A batch is either N audio/text pairs uploaded in the same order with one
+set of models for all of them, or a JSON manifest whose entries reference
+the uploaded files by filename and carry their own models.
+"""
+
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from fastapi import UploadFile
+from pydantic import TypeAdapter, ValidationError
+
+from api.domains.alignment.schemas import AlignmentBatchEntry, AlignmentQueueCreate, ModelParameter
+from api.utils import validate_audio_file, validate_text_file
+
+ALIGNMENT_BATCH_MAX_SIZE = int(os.getenv("ALIGNMENT_BATCH_MAX_SIZE", "1000"))
+
+ModelKey = Tuple[Tuple[str, str], Tuple[str, str], Optional[Tuple[str, str]]]
+
+_manifest_adapter = TypeAdapter(List[AlignmentBatchEntry])
+
+
+class BatchError(ValueError):
+    """Raised for malformed batch requests."""
+
+
+@dataclass
+class BatchItem:
+    audio_file: UploadFile
+    text_file: UploadFile
+    acoustic_model: ModelParameter
+    dictionary_model: ModelParameter
+    g2p_model: Optional[ModelParameter] = None
+
+    @property
+    def model_key(self) -> ModelKey:
+        """Hashable identity of the model combination."""
+        g2p = (self.g2p_model.name, self.g2p_model.version) if self.g2p_model else None
+        return (
+            (self.acoustic_model.name, self.acoustic_model.version),
+            (self.dictionary_model.name, self.dictionary_model.version),
+            g2p
+        )
+
+    def task_create(self) -> AlignmentQueueCreate:
+        return AlignmentQueueCreate(
+            original_audio_filename=self.audio_file.filename,
+            original_text_filename=self.text_file.filename,
+            acoustic_model=self.acoustic_model,
+            dictionary_model=self.dictionary_model,
+            g2p_model=self.g2p_model
+        )
+
+
+def _by_filename(uploads: List[UploadFile], kind: str) -> dict:
+    files = {}
+    for upload in uploads:
+        if upload.filename in files:
+            raise BatchError(f"Duplicate {kind} filename '{upload.filename}'")
+        files[upload.filename] = upload
+    return files
+
+
+def build_batch(
+    audio_files: List[UploadFile],
+    text_files: List[UploadFile],
+    manifest: Optional[str] = None,
+    models: Optional[Tuple[ModelParameter, ModelParameter, Optional[ModelParameter]]] = None
+) -> List[BatchItem]:
+    """
+    Pair uploaded files with their models.
+
+    Raises:
+        BatchError: If the manifest or the files don't describe a valid batch
+    """
+    if manifest:
+        try:
+            entries = _manifest_adapter.validate_json(manifest)
+        except (ValidationError, json.JSONDecodeError) as e:
+            raise BatchError(f"Invalid manifest: {e}")
+        audio_by_name = _by_filename(audio_files, "audio")
+        text_by_name = _by_filename(text_files, "text")
+        items = []
+        for i, entry in enumerate(entries):
+            # Each upload belongs to exactly one task, so quota and metadata count it once
+            audio = audio_by_name.pop(entry.audio_filename, None)
+            text = text_by_name.pop(entry.text_filename, None)
+            if audio is None:
+                raise BatchError(f"Entry {i}: audio file '{entry.audio_filename}' was not uploaded or is used twice")
+            if text is None:
+                raise BatchError(f"Entry {i}: text file '{entry.text_filename}' was not uploaded or is used twice")
+            items.append(BatchItem(audio, text, entry.acoustic_model, entry.dictionary_model, entry.g2p_model))
+        if audio_by_name or text_by_name:
+            unused = sorted(audio_by_name) + sorted(text_by_name)
+            raise BatchError(f"Files not referenced by the manifest: {', '.join(unused)}")
+    else:
+        if models is None:
+            raise BatchError("Either a manifest or acoustic and dictionary model fields are required")
+        if len(audio_files) != len(text_files):
+            raise BatchError("The number of audio and text files must match")
+        items = [BatchItem(audio, text, *models) for audio, text in zip(audio_files, text_files)]
+
+    if not items:
+        raise BatchError("The batch is empty")
+    if len(items) > ALIGNMENT_BATCH_MAX_SIZE:
+        raise BatchError(f"A batch may contain at most {ALIGNMENT_BATCH_MAX_SIZE} tasks")
+    for i, item in enumerate(items):
+        if not validate_audio_file(item.audio_file):
+            raise BatchError(f"Entry {i}: invalid audio file. Only MP3 and WAV files are allowed.")
+        if not validate_text_file(item.text_file):
+            raise BatchError(f"Entry {i}: invalid text file. Only TXT files are allowed.")
+    return items
+
+
+def new_celery_task_id() -> str:
+    return str(uuid.uuid4())
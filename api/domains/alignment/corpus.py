@@ -0,0 +1,158 @@
+"""
+Corpus files of alignment tasks.
+
+A task aligns a corpus of audio/text pairs. Every pair is a row of
+``corpus_files`` and its files are stored under the computed paths
+``{user_id}/corpus/{task_id}/{corpus_file_id}.{ext}``.
+"""
+
+import asyncio
+import os
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from fastapi import UploadFile
+
+from api.domains.alignment.audio import AUDIO_CONTENT_TYPES, store_corpus_audio
+from api.domains.alignment.paths import corpus_file_path, file_extension
+from api.domains.users.models import FileType
+from api.utils import validate_audio_file, validate_text_file
+from api.zipstream import ZipMember
+
+CORPUS_MAX_FILES = int(os.getenv("CORPUS_MAX_FILES", "1000"))
+
+CorpusPair = Tuple[UploadFile, UploadFile]
+
+
+class CorpusError(ValueError):
+    """Raised for malformed corpus uploads."""
+
+
+class CorpusUploadError(RuntimeError):
+    """Raised when corpus files could not be stored."""
+
+
+@dataclass
+class CorpusObject:
+    """An uploaded file and where it is stored."""
+    task_id: int
+    storage_path: str
+    upload: UploadFile
+    file_type: FileType
+
+    @property
+    def size(self) -> int:
+        return upload_size(self.upload)
+
+
+def upload_size(upload: UploadFile) -> int:
+    if upload.size is not None:
+        return upload.size
+    position = upload.file.tell()
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(position)
+    return size
+
+
+def pair_uploads(audio_files: List[UploadFile], text_files: List[UploadFile]) -> List[CorpusPair]:
+    """
+    Pair audio and text uploads by position.
+
+    Raises:
+        CorpusError: If the files don't form a valid corpus
+    """
+    if len(audio_files) != len(text_files):
+        raise CorpusError("The number of audio and text files must match")
+    if not audio_files:
+        raise CorpusError("The corpus is empty")
+    if len(audio_files) > CORPUS_MAX_FILES:
+        raise CorpusError(f"A corpus may contain at most {CORPUS_MAX_FILES} file pairs")
+    for audio_file in audio_files:
+        if not validate_audio_file(audio_file):
+            raise CorpusError("Invalid audio file. Only MP3 and WAV files are allowed.")
+    for text_file in text_files:
+        if not validate_text_file(text_file):
+            raise CorpusError("Invalid text file. Only TXT files are allowed.")
+    return list(zip(audio_files, text_files))
+
+
+def corpus_objects(user_id: int, task_id: int, corpus_file_id: int, pair: CorpusPair) -> List[CorpusObject]:
+    """Storage objects of one corpus file: its audio and its text."""
+    audio_file, text_file = pair
+    return [
+        CorpusObject(task_id, corpus_file_path(user_id, task_id, corpus_file_id, file_extension(audio_file.filename)),
+                     audio_file, FileType.AUDIO),
+        CorpusObject(task_id, corpus_file_path(user_id, task_id, corpus_file_id, file_extension(text_file.filename)),
+                     text_file, FileType.TEXT),
+    ]
+
+
+def _store_object(storage, obj: CorpusObject) -> bool:
+    obj.upload.file.seek(0)
+    if obj.file_type == FileType.AUDIO:
+        extension = file_extension(obj.upload.filename)
+        return store_corpus_audio(storage, obj.storage_path, obj.upload.file.read(), extension)
+    return storage.upload_file(obj.storage_path, obj.upload.file, obj.size, "text/plain; charset=utf-8")
+
+
+async def upload_corpus(storage, objects: List[CorpusObject]) -> None:
+    """
+    Store corpus files concurrently on the storage thread pool.
+
+    Either all files are stored or none: after a failure the files that
+    did get stored are deleted again.
+
+    Args:
+        storage: AsyncStorage
+
+    Raises:
+        CorpusUploadError: If any file could not be stored
+    """
+    results = await asyncio.gather(
+        *(storage.run(_store_object, storage.storage, obj) for obj in objects),
+        return_exceptions=True
+    )
+    failed = [obj for obj, result in zip(objects, results) if result is not True]
+    if failed:
+        await remove_corpus(storage, objects)
+        raise CorpusUploadError(f"Failed to store {len(failed)} of {len(objects)} corpus files")
+
+
+async def remove_corpus(storage, objects: List[CorpusObject]) -> None:
+    """Delete the corpus prefixes of the objects' tasks, seek indexes included."""
+    await storage.delete_prefixes(sorted({os.path.dirname(obj.storage_path) + "/" for obj in objects}))
+
+
+def corpus_metadata_rows(user_id: int, objects: List[CorpusObject]) -> List[dict]:
+    """File metadata rows of stored corpus files."""
+    return [
+        dict(user_id=user_id, task_id=obj.task_id, file_type=obj.file_type,
+             original_filename=obj.upload.filename, storage_path=obj.storage_path, file_size=obj.size,
+             mime_type=obj.upload.content_type or AUDIO_CONTENT_TYPES.get(file_extension(obj.upload.filename)),
+             access_count=0)
+        for obj in objects
+    ]
+
+
+def corpus_archive_members(task) -> List[ZipMember]:
+    """
+    Archive members of a task's corpus files under their uploaded names.
+
+    Names that occur more than once in the corpus get the corpus file id as
+    a prefix, e.g. ``12_speech.wav``.
+    """
+    files = [
+        (corpus_file, filename)
+        for corpus_file in task.corpus_files
+        for filename in (corpus_file.original_audio_filename, corpus_file.original_text_filename)
+    ]
+    counts = Counter(filename for _, filename in files)
+    return [
+        ZipMember(
+            storage_path=corpus_file_path(task.user_id, task.id, corpus_file.id, file_extension(filename)),
+            arcname=f"{corpus_file.id}_{filename}" if counts[filename] > 1 else filename
+        )
+        for corpus_file, filename in files
+    ]
@@ -1,12 +1,18 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional, Tuple
-from api.domains.alignment.models import AlignmentQueue, AlignmentStatus
+from typing import Dict, List, Optional, Tuple
+from api.domains.alignment.models import AlignmentQueue, AlignmentStatus, CorpusFile
 from api.domains.alignment.schemas import AlignmentQueueCreate, AlignmentQueueUpdate, ModelParameter
+from api.domains.models.catalog import catalog_cache_enabled, get_catalog_index, phone_sets_compatible
+from api.domains.models.crud import ACTIVE_MODEL
 from api.domains.models.models import MFAModel, ModelType
 
 
-def create_alignment_task(db: Session, task: AlignmentQueueCreate, audio_path: str, text_path: str, user_id: int) -> AlignmentQueue:
-    db_task = AlignmentQueue(
+def alignment_task_values(task: AlignmentQueueCreate, audio_path: Optional[str], text_path: Optional[str], user_id: int) -> Dict:
+    """Column values of a new pending task."""
+    return dict(
         audio_file_path=audio_path,
         text_file_path=text_path,
         original_audio_filename=task.original_audio_filename,
@@ -20,12 +26,205 @@ def create_alignment_task(db: Session, task: AlignmentQueueCreate, audio_path: s
         user_id=user_id,
         status=AlignmentStatus.PENDING
     )
+
+
+def _new_alignment_task(task: AlignmentQueueCreate, audio_path: Optional[str], text_path: Optional[str], user_id: int) -> AlignmentQueue:
+    return AlignmentQueue(**alignment_task_values(task, audio_path, text_path, user_id))
+
+
+def create_alignment_task(db: Session, task: AlignmentQueueCreate, audio_path: str, text_path: str, user_id: int) -> AlignmentQueue:
+    db_task = _new_alignment_task(task, audio_path, text_path, user_id)
     db.add(db_task)
     db.commit()
     db.refresh(db_task)
     return db_task
 
 
+async def create_alignment_task_async(db: AsyncSession, task: AlignmentQueueCreate, audio_path: str, text_path: str, user_id: int) -> AlignmentQueue:
+    db_task = _new_alignment_task(task, audio_path, text_path, user_id)
+    db.add(db_task)
+    await db.commit()
+    await db.refresh(db_task)
+    return db_task
+
+
+async def create_alignment_tasks_bulk_async(db: AsyncSession, user_id: int, rows: List[Dict]) -> List[AlignmentQueue]:
+    """Insert many tasks of one user with a single statement, without committing.
+
+    Every row must carry a unique ``celery_task_id``; the inserted rows are
+    read back by it since MySQL has no INSERT ... RETURNING.
+    Returns the tasks in the order of ``rows``.
+    """
+    if not rows:
+        return []
+    await db.execute(insert(AlignmentQueue), rows)
+    celery_task_ids = [row["celery_task_id"] for row in rows]
+    result = await db.execute(select(AlignmentQueue).where(
+        AlignmentQueue.user_id == user_id,
+        AlignmentQueue.celery_task_id.in_(celery_task_ids)
+    ))
+    tasks = {task.celery_task_id: task for task in result.scalars()}
+    return [tasks[celery_task_id] for celery_task_id in celery_task_ids]
+
+
+async def refresh_alignment_tasks_async(db: AsyncSession, tasks: List[AlignmentQueue]) -> None:
+    """Reload tasks with one query, e.g. for timestamps set by the database on commit."""
+    if tasks:
+        await db.execute(
+            select(AlignmentQueue)
+            .where(AlignmentQueue.id.in_([task.id for task in tasks]))
+            .execution_options(populate_existing=True)
+        )
+
+
+def _mark_enqueued_statement(task_ids: List[int]):
+    return update(AlignmentQueue).where(AlignmentQueue.id.in_(task_ids)).values(enqueued_at=datetime.utcnow())
+
+
+def mark_alignment_tasks_enqueued(db: Session, task_ids: List[int]) -> None:
+    """Record that the tasks were published to the broker."""
+    if task_ids:
+        db.execute(_mark_enqueued_statement(task_ids))
+        db.commit()
+
+
+async def mark_alignment_tasks_enqueued_async(db: AsyncSession, task_ids: List[int]) -> None:
+    if task_ids:
+        await db.execute(_mark_enqueued_statement(task_ids))
+        await db.commit()
+
+
+def get_unpublished_alignment_tasks(db: Session, min_age: int, limit: int = 500) -> List[AlignmentQueue]:
+    """
+    Pending tasks that have a Celery id but were never published to the broker.
+
+    Args:
+        min_age: Only tasks created at least this many seconds ago, so requests
+            still publishing their tasks are left alone
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=min_age)
+    return db.query(AlignmentQueue).filter(
+        AlignmentQueue.status == AlignmentStatus.PENDING,
+        AlignmentQueue.celery_task_id.isnot(None),
+        AlignmentQueue.enqueued_at.is_(None),
+        AlignmentQueue.created_at <= cutoff
+    ).order_by(AlignmentQueue.id).limit(limit).all()
+
+
+async def create_corpus_files_async(db: AsyncSession, files: List[Tuple[int, str, str]]) -> List[CorpusFile]:
+    """Insert corpus files with a single statement, without committing.
+
+    Args:
+        files: ``(task_id, original_audio_filename, original_text_filename)``
+            of each file; the tasks must have been created in this transaction
+
+    Returns the corpus files in the order of ``files``.
+    """
+    if not files:
+        return []
+    await db.execute(insert(CorpusFile), [
+        dict(task_id=task_id, original_audio_filename=audio_filename,
+             original_text_filename=text_filename, status=AlignmentStatus.PENDING)
+        for task_id, audio_filename, text_filename in files
+    ])
+    # Ids of a multi-row insert are ascending, so id order is insertion order
+    result = await db.execute(select(CorpusFile).where(
+        CorpusFile.task_id.in_({task_id for task_id, _, _ in files})
+    ).order_by(CorpusFile.id))
+    return list(result.scalars())
+
+
+async def create_corpus_task_async(db: AsyncSession, task: AlignmentQueueCreate, files: List[Tuple[str, str]],
+                                   user_id: int) -> Tuple[AlignmentQueue, List[CorpusFile]]:
+    """Create a task with its corpus files, without committing.
+
+    Args:
+        files: ``(original_audio_filename, original_text_filename)`` of each corpus file
+    """
+    db_task = _new_alignment_task(task, None, None, user_id)
+    db.add(db_task)
+    await db.flush()
+    corpus_files = await create_corpus_files_async(db, [(db_task.id, audio, text) for audio, text in files])
+    return db_task, corpus_files
+
+
+async def get_corpus_files_async(db: AsyncSession, task_id: int) -> List[CorpusFile]:
+    result = await db.execute(select(CorpusFile).where(CorpusFile.task_id == task_id).order_by(CorpusFile.id))
+    return list(result.scalars())
+
+
+def get_corpus_file(db: Session, corpus_file_id: int) -> Optional[CorpusFile]:
+    return db.query(CorpusFile).filter(CorpusFile.id == corpus_file_id).first()
+
+
+def get_task_corpus_file(db: Session, task_id: int, corpus_file_id: int) -> Optional[CorpusFile]:
+    """Get a corpus file only if it belongs to the task."""
+    return db.query(CorpusFile).filter(CorpusFile.task_id == task_id, CorpusFile.id == corpus_file_id).first()
+
+
+def start_alignment_task(db: Session, task_id: int) -> Optional[List[int]]:
+    """
+    Mark a task as processing.
+
+    Returns:
+        List[int]: Ids of its corpus files still to be aligned, None if the task doesn't exist
+    """
+    task = get_alignment_task(db, task_id)
+    if task is None:
+        return None
+    task.status = AlignmentStatus.PROCESSING
+    db.commit()
+    return [
+        corpus_file_id for (corpus_file_id,) in db.query(CorpusFile.id).filter(
+            CorpusFile.task_id == task_id,
+            CorpusFile.status.in_([AlignmentStatus.PENDING, AlignmentStatus.PROCESSING])
+        ).order_by(CorpusFile.id)
+    ]
+
+
+def set_corpus_file_status(db: Session, corpus_file: CorpusFile, status: AlignmentStatus,
+                           error_message: Optional[str] = None) -> None:
+    corpus_file.status = status
+    corpus_file.error_message = error_message
+    db.commit()
+
+
+def finish_alignment_task(db: Session, task_id: int) -> Optional[AlignmentStatus]:
+    """
+    Complete a processing task once none of its corpus files is left.
+
+    Called after every corpus file; each caller has committed its own file
+    first, so the last one to finish sees all others done. The update is
+    conditional on the task still processing, so it is applied once.
+
+    A task is completed if at least one file was aligned; failed files are
+    counted in its error message.
+
+    Returns:
+        AlignmentStatus: Final status if this call finished the task, None otherwise
+    """
+    counts = dict(
+        db.query(CorpusFile.status, func.count(CorpusFile.id))
+        .filter(CorpusFile.task_id == task_id)
+        .group_by(CorpusFile.status)
+        .all()
+    )
+    if counts.get(AlignmentStatus.PENDING) or counts.get(AlignmentStatus.PROCESSING):
+        return None
+    total = sum(counts.values())
+    failed = counts.get(AlignmentStatus.FAILED, 0)
+    status = AlignmentStatus.FAILED if failed == total else AlignmentStatus.COMPLETED
+    updated = db.query(AlignmentQueue).filter(
+        AlignmentQueue.id == task_id,
+        AlignmentQueue.status == AlignmentStatus.PROCESSING
+    ).update({
+        AlignmentQueue.status: status,
+        AlignmentQueue.error_message: f"{failed} of {total} corpus files failed" if failed else None
+    }, synchronize_session=False)
+    db.commit()
+    return status if updated == 1 else None
+
+
 def get_alignment_task(db: Session, task_id: int, user_id: int = None) -> Optional[AlignmentQueue]:
     query = db.query(AlignmentQueue).filter(AlignmentQueue.id == task_id)
     if user_id is not None:
@@ -33,6 +232,13 @@ def get_alignment_task(db: Session, task_id: int, user_id: int = None) -> Option
     return query.first()
 
 
+async def get_alignment_task_async(db: AsyncSession, task_id: int, user_id: int = None) -> Optional[AlignmentQueue]:
+    statement = select(AlignmentQueue).where(AlignmentQueue.id == task_id)
+    if user_id is not None:
+        statement = statement.where(AlignmentQueue.user_id == user_id)
+    return (await db.execute(statement.limit(1))).scalars().first()
+
+
 def get_alignment_tasks(db: Session, skip: int = 0, limit: int = 100, user_id: int = None, status: AlignmentStatus = None) -> List[AlignmentQueue]:
     query = db.query(AlignmentQueue)
     if user_id is not None:
@@ -42,6 +248,15 @@ def get_alignment_tasks(db: Session, skip: int = 0, limit: int = 100, user_id: i
     return query.offset(skip).limit(limit).all()
 
 
+async def get_alignment_tasks_async(db: AsyncSession, skip: int = 0, limit: int = 100, user_id: int = None, status: AlignmentStatus = None) -> List[AlignmentQueue]:
+    statement = select(AlignmentQueue)
+    if user_id is not None:
+        statement = statement.where(AlignmentQueue.user_id == user_id)
+    if status is not None:
+        statement = statement.where(AlignmentQueue.status == status)
+    return list((await db.execute(statement.offset(skip).limit(limit))).scalars())
+
+
 def update_alignment_task(db: Session, task_id: int, task_update: AlignmentQueueUpdate, user_id: int = None) -> Optional[AlignmentQueue]:
     query = db.query(AlignmentQueue).filter(AlignmentQueue.id == task_id)
     if user_id is not None:
@@ -80,7 +295,8 @@ def find_model_by_param(db: Session, model_param: ModelParameter, model_type: Mo
     model = db.query(MFAModel).filter(
         MFAModel.name == model_param.name,
         MFAModel.version == model_param.version,
-        MFAModel.model_type == model_type
+        MFAModel.model_type == model_type,
+        ACTIVE_MODEL
     ).first()
     
     if model:
@@ -91,30 +307,40 @@ def find_model_by_param(db: Session, model_param: ModelParameter, model_type: Mo
     model = db.query(MFAModel).filter(
         MFAModel.name == name_with_suffix,
         MFAModel.version == model_param.version,
-        MFAModel.model_type == model_type
+        MFAModel.model_type == model_type,
+        ACTIVE_MODEL
     ).first()
     
     return model
 
 
+async def find_model_by_param_async(db: AsyncSession, model_param: ModelParameter, model_type: ModelType) -> Optional[MFAModel]:
+    """Find a model by parameter and type, returns the model object or None
+    
+    Both name forms are fetched in one query; the exact name wins.
+    """
+    name_with_suffix = f"{model_param.name}_{model_type.value}"
+    result = await db.execute(select(MFAModel).where(
+        MFAModel.name.in_([model_param.name, name_with_suffix]),
+        MFAModel.version == model_param.version,
+        MFAModel.model_type == model_type,
+        ACTIVE_MODEL
+    ))
+    models = {model.name: model for model in result.scalars()}
+    return models.get(model_param.name) or models.get(name_with_suffix)
+
+
 
 
-def validate_models_same_language(db: Session, 
-                                acoustic_model: ModelParameter,
+def _check_models_same_language(acoustic_model: ModelParameter,
+                                acoustic: Optional[MFAModel],
                                 dictionary_model: ModelParameter,
-                                g2p_model: Optional[ModelParameter] = None) -> Tuple[bool, Optional[str], Optional[int]]:
-    """Validate that all models belong to the same language
-    
-    Returns:
-        Tuple[bool, Optional[str], Optional[int]]: (is_valid, error_message, language_id)
-    """
-    # Get acoustic model using the helper function
-    acoustic = find_model_by_param(db, acoustic_model, ModelType.ACOUSTIC)
+                                dictionary: Optional[MFAModel],
+                                g2p_model: Optional[ModelParameter],
+                                g2p: Optional[MFAModel]) -> Tuple[bool, Optional[str], Optional[int]]:
     if not acoustic:
         return False, f"Acoustic model '{acoustic_model.name}' not found", None
     
-    # Get dictionary model using the helper function
-    dictionary = find_model_by_param(db, dictionary_model, ModelType.DICTIONARY)
     if not dictionary:
         return False, f"Dictionary model '{dictionary_model.name}' not found", None
     
@@ -122,13 +348,60 @@ def validate_models_same_language(db: Session,
     if acoustic.language_id != dictionary.language_id:
         return False, "Acoustic and dictionary models must be for the same language", None
     
+    if not phone_sets_compatible(acoustic.phone_set, dictionary.phone_set):
+        return False, "Acoustic and dictionary models must use the same phone set", None
+    
     # Check G2P model if provided
     if g2p_model:
-        g2p = find_model_by_param(db, g2p_model, ModelType.G2P)
         if not g2p:
             return False, f"G2P model '{g2p_model.name}' not found", None
         
         if g2p.language_id != acoustic.language_id:
             return False, "All models must be for the same language", None
+        
+        if not phone_sets_compatible(g2p.phone_set, dictionary.phone_set):
+            return False, "G2P and dictionary models must use the same phone set", None
     
     return True, None, acoustic.language_id
+
+
+def validate_models_same_language(db: Session, 
+                                acoustic_model: ModelParameter,
+                                dictionary_model: ModelParameter,
+                                g2p_model: Optional[ModelParameter] = None) -> Tuple[bool, Optional[str], Optional[int]]:
+    """Validate that all models belong to the same language
+    
+    Returns:
+        Tuple[bool, Optional[str], Optional[int]]: (is_valid, error_message, language_id)
+    """
+    acoustic = find_model_by_param(db, acoustic_model, ModelType.ACOUSTIC)
+    dictionary = find_model_by_param(db, dictionary_model, ModelType.DICTIONARY) if acoustic else None
+    g2p = find_model_by_param(db, g2p_model, ModelType.G2P) if g2p_model and dictionary else None
+    return _check_models_same_language(acoustic_model, acoustic, dictionary_model, dictionary, g2p_model, g2p)
+
+
+async def validate_models_same_language_async(db: AsyncSession,
+                                              acoustic_model: ModelParameter,
+                                              dictionary_model: ModelParameter,
+                                              g2p_model: Optional[ModelParameter] = None) -> Tuple[bool, Optional[str], Optional[int]]:
+    """Validate that all models belong to the same language
+    
+    Answered from the cached catalog index when it has all the models;
+    models it doesn't know (e.g. added since the snapshot) are looked up
+    in the database.
+    
+    Returns:
+        Tuple[bool, Optional[str], Optional[int]]: (is_valid, error_message, language_id)
+    """
+    if catalog_cache_enabled():
+        index = await get_catalog_index(db)
+        acoustic = index.find(ModelType.ACOUSTIC, acoustic_model.name, acoustic_model.version)
+        dictionary = index.find(ModelType.DICTIONARY, dictionary_model.name, dictionary_model.version)
+        g2p = index.find(ModelType.G2P, g2p_model.name, g2p_model.version) if g2p_model else None
+        if acoustic and dictionary and (g2p or not g2p_model):
+            return _check_models_same_language(acoustic_model, acoustic, dictionary_model, dictionary, g2p_model, g2p)
+    
+    acoustic = await find_model_by_param_async(db, acoustic_model, ModelType.ACOUSTIC)
+    dictionary = await find_model_by_param_async(db, dictionary_model, ModelType.DICTIONARY) if acoustic else None
+    g2p = await find_model_by_param_async(db, g2p_model, ModelType.G2P) if g2p_model and dictionary else None
+    return _check_models_same_language(acoustic_model, acoustic, dictionary_model, dictionary, g2p_model, g2p)
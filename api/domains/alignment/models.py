@@ -16,14 +16,17 @@ class AlignmentQueue(Base):
     __tablename__ = "alignment_queue"
 
     id = Column(Integer, primary_key=True, index=True)
-    audio_file_path = Column(String(500), nullable=False)
-    text_file_path = Column(String(500), nullable=False)
+    # Storage paths of the first corpus file, kept for single-file clients
+    audio_file_path = Column(String(500), nullable=True)
+    text_file_path = Column(String(500), nullable=True)
     original_audio_filename = Column(String(255), nullable=False)
     original_text_filename = Column(String(255), nullable=False)
     
     # User and task tracking
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     celery_task_id = Column(String(155), nullable=True)
+    # Set once published to the broker; pending tasks left unset get re-published
+    enqueued_at = Column(DateTime(timezone=True), nullable=True)
     
     # Model parameters with FK references
     acoustic_model_id = Column(Integer, ForeignKey("mfa_models.id"), nullable=True)
@@ -46,3 +49,21 @@ class AlignmentQueue(Base):
 
     # Relationships
     user = relationship("api.domains.users.models.User")
+    corpus_files = relationship("CorpusFile", back_populates="task", cascade="all, delete-orphan",
+                                order_by="CorpusFile.id")
+
+
+class CorpusFile(Base):
+    """An audio/text pair of a task's corpus, aligned independently of the others."""
+    __tablename__ = "corpus_files"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, ForeignKey("alignment_queue.id", ondelete="CASCADE"), nullable=False, index=True)
+    original_audio_filename = Column(String(255), nullable=False)
+    original_text_filename = Column(String(255), nullable=False)
+    status = Column(Enum(AlignmentStatus), default=AlignmentStatus.PENDING, nullable=False)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    task = relationship("AlignmentQueue", back_populates="corpus_files")
@@ -0,0 +1,34 @@
+"""
+Storage paths of corpus and result files.
+
+Layout (see docs/architecture.md):
+    {user_id}/corpus/{task_id}/{corpus_file_id}.{ext}
+    {user_id}/results/{task_id}/{corpus_file_id}.json
+"""
+
+import os
+
+
+def file_extension(filename: str) -> str:
+    """Return the lower-case extension of a filename without the dot."""
+    return os.path.splitext(filename or "")[1].lower().lstrip(".")
+
+
+def corpus_prefix(user_id: int, task_id: int) -> str:
+    """Return the storage prefix of all corpus files of a task."""
+    return f"{user_id}/corpus/{task_id}/"
+
+
+def corpus_file_path(user_id: int, task_id: int, corpus_file_id: int, extension: str) -> str:
+    """Return the storage path of a corpus audio or text file."""
+    return f"{corpus_prefix(user_id, task_id)}{corpus_file_id}.{extension.lstrip('.')}"
+
+
+def results_prefix(user_id: int, task_id: int) -> str:
+    """Return the storage prefix of all results of a task."""
+    return f"{user_id}/results/{task_id}/"
+
+
+def result_file_path(user_id: int, task_id: int, corpus_file_id: int) -> str:
+    """Return the storage path of the JSON result for a corpus file."""
+    return f"{results_prefix(user_id, task_id)}{corpus_file_id}.json"
@@ -0,0 +1,38 @@
+"""
+Publishing alignment tasks to the Celery broker.
+"""
+
+import logging
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROCESS_ALIGNMENT_TASK = 'workers.tasks.process_alignment_task'
+
+
+class CeleryTaskQueue:
+    """Enqueue alignment tasks under their pre-generated Celery task ids."""
+
+    def enqueue(self, tasks: List[Tuple[int, str]]) -> None:
+        """
+        Publish ``(task_id, celery_task_id)`` pairs.
+
+        All messages go through one producer, so the batch costs one broker
+        connection and channel instead of one per task.
+        """
+        from workers.celery_app import celery_app
+
+        with celery_app.producer_or_acquire() as producer:
+            for task_id, celery_task_id in tasks:
+                celery_app.send_task(
+                    PROCESS_ALIGNMENT_TASK,
+                    args=[task_id],
+                    task_id=celery_task_id,
+                    producer=producer
+                )
+        logger.info(f"Enqueued {len(tasks)} alignment tasks")
+
+
+def get_task_queue() -> CeleryTaskQueue:
+    """Return the task queue; tests override this dependency."""
+    return CeleryTaskQueue()
@@ -1,69 +1,150 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+import logging
+import os
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from api.database import get_db
+from typing import List, Optional
+from api.database import get_db, get_async_db
+from api.read_routing import get_read_async_db, mark_user_wrote
+from api.storage import get_storage, get_async_storage
 from api.domains.auth.dependencies import get_current_active_user
-from api.domains.users.models import User
-from api.domains.alignment.schemas import AlignmentQueueResponse, AlignmentQueueUpdate, AlignmentQueueCreate, ModelParameter
+from api.domains.auth.cache import CurrentUser
+from api.domains.users.crud import UserService
+from api.domains.users.quota import QuotaExceededError, StorageReservation
+from api.domains.alignment.schemas import (
+    AlignmentQueueResponse, AlignmentQueueUpdate, AlignmentQueueCreate, AlignmentBatchResponse, CorpusFileResponse, ModelParameter
+)
 from api.domains.alignment.crud import (
-    create_alignment_task, 
-    get_alignment_task, 
-    get_alignment_tasks,
+    alignment_task_values,
+    create_alignment_tasks_bulk_async,
+    create_corpus_files_async,
+    create_corpus_task_async,
+    get_alignment_task,
+    get_alignment_task_async,
+    get_alignment_tasks_async,
+    get_corpus_files_async,
+    get_task_corpus_file,
+    mark_alignment_tasks_enqueued_async,
+    refresh_alignment_tasks_async,
     update_alignment_task,
     delete_alignment_task,
-    validate_models_same_language
+    validate_models_same_language_async
 )
 from api.domains.alignment.models import AlignmentStatus
-from api.utils import validate_audio_file, validate_text_file, save_uploaded_file
+from api.domains.alignment.audio import read_audio_segment, MAX_SEGMENT_DURATION, AUDIO_CONTENT_TYPES
+from api.domains.alignment.batch import BatchError, build_batch, new_celery_task_id
+from api.domains.alignment.corpus import (
+    CorpusError,
+    CorpusObject,
+    corpus_archive_members,
+    corpus_metadata_rows,
+    corpus_objects,
+    pair_uploads,
+    remove_corpus,
+    upload_corpus,
+    upload_size
+)
+from api.domains.alignment.queue import get_task_queue
+from api.domains.alignment.paths import corpus_file_path, corpus_prefix, file_extension, result_file_path, results_prefix
+from api.domains.alignment.words import load_word_index
+from api.streaming import stream_storage_file_async
+from api.zipstream import stream_zip
+from shared.audio.seek_index import SeekIndexError
+from shared.storage.async_service import AsyncStorage
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/alignment", tags=["alignment"])
 
+def _reserve_corpus(db: AsyncSession, user_id: int, uploads: List[UploadFile]) -> StorageReservation:
+    """Reservation of the quota for corpus uploads; enter it before creating any rows."""
+    return StorageReservation(db, user_id, sum(upload_size(upload) for upload in uploads))
+
+
+async def _store_corpus(db: AsyncSession, storage: AsyncStorage, user_id: int, objects: List[CorpusObject],
+                        reservation: StorageReservation) -> None:
+    """Upload corpus files into reserved space and commit the pending transaction.
+
+    On any failure the transaction is rolled back and the stored files are
+    removed; the reservation is released when its block exits.
+    """
+    try:
+        await upload_corpus(storage, objects)
+        await UserService.add_file_metadata_bulk_async(db, corpus_metadata_rows(user_id, objects))
+        await reservation.settle()
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        await remove_corpus(storage, objects)
+        raise
+
+
+async def _enqueue_tasks(db: AsyncSession, task_queue, tasks) -> bool:
+    """Publish committed tasks under their Celery ids and record it; False if the broker failed."""
+    try:
+        await run_in_threadpool(task_queue.enqueue, [(task.id, task.celery_task_id) for task in tasks])
+    except Exception as e:
+        # Tasks stay pending with their Celery ids; republish_alignment_tasks publishes them later
+        logger.error(f"Failed to enqueue {len(tasks)} alignment tasks: {e}")
+        return False
+    await mark_alignment_tasks_enqueued_async(db, [task.id for task in tasks])
+    return True
+
+
 @router.post("/", 
     response_model=AlignmentQueueResponse,
     summary="Create alignment task",
-    description="Upload audio and text files to create a new alignment task. The task will be queued for processing.",
+    description="Upload a corpus of audio and text files to create a new alignment task. Send one pair as "
+                "`audio_file`/`text_file` or many as `audio_files`/`text_files`, paired by position. "
+                "The task will be queued for processing.",
     responses={
         201: {"description": "Alignment task created successfully"},
         400: {"description": "Invalid file format or model validation error"},
+        413: {"description": "Storage quota exceeded"},
         500: {"description": "Internal server error"}
     }
 )
 async def create_alignment_request(
-    audio_file: UploadFile = File(..., description="Audio file (MP3 or WAV format)"),
-    text_file: UploadFile = File(..., description="Text file (TXT format)"),
+    response: Response,
+    audio_file: Optional[UploadFile] = File(None, description="Audio file (MP3 or WAV format)"),
+    text_file: Optional[UploadFile] = File(None, description="Text file (TXT format)"),
+    audio_files: List[UploadFile] = File(None, description="Audio files of a multi-file corpus"),
+    text_files: List[UploadFile] = File(None, description="Text files of a multi-file corpus, "
+                                                                      "in the order of `audio_files`"),
     acoustic_model_name: str = Form(..., description="Name of the acoustic model (e.g., 'russian_mfa')"),
     acoustic_model_version: str = Form(..., description="Version of the acoustic model (e.g., '3.1.0')"),
     dictionary_model_name: str = Form(..., description="Name of the dictionary model (e.g., 'russian_mfa')"),
     dictionary_model_version: str = Form(..., description="Version of the dictionary model (e.g., '3.1.0')"),
     g2p_model_name: str = Form(None, description="Name of the G2P model (optional, e.g., 'russian_mfa_g2p')"),
     g2p_model_version: str = Form(None, description="Version of the G2P model (optional, e.g., '3.1.0')"),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+    storage: AsyncStorage = Depends(get_async_storage),
+    task_queue = Depends(get_task_queue)
 ):
     """
     Create a new text-audio alignment task.
     
     This endpoint accepts audio and text files along with model parameters to create
-    an alignment task. The task will be validated and queued for processing.
+    an alignment task. Every audio/text pair becomes a corpus file stored at
+    ``{user_id}/corpus/{task_id}/{corpus_file_id}.{ext}``.
     
     **Requirements:**
-    - Audio file: MP3 or WAV format
-    - Text file: TXT format  
+    - Audio files: MP3 or WAV format
+    - Text files: TXT format  
     - All models must exist and belong to the same language
     """
     
     # Validate files
-    if not validate_audio_file(audio_file):
-        raise HTTPException(
-            status_code=400, 
-            detail="Invalid audio file. Only MP3 and WAV files are allowed."
-        )
-    
-    if not validate_text_file(text_file):
-        raise HTTPException(
-            status_code=400, 
-            detail="Invalid text file. Only TXT files are allowed."
+    try:
+        pairs = pair_uploads(
+            ([audio_file] if audio_file else []) + (audio_files or []),
+            ([text_file] if text_file else []) + (text_files or [])
         )
+    except CorpusError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     try:
         # Create model parameters from form fields
@@ -83,32 +164,44 @@ async def create_alignment_request(
             )
         
         # Validate that all models belong to the same language
-        is_valid, error_message, language_id = validate_models_same_language(
+        is_valid, error_message, language_id = await validate_models_same_language_async(
             db, acoustic_model_param, dictionary_model_param, g2p_model_param
         )
         
         if not is_valid:
             raise HTTPException(status_code=400, detail=error_message)
         
-        # Save uploaded files
-        audio_path = save_uploaded_file(audio_file, "audio")
-        text_path = save_uploaded_file(text_file, "text")
-        
-        # Create alignment request object
+        # The task carries the filenames of its first corpus file
         alignment_request = AlignmentQueueCreate(
-            original_audio_filename=audio_file.filename,
-            original_text_filename=text_file.filename,
+            original_audio_filename=pairs[0][0].filename,
+            original_text_filename=pairs[0][1].filename,
             acoustic_model=acoustic_model_param,
             dictionary_model=dictionary_model_param,
             g2p_model=g2p_model_param
         )
         
-        # Create task in database
-        db_task = create_alignment_task(db, alignment_request, audio_path, text_path, current_user.id)
+        # Reserve the quota, create task and corpus files, then store the files under their ids
+        async with _reserve_corpus(db, current_user.id, [upload for pair in pairs for upload in pair]) as reservation:
+            db_task, corpus_files = await create_corpus_task_async(
+                db, alignment_request, [(audio.filename, text.filename) for audio, text in pairs], current_user.id
+            )
+            db_task.celery_task_id = new_celery_task_id()
+            objects = [
+                obj
+                for corpus_file, pair in zip(corpus_files, pairs)
+                for obj in corpus_objects(current_user.id, db_task.id, corpus_file.id, pair)
+            ]
+            db_task.audio_file_path, db_task.text_file_path = objects[0].storage_path, objects[1].storage_path
+            await _store_corpus(db, storage, current_user.id, objects, reservation)
+        mark_user_wrote(response)
+        await _enqueue_tasks(db, task_queue, [db_task])
+        await db.refresh(db_task)
         
         # Return response using the from_db_model method
         return AlignmentQueueResponse.from_db_model(db_task)
         
+    except QuotaExceededError:
+        raise HTTPException(status_code=413, detail="Storage quota exceeded")
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
@@ -117,20 +210,108 @@ async def create_alignment_request(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.post("/batch",
+    response_model=AlignmentBatchResponse,
+    summary="Create alignment tasks in bulk",
+    description="Upload many audio/text pairs at once, one task per pair. Either pair `audio_files` and "
+                "`text_files` by position and give the models as form fields, or send a JSON `manifest` whose "
+                "entries reference the uploaded files by filename and name their own models.",
+    responses={
+        400: {"description": "Invalid batch, file format or model validation error"},
+        413: {"description": "Storage quota exceeded"}
+    }
+)
+async def create_alignment_batch(
+    response: Response,
+    audio_files: List[UploadFile] = File(..., description="Audio files (MP3 or WAV format)"),
+    text_files: List[UploadFile] = File(..., description="Text files (TXT format)"),
+    manifest: Optional[str] = Form(None, description="JSON list of {audio_filename, text_filename, "
+                                                     "acoustic_model, dictionary_model, g2p_model}"),
+    acoustic_model_name: Optional[str] = Form(None, description="Acoustic model for all pairs"),
+    acoustic_model_version: Optional[str] = Form(None),
+    dictionary_model_name: Optional[str] = Form(None, description="Dictionary model for all pairs"),
+    dictionary_model_version: Optional[str] = Form(None),
+    g2p_model_name: Optional[str] = Form(None, description="G2P model for all pairs (optional)"),
+    g2p_model_version: Optional[str] = Form(None),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+    storage: AsyncStorage = Depends(get_async_storage),
+    task_queue = Depends(get_task_queue)
+):
+    """
+    Create many alignment tasks in one request.
+
+    Each distinct model combination is validated once, the quota is
+    reserved once for all files, the tasks, their corpus files and file
+    metadata are inserted in one transaction and all tasks are published
+    to the broker through a single producer.
+    """
+    models = None
+    if acoustic_model_name and acoustic_model_version and dictionary_model_name and dictionary_model_version:
+        g2p = ModelParameter(name=g2p_model_name, version=g2p_model_version) \
+            if g2p_model_name and g2p_model_version else None
+        models = (ModelParameter(name=acoustic_model_name, version=acoustic_model_version),
+                  ModelParameter(name=dictionary_model_name, version=dictionary_model_version), g2p)
+    try:
+        items = build_batch(audio_files, text_files, manifest, models)
+    except BatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    checked = {}
+    for item in items:
+        if item.model_key not in checked:
+            checked[item.model_key] = await validate_models_same_language_async(
+                db, item.acoustic_model, item.dictionary_model, item.g2p_model
+            )
+        is_valid, error_message, _ = checked[item.model_key]
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=error_message)
+
+    rows = [
+        dict(alignment_task_values(item.task_create(), None, None, current_user.id),
+             celery_task_id=new_celery_task_id())
+        for item in items
+    ]
+    uploads = [upload for item in items for upload in (item.audio_file, item.text_file)]
+    try:
+        async with _reserve_corpus(db, current_user.id, uploads) as reservation:
+            tasks = await create_alignment_tasks_bulk_async(db, current_user.id, rows)
+            corpus_files = await create_corpus_files_async(db, [
+                (task.id, item.audio_file.filename, item.text_file.filename) for task, item in zip(tasks, items)
+            ])
+            objects = []
+            for task, corpus_file, item in zip(tasks, corpus_files, items):
+                audio, text = corpus_objects(current_user.id, task.id, corpus_file.id, (item.audio_file, item.text_file))
+                task.audio_file_path, task.text_file_path = audio.storage_path, text.storage_path
+                objects.extend((audio, text))
+            await _store_corpus(db, storage, current_user.id, objects, reservation)
+    except QuotaExceededError:
+        raise HTTPException(status_code=413, detail="Storage quota exceeded")
+    await refresh_alignment_tasks_async(db, tasks)
+    mark_user_wrote(response)
+
+    enqueued = await _enqueue_tasks(db, task_queue, tasks)
+
+    return AlignmentBatchResponse(
+        tasks=[AlignmentQueueResponse.from_db_model(task) for task in tasks],
+        enqueued=enqueued
+    )
+
+
 @router.get("/", 
     response_model=List[AlignmentQueueResponse],
     summary="List alignment tasks",
     description="Retrieve all alignment tasks with optional status filtering and pagination support."
 )
-def get_alignment_requests(
+async def get_alignment_requests(
     skip: int = 0, 
     limit: int = 100,
     status: AlignmentStatus = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_async_db)
 ):
     """Get all alignment tasks with optional status filter and pagination."""
-    tasks = get_alignment_tasks(db, skip=skip, limit=limit, user_id=current_user.id, status=status)
+    tasks = await get_alignment_tasks_async(db, skip=skip, limit=limit, user_id=current_user.id, status=status)
     return [AlignmentQueueResponse.from_db_model(task) for task in tasks]
 
 
@@ -143,18 +324,39 @@ def get_alignment_requests(
         404: {"description": "Alignment task not found"}
     }
 )
-def get_alignment_request(
+async def get_alignment_request(
     task_id: int, 
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific alignment task by its ID."""
-    task = get_alignment_task(db, task_id=task_id, user_id=current_user.id)
+    task = await get_alignment_task_async(db, task_id=task_id, user_id=current_user.id)
     if task is None:
         raise HTTPException(status_code=404, detail="Alignment task not found")
     return AlignmentQueueResponse.from_db_model(task)
 
 
+@router.get("/{task_id}/files",
+    response_model=List[CorpusFileResponse],
+    summary="List corpus files",
+    description="List the corpus files of a task with their alignment status. Results of completed "
+                "files can be downloaded while the rest of the corpus is still processing.",
+    responses={
+        404: {"description": "Alignment task not found"}
+    }
+)
+async def get_corpus_files(
+    task_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List the corpus files of a task."""
+    task = await get_alignment_task_async(db, task_id=task_id, user_id=current_user.id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Alignment task not found")
+    return await get_corpus_files_async(db, task.id)
+
+
 @router.put("/{task_id}", 
     response_model=AlignmentQueueResponse,
     summary="Update alignment task",
@@ -167,19 +369,21 @@ def get_alignment_request(
 def update_alignment_request(
     task_id: int, 
     task_update: AlignmentQueueUpdate,
-    current_user: User = Depends(get_current_active_user), 
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_active_user), 
     db: Session = Depends(get_db)
 ):
     """Update an existing alignment task."""
     task = update_alignment_task(db, task_id=task_id, task_update=task_update, user_id=current_user.id)
     if task is None:
         raise HTTPException(status_code=404, detail="Alignment task not found")
+    mark_user_wrote(response)
     return AlignmentQueueResponse.from_db_model(task)
 
 
 @router.delete("/{task_id}",
     summary="Delete alignment task",
-    description="Delete an alignment task from the queue.",
+    description="Delete an alignment task from the queue along with its corpus files and results.",
     responses={
         200: {"description": "Task deleted successfully"},
         404: {"description": "Alignment task not found"}
@@ -187,11 +391,248 @@ def update_alignment_request(
 )
 def delete_alignment_request(
     task_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    storage = Depends(get_storage)
 ):
-    """Delete an alignment task from the queue."""
+    """Delete an alignment task from the queue together with its stored files."""
+    task = _get_user_task(db, task_id, current_user)
+    prefixes = [corpus_prefix(task.user_id, task.id), results_prefix(task.user_id, task.id)]
+    UserService.remove_task_file_metadata(db, task.id)
     success = delete_alignment_task(db, task_id=task_id, user_id=current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="Alignment task not found")
+    mark_user_wrote(response)
+    storage.delete_prefixes(prefixes)
     return {"message": "Task deleted successfully"}
+
+
+@router.get("/{task_id}/audio/{corpus_file_id}/segment",
+    summary="Get audio segment",
+    description="Return the audio between `start` and `end` seconds of a corpus file. "
+                "Only the bytes of the requested segment are read from storage.",
+    response_class=Response,
+    responses={
+        200: {"description": "Playable audio segment", "content": {"audio/wav": {}, "audio/mpeg": {}}},
+        400: {"description": "Invalid time range or audio format"},
+        404: {"description": "Alignment task or audio file not found"}
+    }
+)
+def get_audio_segment(
+    task_id: int,
+    corpus_file_id: int,
+    start: float = Query(..., ge=0, description="Segment start in seconds"),
+    end: float = Query(..., gt=0, description="Segment end in seconds"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    storage = Depends(get_storage)
+):
+    """Serve a time range of a corpus audio file using its seek index."""
+    if end <= start:
+        raise HTTPException(status_code=400, detail="Segment end must be greater than start")
+    if end - start > MAX_SEGMENT_DURATION:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Segment duration must not exceed {MAX_SEGMENT_DURATION:g} seconds"
+        )
+
+    task, corpus_file = _get_user_corpus_file(db, task_id, corpus_file_id, current_user)
+    extension = file_extension(corpus_file.original_audio_filename)
+    audio_path = corpus_file_path(task.user_id, task.id, corpus_file.id, extension)
+
+    try:
+        segment = read_audio_segment(storage, audio_path, extension, start, end)
+    except SeekIndexError as e:
+        raise HTTPException(status_code=400, detail=f"Unsupported audio file: {str(e)}")
+
+    if segment is None:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    return Response(
+        content=segment.content,
+        media_type=segment.media_type,
+        headers={
+            "X-Segment-Start": f"{segment.start:.3f}",
+            "X-Segment-End": f"{segment.end:.3f}"
+        }
+    )
+
+
+@router.get("/{task_id}/audio/{corpus_file_id}/word",
+    summary="Get audio of a word",
+    description="Return the audio of one occurrence of `word` in a corpus file, "
+                "located through the word index of the alignment result.",
+    response_class=Response,
+    responses={
+        200: {"description": "Playable audio of the word", "content": {"audio/wav": {}, "audio/mpeg": {}}},
+        404: {"description": "Alignment task, result, audio or word not found"}
+    }
+)
+def get_word_audio(
+    task_id: int,
+    corpus_file_id: int,
+    word: str = Query(..., min_length=1, description="Word to play (case-insensitive)"),
+    occurrence: int = Query(0, ge=0, description="Zero-based occurrence of the word in the file"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    storage = Depends(get_storage)
+):
+    """Serve the audio of a word occurrence with a single ranged read."""
+    task, corpus_file = _get_user_corpus_file(db, task_id, corpus_file_id, current_user)
+
+    word_index = load_word_index(storage, result_file_path(task.user_id, task.id, corpus_file.id))
+    if word_index is None:
+        raise HTTPException(status_code=404, detail="Alignment result not found")
+
+    intervals = word_index.lookup(word)
+    if occurrence >= len(intervals):
+        raise HTTPException(status_code=404, detail="Word not found")
+    start, end = intervals[occurrence]
+
+    extension = file_extension(corpus_file.original_audio_filename)
+    audio_path = corpus_file_path(task.user_id, task.id, corpus_file.id, extension)
+
+    try:
+        segment = read_audio_segment(storage, audio_path, extension, start, end)
+    except SeekIndexError as e:
+        raise HTTPException(status_code=400, detail=f"Unsupported audio file: {str(e)}")
+
+    if segment is None:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    return Response(
+        content=segment.content,
+        media_type=segment.media_type,
+        headers={
+            "X-Segment-Start": f"{segment.start:.3f}",
+            "X-Segment-End": f"{segment.end:.3f}",
+            "X-Word-Occurrences": str(len(intervals))
+        }
+    )
+
+
+def _get_user_task(db: Session, task_id: int, user: CurrentUser):
+    task = get_alignment_task(db, task_id=task_id, user_id=user.id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Alignment task not found")
+    return task
+
+
+def _get_user_corpus_file(db: Session, task_id: int, corpus_file_id: int, user: CurrentUser):
+    task = _get_user_task(db, task_id, user)
+    corpus_file = get_task_corpus_file(db, task.id, corpus_file_id)
+    if corpus_file is None:
+        raise HTTPException(status_code=404, detail="Corpus file not found")
+    return task, corpus_file
+
+
+DOWNLOAD_RESPONSES = {
+    200: {"description": "Full file"},
+    206: {"description": "Requested byte range of the file"},
+    404: {"description": "Alignment task or file not found"},
+    416: {"description": "Requested range not satisfiable"}
+}
+
+
+@router.get("/{task_id}/download/corpus",
+    summary="Download the whole corpus",
+    description="Stream a ZIP archive of all corpus files of the task under their uploaded names. "
+                "The archive is built on the fly, "
+                "audio is stored uncompressed and text is deflated.",
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "ZIP archive of the corpus", "content": {"application/zip": {}}},
+        404: {"description": "Alignment task or corpus not found"}
+    }
+)
+def download_corpus(
+    task_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    storage = Depends(get_storage)
+):
+    """Stream all corpus files of a task as a ZIP archive."""
+    task = _get_user_task(db, task_id, current_user)
+    members = corpus_archive_members(task)
+    if not members:
+        raise HTTPException(status_code=404, detail="Corpus files not found")
+
+    return stream_zip(storage, members, filename=f"corpus_{task.id}.zip")
+
+
+@router.get("/{task_id}/download/audio/{corpus_file_id}",
+    summary="Download corpus audio file",
+    description="Stream a corpus audio file. Supports `Range` and `If-Range` headers for seeking.",
+    response_class=StreamingResponse,
+    responses=DOWNLOAD_RESPONSES
+)
+async def download_audio_file(
+    task_id: int,
+    corpus_file_id: int,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    storage: AsyncStorage = Depends(get_async_storage)
+):
+    """Stream a corpus audio file."""
+    task, corpus_file = await run_in_threadpool(_get_user_corpus_file, db, task_id, corpus_file_id, current_user)
+    extension = file_extension(corpus_file.original_audio_filename)
+    return await stream_storage_file_async(
+        storage,
+        corpus_file_path(task.user_id, task.id, corpus_file.id, extension),
+        request,
+        media_type=AUDIO_CONTENT_TYPES.get(extension, "application/octet-stream"),
+        filename=corpus_file.original_audio_filename
+    )
+
+
+@router.get("/{task_id}/download/text/{corpus_file_id}",
+    summary="Download corpus text file",
+    description="Stream a corpus text file. Supports `Range` and `If-Range` headers.",
+    response_class=StreamingResponse,
+    responses=DOWNLOAD_RESPONSES
+)
+async def download_text_file(
+    task_id: int,
+    corpus_file_id: int,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    storage: AsyncStorage = Depends(get_async_storage)
+):
+    """Stream a corpus text file."""
+    task, corpus_file = await run_in_threadpool(_get_user_corpus_file, db, task_id, corpus_file_id, current_user)
+    extension = file_extension(corpus_file.original_text_filename)
+    return await stream_storage_file_async(
+        storage,
+        corpus_file_path(task.user_id, task.id, corpus_file.id, extension),
+        request,
+        media_type="text/plain; charset=utf-8",
+        filename=corpus_file.original_text_filename
+    )
+
+
+@router.get("/{task_id}/download/result/{corpus_file_id}",
+    summary="Download alignment result",
+    description="Stream the JSON alignment result of a corpus file. Supports `Range` and `If-Range` headers.",
+    response_class=StreamingResponse,
+    responses=DOWNLOAD_RESPONSES
+)
+async def download_result_file(
+    task_id: int,
+    corpus_file_id: int,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    storage: AsyncStorage = Depends(get_async_storage)
+):
+    """Stream the alignment result of a corpus file."""
+    task, corpus_file = await run_in_threadpool(_get_user_corpus_file, db, task_id, corpus_file_id, current_user)
+    return await stream_storage_file_async(
+        storage,
+        result_file_path(task.user_id, task.id, corpus_file.id),
+        request,
+        media_type="application/json",
+        filename=os.path.splitext(corpus_file.original_audio_filename)[0] + ".json"
+    )
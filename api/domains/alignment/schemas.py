@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from api.domains.alignment.models import AlignmentStatus
 
 
@@ -21,6 +21,15 @@ class AlignmentQueueCreate(AlignmentQueueBase):
     g2p_model: Optional[ModelParameter] = None
 
 
+class AlignmentBatchEntry(BaseModel):
+    """One task of a batch manifest; files are referenced by upload filename."""
+    audio_filename: str
+    text_filename: str
+    acoustic_model: ModelParameter
+    dictionary_model: ModelParameter
+    g2p_model: Optional[ModelParameter] = None
+
+
 class AlignmentQueueUpdate(BaseModel):
     status: Optional[AlignmentStatus] = None
     result_path: Optional[str] = None
@@ -29,8 +38,8 @@ class AlignmentQueueUpdate(BaseModel):
 
 class AlignmentQueueResponse(AlignmentQueueBase):
     id: int
-    audio_file_path: str
-    text_file_path: str
+    audio_file_path: Optional[str] = None
+    text_file_path: Optional[str] = None
     acoustic_model: ModelParameter
     dictionary_model: ModelParameter
     g2p_model: Optional[ModelParameter] = None
@@ -75,3 +84,21 @@ class AlignmentQueueResponse(AlignmentQueueBase):
             created_at=db_model.created_at,
             updated_at=db_model.updated_at
         )
+
+
+class AlignmentBatchResponse(BaseModel):
+    tasks: List[AlignmentQueueResponse]
+    enqueued: bool
+
+
+class CorpusFileResponse(BaseModel):
+    id: int
+    task_id: int
+    original_audio_filename: str
+    original_text_filename: str
+    status: AlignmentStatus
+    error_message: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,72 @@
+"""
+Word lookups in alignment results backed by cached word indexes.
+"""
+
+import io
+import json
+import os
+from typing import Optional
+
+from api.cache import TTLCache
+from shared.results.columnar import ColumnarFormatError, columnar_path_for, read_columnar_words
+from shared.results.word_index import (
+    WordIndex,
+    encode_word_entries,
+    encode_word_index,
+    word_index_path_for,
+    WORD_INDEX_CONTENT_TYPE,
+)
+
+WORD_INDEX_CACHE_SIZE = int(os.getenv("WORD_INDEX_CACHE_SIZE", "256"))
+WORD_INDEX_CACHE_TTL = float(os.getenv("WORD_INDEX_CACHE_TTL", "3600"))
+
+# Decoded indexes keyed by storage path; the TTL bounds how long an index
+# of a re-aligned result can be served by other workers
+word_index_cache = TTLCache(WORD_INDEX_CACHE_SIZE, WORD_INDEX_CACHE_TTL)
+
+
+def _build_word_index(storage, result_path: str) -> Optional[bytes]:
+    """
+    Build the word index of a result stored without one.
+
+    The word sections of the columnar sibling are fetched with ranged reads;
+    only results stored before columnar files existed fall back to parsing
+    the full JSON.
+    """
+    try:
+        words = read_columnar_words(storage, columnar_path_for(result_path))
+    except ColumnarFormatError:
+        words = None
+    if words is not None:
+        return encode_word_entries(words)
+
+    raw_result = storage.download_file(result_path)
+    if raw_result is None:
+        return None
+    return encode_word_index(json.loads(raw_result))
+
+
+def load_word_index(storage, result_path: str) -> Optional[WordIndex]:
+    """
+    Return the word index of a JSON result, using the in-process cache.
+
+    A missing index is built once from the stored result and saved next to it.
+
+    Returns:
+        WordIndex: Index of the result, None if the result doesn't exist
+    """
+    index_path = word_index_path_for(result_path)
+    index = word_index_cache.get(index_path)
+    if index is not None:
+        return index
+
+    data = storage.download_file(index_path)
+    if data is None:
+        data = _build_word_index(storage, result_path)
+        if data is None:
+            return None
+        storage.upload_file(index_path, io.BytesIO(data), len(data), WORD_INDEX_CONTENT_TYPE)
+
+    index = WordIndex(data)
+    word_index_cache.set(index_path, index)
+    return index
@@ -4,10 +4,12 @@ Authentication domain module.
 
 from .security import create_access_token, verify_token, get_password_hash, verify_password
 from .dependencies import get_current_user, get_current_active_user
+from .cache import CurrentUser, invalidate_user, invalidate_users, clear_auth_caches
 from .schemas import Token, TokenData
 
 __all__ = [
     'create_access_token', 'verify_token', 'get_password_hash', 'verify_password',
     'get_current_user', 'get_current_active_user',
+    'CurrentUser', 'invalidate_user', 'invalidate_users', 'clear_auth_caches',
     'Token', 'TokenData'
 ]
@@ -0,0 +1,103 @@
+"""
+Caches used by the authentication dependencies.
+
+Verified token claims are kept until the token expires (capped by
+``AUTH_TOKEN_CACHE_TTL``) and a slim snapshot of each authenticated user is
+kept for ``AUTH_USER_CACHE_TTL`` seconds, so polling clients don't decode
+the JWT and query the users table on every request. Snapshots are dropped
+as soon as a user or subscription type is updated through the ORM in this
+process; other workers pick the change up when their entry expires.
+
+Bulk ``update()``/``delete()`` statements bypass the ORM events, so code
+that changes a snapshot field (``is_active``, ``username``, ``role``,
+``subscription_type_id``) or deletes users that way must call
+``invalidate_users`` itself. The storage accounting statements only touch
+``used_storage``/``reserved_storage``, which snapshots don't carry.
+``AUTH_USER_CACHE_TTL`` bounds how long anything missed stays stale, so keep
+it short. Cached claims hold no user state: a changed password doesn't
+revoke issued tokens either way, and a deactivated user is rejected through
+the snapshot.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+
+from api.cache import TTLCache
+from api.domains.users.models import User, SubscriptionType, UserRole
+
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "30"))
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Authenticated user as seen by request handlers."""
+    id: int
+    username: str
+    is_active: bool
+    role: UserRole
+    subscription_type_id: int
+    total_storage_limit: int
+    max_concurrent_tasks: int
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        subscription = user.subscription_type
+        return cls(
+            id=user.id,
+            username=user.username,
+            is_active=user.is_active,
+            role=user.role,
+            subscription_type_id=user.subscription_type_id,
+            total_storage_limit=subscription.total_storage_limit,
+            max_concurrent_tasks=subscription.max_concurrent_tasks
+        )
+
+
+token_cache = TTLCache(AUTH_TOKEN_CACHE_SIZE, AUTH_TOKEN_CACHE_TTL)
+user_cache = TTLCache(AUTH_USER_CACHE_SIZE, AUTH_USER_CACHE_TTL)
+
+
+def get_cached_claims(token: str) -> Optional[dict]:
+    return token_cache.get(token)
+
+
+def cache_claims(token: str, claims: dict) -> None:
+    """Cache verified claims, never beyond the token's own expiry."""
+    expires_at = claims.get("exp")
+    ttl = None if expires_at is None else expires_at - time.time()
+    token_cache.set(token, claims, ttl=ttl)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop the cached snapshot of a user, e.g. after deactivation."""
+    user_cache.pop(user_id)
+
+
+def invalidate_users(user_ids: Iterable[int]) -> None:
+    """Drop the cached snapshots of users changed by a bulk statement."""
+    for user_id in user_ids:
+        user_cache.pop(user_id)
+
+
+def clear_auth_caches() -> None:
+    token_cache.clear()
+    user_cache.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_row(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
+
+
+@event.listens_for(SubscriptionType, "after_update")
+def _invalidate_subscription_row(mapper, connection, target: SubscriptionType) -> None:
+    # Limits are copied into every snapshot of the plan's users
+    user_cache.clear()
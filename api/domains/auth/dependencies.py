@@ -4,23 +4,56 @@ Authentication dependencies for FastAPI.
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from api.database import get_db
-from api.domains.users.models import User
+from api.database import get_async_db
 from api.domains.users.crud import UserService
+from .cache import CurrentUser, get_cached_claims, cache_claims, user_cache
 from .security import verify_token
-from .schemas import TokenData
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
 
+async def _resolve_user(token: str, db: AsyncSession) -> Optional[CurrentUser]:
+    """
+    Resolve a bearer token to the user it was issued for.
+
+    Verified claims and user snapshots are served from the auth caches;
+    the database is only queried on a cache miss.
+    """
+    claims = get_cached_claims(token)
+    if claims is None:
+        claims = verify_token(token)
+        if claims is None or claims.get("sub") is None:
+            return None
+        claims = dict(claims)
+        cache_claims(token, claims)
+
+    user_id = claims.get("user_id")
+    if user_id is not None:
+        current_user = user_cache.get(user_id)
+        if current_user is not None:
+            return current_user
+        user = await UserService.get_user_by_id_async(db, user_id)
+    else:
+        # Tokens issued without a user_id claim are resolved by username once
+        user = await UserService.get_user_by_username_async(db, claims["sub"])
+        if user is not None:
+            claims["user_id"] = user.id
+
+    if user is None:
+        return None
+    current_user = CurrentUser.from_user(user)
+    user_cache.set(current_user.id, current_user)
+    return current_user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
     """Get current authenticated user from JWT token."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -28,23 +61,7 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        # Verify token
-        payload = verify_token(credentials.credentials)
-        if payload is None:
-            raise credentials_exception
-        
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        
-        token_data = TokenData(username=username)
-        
-    except Exception:
-        raise credentials_exception
-    
-    # Get user from database
-    user = UserService.get_user_by_username(db, username=token_data.username)
+    user = await _resolve_user(credentials.credentials, db)
     if user is None:
         raise credentials_exception
     
@@ -52,8 +69,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """Get current active user (additional check for user status)."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -62,23 +79,11 @@ async def get_current_active_user(
 
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[CurrentUser]:
     """Get current user if token is provided, otherwise return None."""
     if not credentials:
         return None
     
-    try:
-        payload = verify_token(credentials.credentials)
-        if payload is None:
-            return None
-        
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        
-        user = UserService.get_user_by_username(db, username=username)
-        return user if user and user.is_active else None
-        
-    except Exception:
-        return None
+    user = await _resolve_user(credentials.credentials, db)
+    return user if user and user.is_active else None
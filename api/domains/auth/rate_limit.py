@@ -0,0 +1,147 @@
+"""
+Rate limiting of failed logins.
+
+Attempts are checked before the password is verified, so a blocked client
+costs no bcrypt work. Failures are counted in a sliding window per client
+address and username, and per client address across all usernames.
+Counters are per process.
+
+Behind a reverse proxy every request comes from the proxy's address, so
+the client address is taken from ``X-Forwarded-For`` when the connection
+comes from one of ``TRUSTED_PROXIES`` (comma-separated addresses or
+networks).
+"""
+
+import ipaddress
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Hashable, List, Optional, Sequence
+
+from starlette.requests import Request
+
+LOGIN_RATE_WINDOW = float(os.getenv("LOGIN_RATE_WINDOW", "60"))
+LOGIN_MAX_FAILURES = int(os.getenv("LOGIN_MAX_FAILURES", "5"))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", "20"))
+# Clients tracked at once; the least recently seen are forgotten first
+LOGIN_RATE_MAX_KEYS = 100000
+
+
+def _parse_networks(value: str) -> List:
+    return [ipaddress.ip_network(item.strip(), strict=False) for item in value.split(",") if item.strip()]
+
+
+TRUSTED_PROXIES = _parse_networks(os.getenv("TRUSTED_PROXIES", ""))
+
+
+def _is_trusted(address: str, trusted_proxies: Sequence) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def client_address(request: Request, trusted_proxies: Optional[Sequence] = None) -> str:
+    """
+    Return the address of the client that sent the request.
+
+    ``X-Forwarded-For`` is only honoured when the peer is a trusted proxy;
+    it is read from the right, skipping further trusted proxies, so a
+    client can't choose its address by sending the header itself.
+    """
+    trusted_proxies = TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies
+    address = request.client.host if request.client else "unknown"
+    if not _is_trusted(address, trusted_proxies):
+        return address
+    forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(forwarded):
+        address = hop
+        if not _is_trusted(hop, trusted_proxies):
+            break
+    return address
+
+
+class SlidingWindowCounter:
+    """Thread-safe count of recent events per key."""
+
+    def __init__(self, limit: int, window: float, max_keys: int = LOGIN_RATE_MAX_KEYS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._clock = clock
+        self._events: "OrderedDict[Hashable, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _recent(self, key: Hashable, now: float) -> Deque[float]:
+        events = self._events.get(key)
+        if events is None:
+            return deque()
+        while events and events[0] <= now - self.window:
+            events.popleft()
+        if not events:
+            del self._events[key]
+        return events
+
+    def retry_after(self, key: Hashable) -> Optional[float]:
+        """Seconds until ``key`` is below its limit, None if it already is."""
+        with self._lock:
+            now = self._clock()
+            events = self._recent(key, now)
+            if len(events) < self.limit:
+                return None
+            return events[len(events) - self.limit] + self.window - now
+
+    def add(self, key: Hashable) -> None:
+        with self._lock:
+            now = self._clock()
+            events = self._recent(key, now)
+            events.append(now)
+            self._events[key] = events
+            self._events.move_to_end(key)
+            while len(self._events) > self.max_keys:
+                self._events.popitem(last=False)
+
+    def reset(self, key: Hashable) -> None:
+        with self._lock:
+            self._events.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+
+class LoginRateLimiter:
+    """Failed login limits per (client, username) and per client."""
+
+    def __init__(self, max_failures: int = LOGIN_MAX_FAILURES,
+                 max_failures_per_client: int = LOGIN_MAX_FAILURES_PER_IP,
+                 window: float = LOGIN_RATE_WINDOW, clock: Callable[[], float] = time.monotonic):
+        self.per_user = SlidingWindowCounter(max_failures, window, clock=clock)
+        self.per_client = SlidingWindowCounter(max_failures_per_client, window, clock=clock)
+
+    def retry_after(self, client: str, username: str) -> Optional[float]:
+        """Seconds the client has to wait before trying again, None if allowed."""
+        delays = [
+            delay for delay in (
+                self.per_user.retry_after((client, username.lower())),
+                self.per_client.retry_after(client)
+            ) if delay is not None
+        ]
+        return max(delays) if delays else None
+
+    def record_failure(self, client: str, username: str) -> None:
+        self.per_user.add((client, username.lower()))
+        self.per_client.add(client)
+
+    def record_success(self, client: str, username: str) -> None:
+        self.per_user.reset((client, username.lower()))
+
+    def clear(self) -> None:
+        self.per_user.clear()
+        self.per_client.clear()
+
+
+login_rate_limiter = LoginRateLimiter()
@@ -2,40 +2,55 @@
 Authentication routes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import math
 from datetime import timedelta
 
-from api.database import get_db
-from api.domains.users.models import User
+from api.database import get_async_db
+from api.passwords import PasswordHashingBusy, get_password_hash_async
 from api.domains.users.schemas import UserCreate, UserLogin, UserResponse
 from api.domains.users.crud import UserService
 from .schemas import Token
 from .security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from .dependencies import get_current_active_user
+from .cache import CurrentUser
+from .rate_limit import client_address, login_rate_limiter
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
+def _busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, try again later",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=UserResponse)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if user already exists
-    if UserService.get_user_by_email(db, user.email):
+    if await UserService.get_user_by_email_async(db, user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    if UserService.get_user_by_username(db, user.username):
+    if await UserService.get_user_by_username_async(db, user.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
-    # Create user
-    db_user = UserService.create_user(db, user)
+    # Hash off the event loop, then create user
+    try:
+        password_hash = await get_password_hash_async(user.password)
+    except PasswordHashingBusy:
+        raise _busy_exception()
+    db_user = await UserService.create_user_async(db, user, password_hash)
     
     # Return user response
     return UserResponse(
@@ -52,17 +67,32 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login_user(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user_login: UserLogin, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return JWT token."""
-    user = UserService.authenticate_user(db, user_login.username, user_login.password)
+    client = client_address(request)
+    retry_after = login_rate_limiter.retry_after(client, user_login.username)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    
+    try:
+        user = await UserService.authenticate_user_async(db, user_login.username, user_login.password)
+    except PasswordHashingBusy:
+        raise _busy_exception()
     
     if not user:
+        login_rate_limiter.record_failure(client, user_login.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    login_rate_limiter.record_success(client, user_login.username)
+    
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -75,12 +105,12 @@ async def login_user(user_login: UserLogin, db: Session = Depends(get_db)):
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user information."""
     # Refresh user data from database to get latest info
-    user = UserService.get_user_by_id(db, current_user.id)
+    user = await UserService.get_user_by_id_async(db, current_user.id)
     
     return UserResponse(
         id=user.id,
@@ -1,11 +1,13 @@
-from .models import Language, MFAModel, ModelType
+from .models import CatalogRefresh, Language, MFAModel, ModelType, RefreshStatus
 from .schemas import (
     LanguageBase, LanguageCreate, LanguageResponse,
     MFAModelBase, MFAModelCreate, MFAModelResponse,
-    ModelsUpdateResponse
+    ModelVersion, ModelCombination, LanguageCompatibilityResponse,
+    CatalogRefreshResponse
 )
 from .crud import (
     create_language, get_language_by_code, get_languages,
     create_mfa_model, get_mfa_models, get_mfa_models_by_type,
-    get_mfa_model_by_name_type_version
+    get_mfa_model_by_name_type_version,
+    start_catalog_refresh, finish_catalog_refresh
 )
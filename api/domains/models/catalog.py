@@ -0,0 +1,165 @@
+"""
+In-memory index of the model catalog.
+
+The catalog changes only when it is refreshed from the mfa-models
+repository, so API processes can answer catalog queries from a snapshot
+instead of the database. Snapshots are per process and expire after
+``MODEL_CATALOG_CACHE_TTL`` seconds, which bounds how long a refreshed
+catalog takes to show up; 0 disables the cache.
+
+Each snapshot also precomputes which models can be combined in an
+alignment task, so submissions are validated with dictionary lookups.
+"""
+
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cache import TTLCache
+from api.domains.models.crud import (
+    ModelFilter, count_filtered_mfa_models_async, find_mfa_models_async, get_catalog_async
+)
+from api.domains.models.models import ModelType
+from api.domains.models.schemas import (
+    LanguageCompatibilityResponse, MFAModelResponse, ModelCombination, ModelVersion
+)
+
+MODEL_CATALOG_CACHE_TTL = float(os.getenv("MODEL_CATALOG_CACHE_TTL", "60"))
+
+# Filter combinations whose matches are memoized per snapshot
+MAX_MEMOIZED_FILTERS = 256
+
+catalog_cache = TTLCache(1, MODEL_CATALOG_CACHE_TTL)
+
+
+def catalog_cache_ttl() -> float:
+    return catalog_cache.ttl
+
+
+def catalog_cache_enabled() -> bool:
+    return catalog_cache_ttl() > 0
+
+
+def phone_sets_compatible(first: Optional[str], second: Optional[str]) -> bool:
+    """Models work together unless both declare different phone sets (e.g. ARPA and IPA)."""
+    return first is None or second is None or first == second
+
+
+class CatalogIndex:
+    """
+    Snapshot of the active models, indexed by the equality filters.
+
+    A query starts from the smallest index list of its equality filters and
+    memoizes the ids of its matches, so repeated queries cost a bisect and
+    a page slice.
+    """
+
+    def __init__(self, models: List[MFAModelResponse]):
+        self.models = {model.id: model for model in models}
+        self.ids = [model.id for model in models]
+        self._indexes: Dict[str, Dict[object, List[int]]] = {
+            "model_type": {}, "language_code": {}, "version": {}, "variant": {}
+        }
+        for model in models:
+            for field, key in (("model_type", model.model_type), ("language_code", model.language.code),
+                               ("version", model.version), ("variant", model.variant)):
+                self._indexes[field].setdefault(key, []).append(model.id)
+        self._matches: "OrderedDict[ModelFilter, List[int]]" = OrderedDict()
+        self._by_key = {(model.model_type, model.name, model.version): model for model in models}
+        self.compatibility = self._compatibility(models)
+
+    def _match(self, filters: ModelFilter) -> List[int]:
+        ids = self._matches.get(filters)
+        if ids is not None:
+            return ids
+        candidates = self.ids
+        for field, index in self._indexes.items():
+            value = getattr(filters, field)
+            if value:
+                ids_with_value = index.get(value, [])
+                if len(ids_with_value) < len(candidates):
+                    candidates = ids_with_value
+        ids = [model_id for model_id in candidates if self._matches_filters(self.models[model_id], filters)]
+        # Plain dict operations only: concurrent requests run on one event loop
+        self._matches[filters] = ids
+        if len(self._matches) > MAX_MEMOIZED_FILTERS:
+            self._matches.popitem(last=False)
+        return ids
+
+    @staticmethod
+    def _matches_filters(model: MFAModelResponse, filters: ModelFilter) -> bool:
+        return (
+            (not filters.model_type or model.model_type == filters.model_type)
+            and (not filters.language_code or model.language.code == filters.language_code)
+            and (not filters.name_prefix or model.name.startswith(filters.name_prefix))
+            and (not filters.version or model.version == filters.version)
+            and (not filters.variant or model.variant == filters.variant)
+        )
+
+    def find(self, model_type: ModelType, name: str, version: str) -> Optional[MFAModelResponse]:
+        """Model by name and version, also accepting the name without its type suffix."""
+        return (self._by_key.get((model_type, name, version))
+                or self._by_key.get((model_type, f"{name}_{model_type.value}", version)))
+
+    @staticmethod
+    def _compatibility(models: List[MFAModelResponse]) -> Dict[str, LanguageCompatibilityResponse]:
+        """Valid acoustic/dictionary/G2P combinations of every language, by language code."""
+        by_language: Dict[str, Dict[ModelType, List[MFAModelResponse]]] = {}
+        for model in sorted(models, key=lambda model: (model.name, model.version)):
+            by_language.setdefault(model.language.code, {}).setdefault(model.model_type, []).append(model)
+
+        compatibility = {}
+        for code, by_type in sorted(by_language.items()):
+            g2p_models = by_type.get(ModelType.G2P, [])
+            combinations = [
+                ModelCombination(
+                    acoustic=_version(acoustic),
+                    dictionary=_version(dictionary),
+                    g2p=[_version(g2p) for g2p in g2p_models if phone_sets_compatible(g2p.phone_set, dictionary.phone_set)]
+                )
+                for acoustic in by_type.get(ModelType.ACOUSTIC, [])
+                for dictionary in by_type.get(ModelType.DICTIONARY, [])
+                if phone_sets_compatible(acoustic.phone_set, dictionary.phone_set)
+            ]
+            if combinations:
+                language = next(iter(by_type.values()))[0].language
+                compatibility[code] = LanguageCompatibilityResponse(language=language, combinations=combinations)
+        return compatibility
+
+    def query(self, filters: ModelFilter, after_id: Optional[int] = None,
+              skip: int = 0, limit: int = 100) -> Tuple[List[MFAModelResponse], int]:
+        """Page of models matching ``filters`` and their total, like the SQL query."""
+        ids = self._match(filters)
+        start = 0 if after_id is None else bisect_right(ids, after_id)
+        start += skip
+        return [self.models[model_id] for model_id in ids[start:start + limit]], len(ids)
+
+
+def _version(model: MFAModelResponse) -> ModelVersion:
+    return ModelVersion(name=model.name, version=model.version, phone_set=model.phone_set)
+
+
+async def get_catalog_index(db: AsyncSession) -> CatalogIndex:
+    """Cached catalog index; built for every call while the cache is disabled."""
+    index = catalog_cache.get("catalog")
+    if index is None:
+        index = CatalogIndex([MFAModelResponse.model_validate(model) for model in await get_catalog_async(db)])
+        catalog_cache.set("catalog", index)
+    return index
+
+
+async def find_models(db: AsyncSession, filters: ModelFilter, after_id: Optional[int] = None,
+                      skip: int = 0, limit: int = 100) -> Tuple[list, int]:
+    """
+    Page of active models matching ``filters`` and their total count.
+
+    Answered from the cached catalog index when caching is enabled,
+    otherwise by a filtered, keyset-paginated query and a count.
+    """
+    if catalog_cache_enabled():
+        return (await get_catalog_index(db)).query(filters, after_id, skip, limit)
+    models = await find_mfa_models_async(db, filters, after_id, skip, limit)
+    return models, await count_filtered_mfa_models_async(db, filters)
@@ -1,8 +1,27 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from api.domains.models.models import Language, MFAModel, ModelType
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import Dict, List, Optional, Tuple
+from api.domains.models.models import CatalogRefresh, Language, MFAModel, ModelType, RefreshStatus
 from api.domains.models.schemas import LanguageCreate, MFAModelCreate
 
+# Models removed from the catalog stay for tasks referencing them, but are not offered
+ACTIVE_MODEL = MFAModel.deleted_at.is_(None)
+
+# Natural key of a catalog model
+ModelKey = Tuple[str, ModelType, str]
+
+# Rows per upsert statement
+UPSERT_BATCH_SIZE = 500
+
+# Seconds after which an unfinished catalog refresh is presumed lost (the worker's task time limit)
+CATALOG_REFRESH_TIMEOUT = int(os.getenv("CATALOG_REFRESH_TIMEOUT", str(30 * 60)))
+
 
 # Language CRUD operations
 def create_language(db: Session, language: LanguageCreate) -> Language:
@@ -20,8 +39,23 @@ def get_language_by_code(db: Session, code: str) -> Optional[Language]:
     return db.query(Language).filter(Language.code == code).first()
 
 
+async def get_language_by_code_async(db: AsyncSession, code: str) -> Optional[Language]:
+    return (await db.execute(select(Language).where(Language.code == code).limit(1))).scalars().first()
+
+
+def _has_active_models():
+    return select(MFAModel.id).where(MFAModel.language_id == Language.id, ACTIVE_MODEL).exists()
+
+
 def get_languages(db: Session, skip: int = 0, limit: int = 100) -> List[Language]:
-    return db.query(Language).offset(skip).limit(limit).all()
+    """Get languages that have at least one model in the catalog."""
+    return db.query(Language).filter(_has_active_models()).offset(skip).limit(limit).all()
+
+
+async def get_languages_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Language]:
+    """Get languages that have at least one model in the catalog."""
+    statement = select(Language).where(_has_active_models())
+    return list((await db.execute(statement.offset(skip).limit(limit))).scalars())
 
 
 def get_or_create_language(db: Session, code: str, name: str) -> Language:
@@ -53,7 +87,7 @@ def bulk_create_languages(db: Session, languages: List[LanguageCreate]) -> List[
 
 
 def get_or_create_languages_bulk(db: Session, language_data: List[dict]) -> dict:
-    """Get or create multiple languages efficiently
+    """Get or create multiple languages efficiently, without committing
     Args:
         language_data: List of dicts with 'code' and 'name' keys
     Returns:
@@ -66,14 +100,15 @@ def get_or_create_languages_bulk(db: Session, language_data: List[dict]) -> dict
     languages_to_create = []
     for lang_data in language_data:
         if lang_data['code'] not in existing_codes:
-            languages_to_create.append(LanguageCreate(
+            languages_to_create.append(Language(
                 code=lang_data['code'],
                 name=lang_data['name']
             ))
     
-    # Bulk create new languages
+    # Flush new languages to get their IDs
     if languages_to_create:
-        bulk_create_languages(db, languages_to_create)
+        db.add_all(languages_to_create)
+        db.flush()
     
     # Return mapping of all languages
     all_languages = db.query(Language).all()
@@ -87,6 +122,7 @@ def create_mfa_model(db: Session, model: MFAModelCreate) -> MFAModel:
         model_type=model.model_type,
         version=model.version,
         variant=model.variant,
+        phone_set=model.phone_set,
         language_id=model.language_id,
         description=model.description
     )
@@ -105,6 +141,7 @@ def bulk_create_mfa_models(db: Session, models: List[MFAModelCreate]) -> int:
             model_type=model.model_type,
             version=model.version,
             variant=model.variant,
+            phone_set=model.phone_set,
             language_id=model.language_id,
             description=model.description
         )
@@ -116,24 +153,96 @@ def bulk_create_mfa_models(db: Session, models: List[MFAModelCreate]) -> int:
 
 
 def get_mfa_models(db: Session, skip: int = 0, limit: int = 100, language_code: Optional[str] = None) -> List[MFAModel]:
-    query = db.query(MFAModel)
+    query = db.query(MFAModel).filter(ACTIVE_MODEL)
     if language_code:
         query = query.join(Language).filter(Language.code == language_code)
     return query.offset(skip).limit(limit).all()
 
 
+async def get_mfa_models_async(db: AsyncSession, skip: int = 0, limit: int = 100, language_code: Optional[str] = None) -> List[MFAModel]:
+    statement = select(MFAModel).options(selectinload(MFAModel.language)).where(ACTIVE_MODEL)
+    if language_code:
+        statement = statement.join(Language).where(Language.code == language_code)
+    return list((await db.execute(statement.offset(skip).limit(limit))).scalars())
+
+
+@dataclass(frozen=True)
+class ModelFilter:
+    """Filters of a catalog query; hashable so that query results can be memoized."""
+    model_type: Optional[ModelType] = None
+    language_code: Optional[str] = None
+    name_prefix: Optional[str] = None
+    version: Optional[str] = None
+    variant: Optional[str] = None
+
+
+def _filtered_models(statement, filters: ModelFilter):
+    statement = statement.where(ACTIVE_MODEL)
+    if filters.model_type is not None:
+        statement = statement.where(MFAModel.model_type == filters.model_type)
+    if filters.language_code:
+        statement = statement.join(Language).where(Language.code == filters.language_code)
+    if filters.name_prefix:
+        statement = statement.where(MFAModel.name.startswith(filters.name_prefix, autoescape=True))
+    if filters.version:
+        statement = statement.where(MFAModel.version == filters.version)
+    if filters.variant:
+        statement = statement.where(MFAModel.variant == filters.variant)
+    return statement
+
+
+async def find_mfa_models_async(db: AsyncSession, filters: ModelFilter, after_id: Optional[int] = None,
+                                skip: int = 0, limit: int = 100) -> List[MFAModel]:
+    """
+    Get a page of active models matching ``filters``, ordered by id.
+
+    Pages are fetched by keyset: ``after_id`` is the id of the last model
+    of the previous page.
+    """
+    statement = _filtered_models(select(MFAModel).options(selectinload(MFAModel.language)), filters)
+    if after_id is not None:
+        statement = statement.where(MFAModel.id > after_id)
+    statement = statement.order_by(MFAModel.id).offset(skip).limit(limit)
+    return list((await db.execute(statement)).scalars())
+
+
+async def count_filtered_mfa_models_async(db: AsyncSession, filters: ModelFilter) -> int:
+    """Count the active models matching ``filters``."""
+    return (await db.execute(_filtered_models(select(func.count(MFAModel.id)), filters))).scalar_one()
+
+
+async def get_catalog_async(db: AsyncSession) -> List[MFAModel]:
+    """Get all active models with their languages, ordered by id."""
+    statement = select(MFAModel).options(selectinload(MFAModel.language)).where(ACTIVE_MODEL).order_by(MFAModel.id)
+    return list((await db.execute(statement)).scalars())
+
+
 def count_mfa_models(db: Session) -> int:
     """Count total number of MFA models in database"""
-    return db.query(MFAModel).count()
+    return db.query(MFAModel).filter(ACTIVE_MODEL).count()
+
+
+async def count_mfa_models_async(db: AsyncSession) -> int:
+    """Count total number of MFA models in database"""
+    return (await db.execute(select(func.count()).select_from(MFAModel).where(ACTIVE_MODEL))).scalar_one()
 
 
 def get_mfa_models_by_type(db: Session, model_type: ModelType, language_code: Optional[str] = None) -> List[MFAModel]:
-    query = db.query(MFAModel).filter(MFAModel.model_type == model_type)
+    query = db.query(MFAModel).filter(MFAModel.model_type == model_type, ACTIVE_MODEL)
     if language_code:
         query = query.join(Language).filter(Language.code == language_code)
     return query.all()
 
 
+async def get_mfa_models_by_type_async(db: AsyncSession, model_type: ModelType, language_code: Optional[str] = None) -> List[MFAModel]:
+    statement = select(MFAModel).options(selectinload(MFAModel.language)).where(
+        MFAModel.model_type == model_type, ACTIVE_MODEL
+    )
+    if language_code:
+        statement = statement.join(Language).where(Language.code == language_code)
+    return list((await db.execute(statement)).scalars())
+
+
 def get_mfa_model_by_name_type_version(db: Session, name: str, model_type: ModelType, version: str, variant: str = None) -> Optional[MFAModel]:
     query = db.query(MFAModel).filter(
         MFAModel.name == name,
@@ -149,6 +258,69 @@ def get_mfa_model_by_name_type_version(db: Session, name: str, model_type: Model
     return query.first()
 
 
+def get_mfa_models_by_key(db: Session) -> Dict[ModelKey, MFAModel]:
+    """Get all models, removed ones included, by their natural key."""
+    return {(model.name, model.model_type, model.version): model for model in db.query(MFAModel)}
+
+
+def upsert_mfa_models(db: Session, rows: List[dict]) -> int:
+    """
+    Insert models or update them by natural key, without committing.
+
+    Uses ``INSERT ... ON DUPLICATE KEY UPDATE`` on MySQL and
+    ``ON CONFLICT DO UPDATE`` on SQLite; an updated model is restored if it
+    had been removed.
+
+    Args:
+        rows: Column values with name, model_type, version, variant,
+            phone_set, language_id and description
+
+    Returns:
+        int: Number of rows written
+    """
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        db.execute(_upsert_statement(db.get_bind().dialect.name, rows[start:start + UPSERT_BATCH_SIZE]))
+    return len(rows)
+
+
+def _upsert_statement(dialect_name: str, rows: List[dict]):
+    if dialect_name == "mysql":
+        statement = mysql.insert(MFAModel).values(rows)
+        return statement.on_duplicate_key_update(
+            variant=statement.inserted.variant,
+            phone_set=statement.inserted.phone_set,
+            language_id=statement.inserted.language_id,
+            description=statement.inserted.description,
+            deleted_at=None,
+            updated_at=func.now()
+        )
+    else:
+        statement = sqlite.insert(MFAModel).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[MFAModel.name, MFAModel.model_type, MFAModel.version],
+            set_=dict(
+                variant=statement.excluded.variant,
+                phone_set=statement.excluded.phone_set,
+                language_id=statement.excluded.language_id,
+                description=statement.excluded.description,
+                deleted_at=None,
+                updated_at=func.now()
+            )
+        )
+
+
+def soft_delete_mfa_models(db: Session, model_ids: List[int]) -> int:
+    """Mark models as removed from the catalog, without committing."""
+    if not model_ids:
+        return 0
+    return db.execute(
+        update(MFAModel)
+        .where(MFAModel.id.in_(model_ids), ACTIVE_MODEL)
+        .values(deleted_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
 def delete_all_mfa_models(db: Session) -> int:
     """Delete all MFA models and return count of deleted records"""
     count = db.query(MFAModel).count()
@@ -170,3 +342,108 @@ def delete_unused_languages(db: Session) -> int:
     
     db.commit()
     return count
+
+
+# Catalog refresh jobs
+def _expire_stale_refreshes():
+    """Fail active refreshes whose worker must have died, so that they don't block new ones."""
+    cutoff = datetime.utcnow() - timedelta(seconds=CATALOG_REFRESH_TIMEOUT)
+    return (
+        update(CatalogRefresh)
+        .where(CatalogRefresh.active.is_(True), CatalogRefresh.created_at < cutoff)
+        .values(status=RefreshStatus.FAILED, active=None, finished_at=datetime.utcnow(),
+                error_message="Refresh timed out")
+        .execution_options(synchronize_session=False)
+    )
+
+
+_ACTIVE_REFRESH = select(CatalogRefresh).where(CatalogRefresh.active.is_(True)).limit(1)
+
+
+def start_catalog_refresh(db: Session) -> Tuple[CatalogRefresh, bool]:
+    """
+    Create a pending catalog refresh unless one is already active.
+
+    Single-flight across processes: the unique ``active`` column lets only
+    one refresh be pending or running, and concurrent callers get that one.
+
+    Returns:
+        tuple: (refresh, created)
+    """
+    db.execute(_expire_stale_refreshes())
+    refresh = CatalogRefresh()
+    db.add(refresh)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        active = db.execute(_ACTIVE_REFRESH).scalars().first()
+        if active is not None:
+            return active, False
+        # The active refresh finished in the meantime
+        return start_catalog_refresh(db)
+    db.refresh(refresh)
+    return refresh, True
+
+
+async def start_catalog_refresh_async(db: AsyncSession) -> Tuple[CatalogRefresh, bool]:
+    """Async variant of ``start_catalog_refresh``."""
+    await db.execute(_expire_stale_refreshes())
+    refresh = CatalogRefresh()
+    db.add(refresh)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        active = (await db.execute(_ACTIVE_REFRESH)).scalars().first()
+        if active is not None:
+            return active, False
+        return await start_catalog_refresh_async(db)
+    await db.refresh(refresh)
+    return refresh, True
+
+
+async def get_catalog_refresh_async(db: AsyncSession, refresh_id: int) -> Optional[CatalogRefresh]:
+    return await db.get(CatalogRefresh, refresh_id)
+
+
+def claim_catalog_refresh(db: Session, refresh_id: int) -> bool:
+    """Move a pending refresh to running; False if it was already claimed or finished."""
+    claimed = db.execute(
+        update(CatalogRefresh)
+        .where(CatalogRefresh.id == refresh_id, CatalogRefresh.status == RefreshStatus.PENDING)
+        .values(status=RefreshStatus.RUNNING, started_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return claimed == 1
+
+
+def _finish_refresh(refresh_id: int, updated_models: int, updated_languages: int, error: Optional[str]):
+    return (
+        update(CatalogRefresh)
+        .where(CatalogRefresh.id == refresh_id)
+        .values(
+            status=RefreshStatus.FAILED if error else RefreshStatus.COMPLETED,
+            active=None,
+            updated_models=None if error else updated_models,
+            updated_languages=None if error else updated_languages,
+            error_message=error,
+            finished_at=datetime.utcnow()
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def finish_catalog_refresh(db: Session, refresh_id: int, updated_models: int = 0,
+                           updated_languages: int = 0, error: Optional[str] = None) -> None:
+    """Record the outcome of a refresh and release its single-flight slot."""
+    db.execute(_finish_refresh(refresh_id, updated_models, updated_languages, error))
+    db.commit()
+
+
+async def finish_catalog_refresh_async(db: AsyncSession, refresh_id: int, updated_models: int = 0,
+                                       updated_languages: int = 0, error: Optional[str] = None) -> None:
+    """Async variant of ``finish_catalog_refresh``."""
+    await db.execute(_finish_refresh(refresh_id, updated_models, updated_languages, error))
+    await db.commit()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Text, Enum, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from api.database import Base
@@ -11,6 +11,13 @@ class ModelType(enum.Enum):
     DICTIONARY = "dictionary"
 
 
+class RefreshStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class Language(Base):
     __tablename__ = "languages"
 
@@ -32,8 +39,11 @@ class MFAModel(Base):
     model_type = Column(Enum(ModelType), nullable=False)
     version = Column(String(50), nullable=False)
     variant = Column(String(100), nullable=True)
+    phone_set = Column(String(50), nullable=True)
     language_id = Column(Integer, ForeignKey("languages.id"), nullable=False)
     description = Column(Text, nullable=True)
+    # Set when the model disappears from the catalog; tasks may still reference it
+    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -42,5 +52,22 @@ class MFAModel(Base):
 
     # Unique constraint for name, type, version combination
     __table_args__ = (
+        UniqueConstraint("name", "model_type", "version", name="uq_mfa_models_name_type_version"),
         {"mysql_engine": "InnoDB"},
     )
+
+
+class CatalogRefresh(Base):
+    """A background refresh of the model catalog from the mfa-models repository."""
+    __tablename__ = "catalog_refreshes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(Enum(RefreshStatus), nullable=False, default=RefreshStatus.PENDING)
+    # True while pending or running, NULL once finished: the unique index admits one active refresh
+    active = Column(Boolean, nullable=True, unique=True, default=True)
+    updated_models = Column(Integer, nullable=True)
+    updated_languages = Column(Integer, nullable=True)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,24 @@
+"""
+Publishing catalog refreshes to the Celery broker.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+REFRESH_MODEL_CATALOG = 'workers.tasks.refresh_model_catalog'
+
+
+class CatalogRefreshQueue:
+    """Hand catalog refreshes to the workers, which pull the repository and sync the catalog."""
+
+    def enqueue(self, refresh_id: int) -> None:
+        from workers.celery_app import celery_app
+
+        celery_app.send_task(REFRESH_MODEL_CATALOG, args=[refresh_id])
+        logger.info(f"Enqueued catalog refresh {refresh_id}")
+
+
+def get_refresh_queue() -> CatalogRefreshQueue:
+    """Return the refresh queue; tests override this dependency."""
+    return CatalogRefreshQueue()
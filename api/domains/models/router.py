@@ -1,40 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List
-from api.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from api.database import get_async_db
+from api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from api.read_routing import get_read_async_db
 from api.domains.models.schemas import (
     MFAModelResponse, 
     LanguageResponse, 
-    ModelsUpdateResponse
+    CatalogRefreshResponse,
+    LanguageCompatibilityResponse
+)
+from api.domains.models.catalog import catalog_cache_ttl, find_models, get_catalog_index
+from api.domains.models.crud import (
+    ModelFilter, get_languages_async,
+    start_catalog_refresh_async, finish_catalog_refresh_async, get_catalog_refresh_async
 )
-from api.domains.models.crud import get_mfa_models, get_languages, get_mfa_models_by_type
 from api.domains.models.models import ModelType
-from api.domains.models.services.mfa_service import MFAModelService
+from api.domains.models.queue import CatalogRefreshQueue, get_refresh_queue
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/models", tags=["models"])
 
+TOTAL_COUNT_HEADER = "X-Total-Count"
+MODELS_PAGE_SIZE = 100
+MAX_MODELS_PAGE_SIZE = 1000
+
 @router.get("/", 
     response_model=List[MFAModelResponse],
     summary="List MFA models",
-    description="Retrieve all MFA models with optional type and language filtering and pagination."
+    description="Retrieve MFA models ordered by id, with optional type, language, name prefix, version and "
+                "variant filters. `X-Total-Count` holds the number of matching models; pages are linked with an "
+                "opaque cursor: pass the `X-Next-Cursor` response header as `cursor` to get the next page.",
+    responses={
+        200: {
+            "description": "Page of models",
+            "headers": {
+                TOTAL_COUNT_HEADER: {"description": "Number of models matching the filters"},
+                NEXT_CURSOR_HEADER: {"description": "Cursor of the next page, absent on the last page"}
+            }
+        },
+        400: {"description": "Invalid cursor"}
+    }
 )
-def get_models(
-    skip: int = 0,
-    limit: int = 100,
-    language: str = None,
-    model_type: ModelType = None,
-    db: Session = Depends(get_db)
+async def get_models(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(MODELS_PAGE_SIZE, ge=1, le=MAX_MODELS_PAGE_SIZE, description="Page size"),
+    language: Optional[str] = Query(None, description="Only models of this language code"),
+    model_type: Optional[ModelType] = Query(None, description="Only models of this type"),
+    name: Optional[str] = Query(None, description="Only models whose name starts with this prefix"),
+    version: Optional[str] = Query(None, description="Only models of this version"),
+    variant: Optional[str] = Query(None, description="Only models of this variant"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_async_db)
 ):
-    """Get all MFA models with optional type and language filters and pagination."""
-    if model_type:
-        models = get_mfa_models_by_type(db, model_type=model_type, language_code=language)
-        # Apply pagination to filtered results
-        models = models[skip:skip + limit]
-    else:
-        models = get_mfa_models(db, skip=skip, limit=limit, language_code=language)
+    """Get MFA models with optional filters and pagination."""
+    after_id = None
+    if cursor:
+        try:
+            after_id = int(decode_cursor(cursor)["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    filters = ModelFilter(model_type=model_type, language_code=language, name_prefix=name,
+                          version=version, variant=variant)
+    # One extra row tells whether another page exists
+    models, total = await find_models(db, filters, after_id=after_id, skip=skip, limit=limit + 1)
+
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    if len(models) > limit:
+        models = models[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": models[-1].id})
     return models
 
 
@@ -43,41 +82,79 @@ def get_models(
     summary="List supported languages",
     description="Retrieve all languages that have available MFA models."
 )
-def get_supported_languages(
+async def get_supported_languages(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_async_db)
 ):
     """Get all languages that have available MFA models with pagination."""
-    languages = get_languages(db, skip=skip, limit=limit)
+    languages = await get_languages_async(db, skip=skip, limit=limit)
     return languages
 
+@router.get("/compatibility", 
+    response_model=List[LanguageCompatibilityResponse],
+    summary="List compatible model combinations",
+    description="Retrieve, per language, the acoustic and dictionary model combinations that can be used "
+                "together in an alignment task, each with the G2P models that fit its dictionary.",
+)
+async def get_compatibility(
+    response: Response,
+    language: Optional[str] = Query(None, description="Only this language code"),
+    db: AsyncSession = Depends(get_read_async_db)
+):
+    """Get the valid model combinations of every language, or of one."""
+    index = await get_catalog_index(db)
+    if catalog_cache_ttl() > 0:
+        response.headers["Cache-Control"] = f"public, max-age={int(catalog_cache_ttl())}"
+    if language:
+        compatibility = index.compatibility.get(language)
+        return [compatibility] if compatibility else []
+    return list(index.compatibility.values())
+
+
 @router.post("/update", 
-    response_model=ModelsUpdateResponse,
-    summary="Update models from GitHub",
-    description="Fetch and update MFA models from the official GitHub repository.",
+    response_model=CatalogRefreshResponse,
+    status_code=202,
+    summary="Refresh models from GitHub",
+    description="Start a background refresh of the MFA models from the official GitHub repository. "
+                "While a refresh is pending or running, that refresh is returned instead of starting another.",
     responses={
-        200: {"description": "Models updated successfully"},
-        500: {"description": "Failed to update models"}
+        202: {"description": "Refresh started or already in progress"},
+        500: {"description": "Failed to start the refresh"}
     }
 )
 async def update_models(
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    refresh_queue: CatalogRefreshQueue = Depends(get_refresh_queue)
+):
+    """Start a background refresh of the MFA models catalog."""
+    refresh, created = await start_catalog_refresh_async(db)
+    if created:
+        try:
+            # Publishing may block on the broker connection
+            await run_in_threadpool(refresh_queue.enqueue, refresh.id)
+        except Exception as e:
+            logger.error(f"Error enqueuing catalog refresh {refresh.id}: {str(e)}")
+            await finish_catalog_refresh_async(db, refresh.id, error=str(e))
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to update models: {str(e)}"
+            )
+    return refresh
+
+
+@router.get("/update/{refresh_id}", 
+    response_model=CatalogRefreshResponse,
+    summary="Get catalog refresh status",
+    description="Retrieve the status and outcome of a catalog refresh.",
+    responses={404: {"description": "Refresh not found"}}
+)
+async def get_update_status(
+    refresh_id: int,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Fetch and update MFA models from the official GitHub repository."""
-    try:
-        service = MFAModelService()
-        updated_models, updated_languages = await service.update_models_from_github(db)
-        
-        return ModelsUpdateResponse(
-            message="Models updated successfully",
-            updated_models=updated_models,
-            updated_languages=updated_languages
-        )
-    except Exception as e:
-        logger.error(f"Error updating models: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to update models: {str(e)}"
-        )
+    """Get the status of a catalog refresh."""
+    refresh = await get_catalog_refresh_async(db, refresh_id)
+    if refresh is None:
+        raise HTTPException(status_code=404, detail="Refresh not found")
+    return refresh
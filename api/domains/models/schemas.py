@@ -1,7 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional, List
-from api.domains.models.models import ModelType
+from api.domains.models.models import ModelType, RefreshStatus
 
 
 # Language schemas
@@ -28,6 +28,7 @@ class MFAModelBase(BaseModel):
     model_type: ModelType
     version: str
     variant: Optional[str] = None
+    phone_set: Optional[str] = None
     description: Optional[str] = None
 
 
@@ -45,8 +46,34 @@ class MFAModelResponse(MFAModelBase):
     model_config = ConfigDict(from_attributes=True)
 
 
-# Response for models update
-class ModelsUpdateResponse(BaseModel):
-    message: str
-    updated_models: int
-    updated_languages: int
+# Compatibility of models within a language
+class ModelVersion(BaseModel):
+    name: str
+    version: str
+    phone_set: Optional[str] = None
+
+
+class ModelCombination(BaseModel):
+    acoustic: ModelVersion
+    dictionary: ModelVersion
+    # G2P models usable with the dictionary; a combination needs none
+    g2p: List[ModelVersion] = []
+
+
+class LanguageCompatibilityResponse(BaseModel):
+    language: LanguageResponse
+    combinations: List[ModelCombination]
+
+
+# Background catalog refresh
+class CatalogRefreshResponse(BaseModel):
+    id: int
+    status: RefreshStatus
+    updated_models: Optional[int] = None
+    updated_languages: Optional[int] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
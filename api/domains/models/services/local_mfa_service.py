@@ -1,6 +1,8 @@
+import asyncio
+import json
 import os
 import re
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from pathlib import Path
 from api.domains.models.models import ModelType
@@ -8,6 +10,19 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+REPO_URL = "https://github.com/MontrealCorpusTools/mfa-models.git"
+
+# Model type directories of the repository
+MODEL_TYPE_DIRS = ("g2p", "dictionary", "acoustic")
+
+# Metadata file of a model version directory
+MODEL_META_FILE = "meta.json"
+
+VERSION_DIR_RE = re.compile(r'^v?\d+\.\d+')
+
+# Bump when the manifest layout or the scan rules change
+MANIFEST_FORMAT = 1
+
 class LocalMFAService:
     """Service for working with local MFA models repository"""
     
@@ -25,31 +40,18 @@ class LocalMFAService:
         try:
             if not self.repo_path.exists():
                 logger.info("Repository doesn't exist, cloning...")
-                result = subprocess.run([
-                    "git", "clone", 
-                    "https://github.com/MontrealCorpusTools/mfa-models.git",
-                    str(self.repo_path)
-                ], capture_output=True, text=True, timeout=300)
-                
-                if result.returncode != 0:
-                    logger.error(f"Failed to clone repository: {result.stderr}")
+                if not await _run_git("clone", REPO_URL, str(self.repo_path), timeout=300):
+                    logger.error("Failed to clone repository")
                     return False
                 logger.info("Repository cloned successfully")
             else:
                 logger.info("Repository exists, updating...")
-                result = subprocess.run([
-                    "git", "pull", "--rebase", "origin", "main"
-                ], cwd=self.repo_path, capture_output=True, text=True, timeout=60)
-                
-                if result.returncode != 0:
-                    logger.error(f"Failed to update repository: {result.stderr}")
+                if not await _run_git("pull", "--rebase", "origin", "main", cwd=self.repo_path, timeout=60):
+                    logger.error("Failed to update repository")
                     return False
                 logger.info("Repository updated successfully")
             
             return True
-        except subprocess.TimeoutExpired:
-            logger.error("Git operation timed out")
-            return False
         except Exception as e:
             logger.error(f"Error updating repository: {e}")
             return False
@@ -67,131 +69,139 @@ class LocalMFAService:
         if not await self.update_repository():
             logger.warning("Failed to update repository, using existing data")
         
-        models = []
-        
-        # Process each model type
-        for model_type_str in ["g2p", "dictionary", "acoustic"]:
-            try:
-                logger.info(f"=== Processing model type: {model_type_str} ===")
-                type_models = await self._fetch_type_models(model_type_str)
-                models.extend(type_models)
-                logger.info(f"=== Completed {model_type_str}: found {len(type_models)} models ===")
-            except Exception as e:
-                logger.error(f"=== ERROR in {model_type_str}: {e} ===")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                continue
-        
+        models = await asyncio.get_running_loop().run_in_executor(None, self.scan_models)
         logger.info(f"=== FINAL RESULT: {len(models)} total models ===")
         return models
     
-    async def _fetch_type_models(self, model_type_str: str) -> List[Dict]:
-        """Fetch models for one type from local repository"""
-        logger.info(f"--- Starting _fetch_type_models for {model_type_str} ---")
-        models = []
-        
-        # Convert string to ModelType enum
-        model_type = getattr(ModelType, model_type_str.upper())
-        
-        type_path = self.repo_path / model_type_str
-        if not type_path.exists():
-            logger.warning(f"Path doesn't exist: {type_path}")
-            return models
+    def scan_models(self) -> List[Dict]:
+        """
+        Scan the repository, reusing the manifest of the last scan if HEAD hasn't moved.
         
-        # Get all language directories
-        language_dirs = [d for d in type_path.iterdir() if d.is_dir() and not d.name.startswith('.')]
-        logger.info(f"Found {len(language_dirs)} language directories for {model_type_str}")
+        Blocking; the model types are scanned in parallel threads.
+        """
+        head = self._git_head()
+        if head is not None:
+            models = self._load_manifest(head)
+            if models is not None:
+                logger.info(f"Repository unchanged at {head[:12]}, using cached manifest of {len(models)} models")
+                return models
         
-        for language_dir in language_dirs:
-            try:
-                language_code = language_dir.name
-                logger.info(f"Processing language: {language_code}")
-                
-                language_models = await self._fetch_language_models(
-                    model_type, model_type_str, language_code, language_dir
-                )
-                models.extend(language_models)
-                logger.info(f"Got {len(language_models)} models for {language_code}")
-                
-            except Exception as e:
-                logger.error(f"Error processing language {language_dir.name}: {e}")
-                continue
+        with ThreadPoolExecutor(max_workers=len(MODEL_TYPE_DIRS), thread_name_prefix="mfa-scan") as executor:
+            results = list(executor.map(self._scan_type_safely, MODEL_TYPE_DIRS))
+        models = [model for type_models in results for model in type_models]
         
+        if head is not None:
+            self._save_manifest(head, models)
         return models
     
-    async def _fetch_language_models(self, model_type: ModelType, model_type_str: str, 
-                                   language_code: str, language_dir: Path) -> List[Dict]:
-        """Fetch models for a specific language"""
-        models = []
-        
-        # Language name mapping (basic implementation)
-        language_name = self._get_language_name(language_code)
-        
-        # Look for variant directories or version directories
-        subdirs = [d for d in language_dir.iterdir() if d.is_dir()]
+    def _scan_type_safely(self, model_type_str: str) -> List[Dict]:
+        try:
+            models = self._scan_type(model_type_str)
+            logger.info(f"=== Completed {model_type_str}: found {len(models)} models ===")
+            return models
+        except Exception as e:
+            logger.error(f"=== ERROR in {model_type_str}: {e} ===")
+            return []
+    
+    def _scan_type(self, model_type_str: str) -> List[Dict]:
+        """Scan the models of one type: {type}/{language}/[{variant}/][{version}/]"""
+        model_type = ModelType(model_type_str)
+        type_path = self.repo_path / model_type_str
+        if not type_path.is_dir():
+            logger.warning(f"Path doesn't exist: {type_path}")
+            return []
         
-        if not subdirs:
-            # No subdirectories, this might be a direct model
-            model = {
-                "name": language_code,
-                "model_type": model_type,
-                "version": "latest",
-                "variant": None,
-                "language_code": language_code,
-                "language_name": language_name
-            }
-            models.append(model)
-            logger.debug(f"Added direct model: {model['name']}")
-        else:
-            # Process subdirectories (variants or versions)
-            for subdir in subdirs:
-                variant = None
-                version = "latest"
-                
-                # Try to determine if this is a variant or version
-                if re.match(r'^v?\d+\.\d+', subdir.name):
-                    # Looks like a version
-                    version = subdir.name.lstrip('v')
-                else:
-                    # Treat as variant
-                    variant = subdir.name
-                
-                # Check for version subdirectories within variant
-                version_dirs = [d for d in subdir.iterdir() if d.is_dir() and re.match(r'^v?\d+\.\d+', d.name)]
-                
-                if version_dirs:
-                    # Has version subdirectories
+        models = []
+        for language_dir in _subdirs(type_path):
+            language_code = language_dir.name
+            language_name = self._get_language_name(language_code)
+            try:
+                subdirs = _subdirs(language_dir.path)
+                if not subdirs:
+                    # No subdirectories, this might be a direct model
+                    models.append(self._model(model_type, language_code, language_name, None, None, language_dir.path))
+                    continue
+                for subdir in subdirs:
+                    if VERSION_DIR_RE.match(subdir.name):
+                        models.append(self._model(model_type, language_code, language_name,
+                                                  None, subdir.name, subdir.path))
+                        continue
+                    version_dirs = [d for d in _subdirs(subdir.path) if VERSION_DIR_RE.match(d.name)]
+                    if not version_dirs:
+                        models.append(self._model(model_type, language_code, language_name,
+                                                  subdir.name, None, subdir.path))
                     for version_dir in version_dirs:
-                        version = version_dir.name.lstrip('v')
-                        model_name = f"{language_code}_{variant}" if variant else language_code
-                        
-                        model = {
-                            "name": model_name,
-                            "model_type": model_type,
-                            "version": version,
-                            "variant": variant,
-                            "language_code": language_code,
-                            "language_name": language_name
-                        }
-                        models.append(model)
-                        logger.debug(f"Added versioned model: {model['name']} v{version}")
-                else:
-                    # No version subdirectories
-                    model_name = f"{language_code}_{variant}" if variant else language_code
-                    
-                    model = {
-                        "name": model_name,
-                        "model_type": model_type,
-                        "version": version,
-                        "variant": variant,
-                        "language_code": language_code,
-                        "language_name": language_name
-                    }
-                    models.append(model)
-                    logger.debug(f"Added variant model: {model['name']}")
-        
+                        models.append(self._model(model_type, language_code, language_name,
+                                                  subdir.name, version_dir.name, version_dir.path))
+            except OSError as e:
+                logger.error(f"Error processing language {language_code}: {e}")
         return models
     
+    @staticmethod
+    def _model(model_type: ModelType, language_code: str, language_name: str,
+               variant: Optional[str], version_dir: Optional[str], path: str) -> Dict:
+        """Model entry of a directory; its metadata file wins over names guessed from directories."""
+        meta = _read_meta(path)
+        version = meta.get("version") or version_dir or "latest"
+        phone_set = meta.get("phone_set_type") or meta.get("phone_set")
+        return {
+            "name": f"{language_code}_{variant}" if variant else language_code,
+            "model_type": model_type,
+            "version": str(version).lstrip('v'),
+            "variant": variant,
+            "phone_set": str(phone_set) if phone_set else None,
+            "language_code": language_code,
+            "language_name": language_name
+        }
+    
+    def _git_head(self) -> Optional[str]:
+        """Commit checked out in the repository, read from .git without running git."""
+        git_dir = self.repo_path / ".git"
+        try:
+            head = (git_dir / "HEAD").read_text().strip()
+            if not head.startswith("ref: "):
+                return head
+            ref = head[len("ref: "):]
+            ref_path = git_dir / ref
+            if ref_path.is_file():
+                return ref_path.read_text().strip()
+            packed_refs = git_dir / "packed-refs"
+            if packed_refs.is_file():
+                for line in packed_refs.read_text().splitlines():
+                    commit, _, name = line.partition(" ")
+                    if name == ref:
+                        return commit
+        except OSError:
+            pass
+        return None
+    
+    @property
+    def manifest_path(self) -> Path:
+        # Inside .git so that it survives pulls and never shows up as a change
+        return self.repo_path / ".git" / "align-api-manifest.json"
+    
+    def _load_manifest(self, head: str) -> Optional[List[Dict]]:
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if manifest.get("head") != head or manifest.get("format") != MANIFEST_FORMAT:
+            return None
+        return [dict(model, model_type=ModelType(model["model_type"])) for model in manifest["models"]]
+    
+    def _save_manifest(self, head: str, models: List[Dict]) -> None:
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "head": head,
+            "models": [dict(model, model_type=model["model_type"].value) for model in models]
+        }
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(manifest))
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not save model manifest: {e}")
+    
     def _get_language_name(self, language_code: str) -> str:
         """Convert language code to human-readable name"""
         language_names = {
@@ -280,3 +290,43 @@ class LocalMFAService:
         }
         
         return language_names.get(language_code.lower(), language_code.title())
+
+
+async def _run_git(*args: str, cwd: Optional[Path] = None, timeout: float) -> bool:
+    """Run git without blocking the event loop; a hung command is killed after ``timeout`` seconds."""
+    process = await asyncio.create_subprocess_exec(
+        "git", *args, cwd=cwd,
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        logger.error(f"git {args[0]} timed out")
+        return False
+    if process.returncode != 0:
+        logger.error(f"git {args[0]} failed: {stderr.decode(errors='replace').strip()}")
+        return False
+    return True
+
+
+def _subdirs(path) -> List[os.DirEntry]:
+    """Visible subdirectories of a directory, from a single scandir call."""
+    with os.scandir(path) as entries:
+        return sorted(
+            (entry for entry in entries if not entry.name.startswith('.') and entry.is_dir(follow_symlinks=False)),
+            key=lambda entry: entry.name
+        )
+
+
+def _read_meta(path: str) -> Dict:
+    try:
+        with open(os.path.join(path, MODEL_META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Invalid model metadata in {path}: {e}")
+        return {}
+    return meta if isinstance(meta, dict) else {}
@@ -1,21 +1,23 @@
 from sqlalchemy.orm import Session
-from typing import Tuple
+from typing import Dict, List, Tuple
 from api.domains.models.services.local_mfa_service import LocalMFAService
 from api.domains.models.crud import (
-    get_or_create_language, 
+    ModelKey,
     get_or_create_languages_bulk,
-    create_mfa_model, 
-    bulk_create_mfa_models,
-    get_mfa_model_by_name_type_version,
-    delete_all_mfa_models,
-    delete_unused_languages,
+    get_mfa_models_by_key,
+    upsert_mfa_models,
+    soft_delete_mfa_models,
     count_mfa_models
 )
-from api.domains.models.schemas import MFAModelCreate
+from api.domains.models.models import MFAModel, ModelType
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Columns compared to decide whether a catalog model changed
+SYNCED_COLUMNS = ("variant", "phone_set", "language_id", "description")
+
+
 class MFAModelService:
     """Service for managing MFA models"""
     
@@ -25,6 +27,14 @@ class MFAModelService:
     async def update_models_from_github(self, db: Session) -> Tuple[int, int]:
         """
         Update MFA models from GitHub repository
+        
+        The catalog is synced by diff on the natural key (name, type,
+        version): new and changed models are upserted, models no longer in
+        the repository are soft-deleted, and unchanged models are not
+        touched. Everything is applied in one transaction, so readers never
+        see a partially updated catalog and model ids referenced by tasks
+        stay valid.
+        
         Returns tuple of (updated_models_count, updated_languages_count)
         """
         try:
@@ -35,24 +45,11 @@ class MFAModelService:
             logger.info(f"=== MFA SERVICE: Got {len(local_models)} models from local repository ===")
             
             if not local_models:
+                # An empty scan means a broken checkout, not an empty catalog
                 logger.warning("=== MFA SERVICE: No models found in local repository ===")
                 return 0, 0
             
-            # Check if we already have models in database
-            existing_models_count = count_mfa_models(db)
-            logger.info(f"=== MFA SERVICE: Found {existing_models_count} existing models in database ===")
-            
-            # If we already have the same number of models, skip update
-            if existing_models_count == len(local_models):
-                logger.info("=== MFA SERVICE: Database already has same number of models, skipping update ===")
-                return 0, 0
-            
-            # Clear existing models and unused languages
-            logger.info("=== MFA SERVICE: Clearing existing models ===")
-            deleted_models = delete_all_mfa_models(db)
-            deleted_languages = delete_unused_languages(db)
-            logger.info(f"=== MFA SERVICE: Deleted {deleted_models} models and {deleted_languages} languages ===")
-            
+            logger.info(f"=== MFA SERVICE: Found {count_mfa_models(db)} existing models in database ===")
             
             # Extract unique languages first
             unique_languages = {}
@@ -60,54 +57,59 @@ class MFAModelService:
                 code = model_data["language_code"]
                 name = model_data["language_name"]
                 unique_languages[code] = {'code': code, 'name': name}
-            
-            # Bulk create/get all languages
-            logger.info(f"=== MFA SERVICE: Creating {len(unique_languages)} languages ===")
             language_map = get_or_create_languages_bulk(db, list(unique_languages.values()))
             
-            # Prepare all models
-            models_to_create = []
-            logger.info(f"=== MFA SERVICE: Preparing {len(local_models)} models ===")
-            
-            for i, model_data in enumerate(local_models):
-                if i % 100 == 0:  # Log progress every 100 models
-                    logger.info(f"=== MFA SERVICE: Preparing model {i+1}/{len(local_models)} ===")
-                try:
-                    # Get language from our map
-                    language = language_map[model_data["language_code"]]
-                    
-                    # Create description with variant info if available
-                    variant_info = f" ({model_data['variant']})" if model_data.get('variant') else ""
-                    description = f"{model_data['language_name']} {model_data['model_type'].value} model v{model_data['version']}{variant_info}"
-                    
-                    model_create = MFAModelCreate(
-                        name=model_data["name"],
-                        model_type=model_data["model_type"],
-                        version=model_data["version"],
-                        variant=model_data.get("variant"),
-                        language_id=language.id,
-                        description=description
-                    )
-                    
-                    models_to_create.append(model_create)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing model {model_data}: {e}")
-                    continue
+            catalog = self._catalog_rows(local_models, language_map)
+            existing = get_mfa_models_by_key(db)
+            changed = [row for key, row in catalog.items() if self._needs_update(existing.get(key), row)]
+            removed = [model.id for key, model in existing.items() if key not in catalog and model.deleted_at is None]
             
-            # Bulk create all models
-            logger.info(f"=== MFA SERVICE: Bulk creating {len(models_to_create)} models ===")
-            created_models = bulk_create_mfa_models(db, models_to_create)
+            upserted = upsert_mfa_models(db, changed)
+            deleted = soft_delete_mfa_models(db, removed)
+            db.commit()
             
-            logger.info(f"Successfully updated {created_models} models for {len(unique_languages)} languages")
-            return created_models, len(unique_languages)
+            updated_languages = len({row["language_id"] for row in changed})
+            logger.info(f"Synced model catalog: {upserted} added or changed, {deleted} removed, "
+                        f"{len(catalog) - upserted} unchanged")
+            return upserted, updated_languages
             
         except Exception as e:
+            db.rollback()
             logger.error(f"Error updating models from GitHub: {e}")
             raise
-        finally:
-            # Local service doesn't need cleanup
-            pass
+    
+    @staticmethod
+    def _catalog_rows(local_models: List[dict], language_map: dict) -> Dict[ModelKey, dict]:
+        """Column values of the repository models by natural key; invalid entries are skipped."""
+        rows = {}
+        for model_data in local_models:
+            try:
+                model_type = ModelType(model_data["model_type"])
+                
+                # Create description with variant info if available
+                variant_info = f" ({model_data['variant']})" if model_data.get('variant') else ""
+                description = f"{model_data['language_name']} {model_type.value} model v{model_data['version']}{variant_info}"
+                
+                row = dict(
+                    name=model_data["name"],
+                    model_type=model_type,
+                    version=model_data["version"],
+                    variant=model_data.get("variant"),
+                    phone_set=model_data.get("phone_set"),
+                    language_id=language_map[model_data["language_code"]].id,
+                    description=description
+                )
+            except Exception as e:
+                logger.error(f"Error processing model {model_data}: {e}")
+                continue
+            rows[(row["name"], row["model_type"], row["version"])] = row
+        return rows
+    
+    @staticmethod
+    def _needs_update(model: MFAModel, row: dict) -> bool:
+        if model is None or model.deleted_at is not None:
+            return True
+        return any(getattr(model, column) != row[column] for column in SYNCED_COLUMNS)
     
     async def close(self):
         """Close the service and cleanup resources"""
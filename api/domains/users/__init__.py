@@ -5,9 +5,10 @@ Users domain module.
 from .models import User, SubscriptionType, FileStorageMetadata
 from .schemas import UserCreate, UserResponse, UserLogin, QuotaResponse
 from .crud import UserService
+from .quota import StorageReservation, QuotaExceededError
 
 __all__ = [
     'User', 'SubscriptionType', 'FileStorageMetadata',
     'UserCreate', 'UserResponse', 'UserLogin', 'QuotaResponse',
-    'UserService'
+    'UserService', 'StorageReservation', 'QuotaExceededError'
 ]
@@ -2,30 +2,23 @@
 User domain CRUD operations.
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import Optional, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, Query, selectinload
+from sqlalchemy import and_, or_, case, func, insert, select, update
+from typing import Optional, List, Dict, Iterator, Tuple
 from datetime import datetime, timedelta
 import logging
+import os
 
-from .models import User, SubscriptionType, FileStorageMetadata, UserRole
+from .models import User, SubscriptionType, FileStorageMetadata, FileType, UserRole
 from .schemas import UserCreate, QuotaResponse
-import bcrypt
-
-# Password hashing rounds
-BCRYPT_ROUNDS = 12
-
-def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+from api.passwords import get_password_hash, verify_password, verify_password_async
 
 logger = logging.getLogger(__name__)
 
+# Reservations older than this are assumed lost to a crashed upload
+STORAGE_RESERVATION_TIMEOUT = int(os.getenv("STORAGE_RESERVATION_TIMEOUT", "3600"))
+
 
 class UserService:
     """Service class for user operations."""
@@ -46,8 +39,39 @@ class UserService:
         return db.query(User).filter(User.id == user_id).first()
 
     @staticmethod
-    def create_user(db: Session, user: UserCreate) -> User:
-        """Create new user with free subscription."""
+    async def _get_user_async(db: AsyncSession, *criteria) -> Optional[User]:
+        # Async sessions can't lazy-load, so the subscription is loaded up front
+        result = await db.execute(
+            select(User).options(selectinload(User.subscription_type)).where(*criteria).limit(1)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+        """Get user by email."""
+        return await UserService._get_user_async(db, User.email == email)
+
+    @staticmethod
+    async def get_user_by_username_async(db: AsyncSession, username: str) -> Optional[User]:
+        """Get user by username."""
+        return await UserService._get_user_async(db, User.username == username)
+
+    @staticmethod
+    async def get_user_by_id_async(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get user by ID."""
+        return await UserService._get_user_async(db, User.id == user_id)
+
+    @staticmethod
+    def create_user(db: Session, user: UserCreate, password_hash: Optional[str] = None) -> User:
+        """
+        Create new user with free subscription.
+
+        Args:
+            db: Database session
+            user: Registration data
+            password_hash: Precomputed hash of ``user.password``; computed
+                here when omitted
+        """
         # Get free subscription type
         free_subscription = db.query(SubscriptionType).filter(
             SubscriptionType.name == "free"
@@ -56,8 +80,8 @@ class UserService:
         if not free_subscription:
             raise ValueError("Free subscription type not found")
 
-        # Hash password
-        password_hash = get_password_hash(user.password)
+        if password_hash is None:
+            password_hash = get_password_hash(user.password)
 
         # Create user
         db_user = User(
@@ -76,6 +100,39 @@ class UserService:
         logger.info(f"Created new user: {user.username} ({user.email})")
         return db_user
 
+    @staticmethod
+    async def create_user_async(db: AsyncSession, user: UserCreate, password_hash: str) -> User:
+        """
+        Create new user with free subscription.
+
+        Args:
+            db: Async database session
+            user: Registration data
+            password_hash: Hash of ``user.password``, computed off the event loop
+        """
+        free_subscription = (await db.execute(
+            select(SubscriptionType).where(SubscriptionType.name == "free").limit(1)
+        )).scalars().first()
+
+        if not free_subscription:
+            raise ValueError("Free subscription type not found")
+
+        db_user = User(
+            email=user.email,
+            username=user.username,
+            password_hash=password_hash,
+            role=UserRole.user,
+            subscription_type_id=free_subscription.id,
+            used_storage=0
+        )
+
+        db.add(db_user)
+        await db.commit()
+        db_user = await UserService.get_user_by_id_async(db, db_user.id)
+
+        logger.info(f"Created new user: {user.username} ({user.email})")
+        return db_user
+
     @staticmethod
     def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
         """Authenticate user by username and password."""
@@ -86,14 +143,37 @@ class UserService:
             return None
         return user
 
+    @staticmethod
+    async def authenticate_user_async(db: AsyncSession, username: str, password: str) -> Optional[User]:
+        """Authenticate user, verifying the password on the password hashing pool."""
+        user = await UserService.get_user_by_username_async(db, username)
+        if not user or not user.is_active:
+            return None
+        if not await verify_password_async(password, user.password_hash):
+            return None
+        return user
+
     @staticmethod
     def get_user_quota(db: Session, user_id: int) -> Optional[QuotaResponse]:
         """Get user quota information."""
         user = db.query(User).filter(User.id == user_id).first()
         if not user:
             return None
+        return UserService._quota_response(user)
 
-        available_storage = max(0, user.subscription_type.total_storage_limit - user.used_storage)
+    @staticmethod
+    async def get_user_quota_async(db: AsyncSession, user_id: int) -> Optional[QuotaResponse]:
+        """Get user quota information."""
+        user = await UserService.get_user_by_id_async(db, user_id)
+        if not user:
+            return None
+        return UserService._quota_response(user)
+
+    @staticmethod
+    def _quota_response(user: User) -> QuotaResponse:
+        available_storage = max(
+            0, user.subscription_type.total_storage_limit - user.used_storage - (user.reserved_storage or 0)
+        )
         
         return QuotaResponse(
             total_storage_limit=user.subscription_type.total_storage_limit,
@@ -106,12 +186,80 @@ class UserService:
 
     @staticmethod
     def update_user_storage(db: Session, user_id: int, storage_change: int):
-        """Update user storage usage."""
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            user.used_storage = max(0, user.used_storage + storage_change)
-            db.commit()
-            logger.info(f"Updated storage for user {user_id}: {storage_change} bytes")
+        """Update user storage usage atomically, without checking the quota."""
+        if storage_change < 0:
+            UserService.release_user_storage(db, {user_id: -storage_change})
+        else:
+            db.query(User).filter(User.id == user_id).update(
+                {User.used_storage: User.used_storage + storage_change},
+                synchronize_session=False
+            )
+        db.commit()
+        logger.info(f"Updated storage for user {user_id}: {storage_change} bytes")
+
+    @staticmethod
+    def reserve_storage(db: Session, user_id: int, size: int) -> bool:
+        """
+        Atomically add ``size`` bytes to a user's usage if it fits the quota.
+
+        The check and the increment are one conditional UPDATE, so concurrent
+        uploads can neither lose updates nor both pass the check.
+
+        Returns:
+            bool: True if the space was reserved, False if the quota would be exceeded
+        """
+        reserved = db.execute(
+            UserService._within_quota(update(User), user_id, size)
+            .values(used_storage=User.used_storage + size)
+        ).rowcount
+        db.commit()
+        return reserved == 1
+
+    @staticmethod
+    async def reserve_upload_async(db: AsyncSession, user_id: int, size: int) -> bool:
+        """
+        Reserve ``size`` bytes for an upload in flight and commit.
+
+        The space goes to ``reserved_storage``, which counts against the quota
+        but is left alone by reconciliation until it goes stale.
+
+        Returns:
+            bool: True if the space was reserved, False if the quota would be exceeded
+        """
+        result = await db.execute(
+            UserService._within_quota(update(User), user_id, size)
+            .values(reserved_storage=User.reserved_storage + size, reserved_at=datetime.utcnow())
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    async def settle_upload_async(db: AsyncSession, user_id: int, size: int) -> None:
+        """Move reserved space to ``used_storage``, without committing."""
+        await db.execute(update(User).where(User.id == user_id).values(
+            used_storage=User.used_storage + size,
+            reserved_storage=case((User.reserved_storage > size, User.reserved_storage - size), else_=0)
+        ).execution_options(synchronize_session=False))
+
+    @staticmethod
+    async def release_upload_async(db: AsyncSession, user_id: int, size: int) -> None:
+        """Give reserved space back to the quota and commit."""
+        await db.execute(update(User).where(User.id == user_id).values(
+            reserved_storage=case((User.reserved_storage > size, User.reserved_storage - size), else_=0)
+        ).execution_options(synchronize_session=False))
+        await db.commit()
+
+    @staticmethod
+    def _within_quota(statement, user_id: int, size: int):
+        storage_limit = (
+            select(SubscriptionType.total_storage_limit)
+            .where(SubscriptionType.id == User.subscription_type_id)
+            .scalar_subquery()
+        )
+        return statement.where(
+            User.id == user_id,
+            User.used_storage + User.reserved_storage + size <= storage_limit
+        ).execution_options(synchronize_session=False)
 
     @staticmethod
     def check_storage_quota(db: Session, user_id: int, required_space: int) -> bool:
@@ -124,14 +272,77 @@ class UserService:
         return available_space >= required_space
 
     @staticmethod
-    def get_user_files(db: Session, user_id: int, file_type: Optional[str] = None) -> List[FileStorageMetadata]:
-        """Get user's files, optionally filtered by type."""
+    def user_files_query(
+        db: Session,
+        user_id: int,
+        file_type: Optional[FileType] = None,
+        task_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        before: Optional[Tuple[datetime, int]] = None
+    ) -> Query:
+        """
+        Query of a user's files, newest first.
+
+        Served by the (user_id[, file_type], created_at) indexes. ``before``
+        holds ``created_at`` and ``id`` of the last row of the previous page;
+        ``created_to`` is exclusive.
+        """
         query = db.query(FileStorageMetadata).filter(FileStorageMetadata.user_id == user_id)
         
         if file_type:
             query = query.filter(FileStorageMetadata.file_type == file_type)
+        if task_id is not None:
+            query = query.filter(FileStorageMetadata.task_id == task_id)
+        if created_from is not None:
+            query = query.filter(FileStorageMetadata.created_at >= created_from)
+        if created_to is not None:
+            query = query.filter(FileStorageMetadata.created_at < created_to)
+        if before is not None:
+            last_created_at, last_id = before
+            query = query.filter(or_(
+                FileStorageMetadata.created_at < last_created_at,
+                and_(FileStorageMetadata.created_at == last_created_at, FileStorageMetadata.id < last_id)
+            ))
         
-        return query.order_by(FileStorageMetadata.created_at.desc()).all()
+        return query.order_by(FileStorageMetadata.created_at.desc(), FileStorageMetadata.id.desc())
+
+    @staticmethod
+    def get_user_files(
+        db: Session,
+        user_id: int,
+        file_type: Optional[FileType] = None,
+        limit: Optional[int] = None,
+        **filters
+    ) -> List[FileStorageMetadata]:
+        """Get user's files, optionally filtered (see ``user_files_query``) and limited to a page."""
+        query = UserService.user_files_query(db, user_id, file_type, **filters)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def iter_user_files(
+        db: Session,
+        user_id: int,
+        batch_size: int = 500,
+        **filters
+    ) -> Iterator[FileStorageMetadata]:
+        """
+        Iterate over all matching files of a user in keyset pages.
+
+        Rows are detached from the session once yielded, so memory use
+        doesn't grow with the number of files.
+        """
+        before = filters.pop("before", None)
+        while True:
+            batch = UserService.get_user_files(db, user_id, limit=batch_size, before=before, **filters)
+            for file in batch:
+                yield file
+                db.expunge(file)
+            if len(batch) < batch_size:
+                return
+            before = (batch[-1].created_at, batch[-1].id)
 
     @staticmethod
     def add_file_metadata(
@@ -164,11 +375,116 @@ class UserService:
         return file_metadata
 
     @staticmethod
-    def get_expired_files(db: Session) -> List[FileStorageMetadata]:
-        """Get all expired files for cleanup."""
-        return db.query(FileStorageMetadata).filter(
+    async def add_file_metadata_bulk_async(db: AsyncSession, rows: List[Dict]) -> None:
+        """Insert file metadata rows in one statement, without committing."""
+        if rows:
+            await db.execute(insert(FileStorageMetadata), rows)
+
+    @staticmethod
+    def expired_files_query(
+        db: Session,
+        now: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> Query:
+        """
+        Query of expired files ordered by (expires_at, id).
+
+        ``after`` holds ``expires_at`` and ``id`` of the last row of the
+        previous page; pages then follow the ``expires_at`` index without
+        offsets.
+        """
+        query = db.query(FileStorageMetadata).filter(
             and_(
                 FileStorageMetadata.expires_at.is_not(None),
-                FileStorageMetadata.expires_at <= datetime.utcnow()
+                FileStorageMetadata.expires_at <= (now or datetime.utcnow())
             )
-        ).all()
+        )
+        if after is not None:
+            last_expires_at, last_id = after
+            query = query.filter(or_(
+                FileStorageMetadata.expires_at > last_expires_at,
+                and_(FileStorageMetadata.expires_at == last_expires_at, FileStorageMetadata.id > last_id)
+            ))
+        return query.order_by(FileStorageMetadata.expires_at, FileStorageMetadata.id)
+
+    @staticmethod
+    def get_expired_files(
+        db: Session,
+        now: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None
+    ) -> List[FileStorageMetadata]:
+        """Get expired files for cleanup, a page at a time when ``limit`` is given."""
+        query = UserService.expired_files_query(db, now, after)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def remove_task_file_metadata(db: Session, task_id: int) -> int:
+        """
+        Delete the file metadata of a task and release its storage.
+
+        Args:
+            db: Database session (not committed)
+            task_id: Alignment task whose files are removed
+
+        Returns:
+            int: Number of bytes released
+        """
+        freed_by_user = {
+            user_id: int(size)
+            for user_id, size in db.query(FileStorageMetadata.user_id, func.sum(FileStorageMetadata.file_size))
+            .filter(FileStorageMetadata.task_id == task_id)
+            .group_by(FileStorageMetadata.user_id)
+        }
+        db.query(FileStorageMetadata).filter(FileStorageMetadata.task_id == task_id).delete(synchronize_session=False)
+        UserService.release_user_storage(db, freed_by_user)
+        return sum(freed_by_user.values())
+
+    @staticmethod
+    def release_user_storage(db: Session, freed_by_user: Dict[int, int]) -> None:
+        """
+        Decrease ``used_storage`` of several users in a single UPDATE.
+
+        Args:
+            db: Database session (not committed)
+            freed_by_user: Bytes freed per user id
+        """
+        if not freed_by_user:
+            return
+        freed = case(freed_by_user, value=User.id, else_=0)
+        db.query(User).filter(User.id.in_(list(freed_by_user))).update(
+            {User.used_storage: case((User.used_storage > freed, User.used_storage - freed), else_=0)},
+            synchronize_session=False
+        )
+
+    @staticmethod
+    def reconcile_storage_usage(db: Session) -> int:
+        """
+        Recompute ``used_storage`` of every user from file metadata.
+
+        One UPDATE with an aggregate subquery; only users whose stored
+        usage differs are written. Uploads in flight hold their space in
+        ``reserved_storage``, which is only dropped once it is older than
+        ``STORAGE_RESERVATION_TIMEOUT``.
+
+        Returns:
+            int: Number of corrected users
+        """
+        actual_usage = func.coalesce(
+            select(func.sum(FileStorageMetadata.file_size))
+            .where(FileStorageMetadata.user_id == User.id)
+            .scalar_subquery(),
+            0
+        )
+        corrected = db.query(User).filter(User.used_storage != actual_usage).update(
+            {User.used_storage: actual_usage}, synchronize_session=False
+        )
+        expired = db.query(User).filter(
+            User.reserved_storage > 0,
+            User.reserved_at <= datetime.utcnow() - timedelta(seconds=STORAGE_RESERVATION_TIMEOUT)
+        ).update({User.reserved_storage: 0}, synchronize_session=False)
+        db.commit()
+        logger.info(f"Reconciled storage usage of {corrected} users, dropped {expired} stale reservations")
+        return corrected
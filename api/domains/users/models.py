@@ -2,7 +2,7 @@
 User domain models.
 """
 
-from sqlalchemy import Column, Integer, String, BigInteger, Boolean, DateTime, Numeric, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, BigInteger, Boolean, DateTime, Numeric, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -49,6 +49,9 @@ class User(Base):
     role = Column(Enum(UserRole), default=UserRole.user, nullable=False)
     subscription_type_id = Column(Integer, ForeignKey("subscription_types.id"), nullable=False)
     used_storage = Column(BigInteger, default=0, nullable=False)  # in bytes
+    # Space held by uploads in flight, not yet backed by file metadata
+    reserved_storage = Column(BigInteger, default=0, server_default="0", nullable=False)
+    reserved_at = Column(DateTime(timezone=True), nullable=True)
     subscription_ends_at = Column(DateTime(timezone=True), nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -72,9 +75,15 @@ class FileStorageMetadata(Base):
     file_size = Column(BigInteger, nullable=False)  # in bytes
     mime_type = Column(String(100), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    expires_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
     last_accessed = Column(DateTime(timezone=True), nullable=True)
     access_count = Column(Integer, default=0, nullable=False)
 
     # Relationships  
     user = relationship("User", back_populates="file_metadata")
+
+    # Indexes for per-user file listings, newest first
+    __table_args__ = (
+        Index("ix_file_storage_metadata_user_created", "user_id", "created_at"),
+        Index("ix_file_storage_metadata_user_type_created", "user_id", "file_type", "created_at"),
+    )
@@ -0,0 +1,64 @@
+"""
+Storage quota reservations for in-flight uploads.
+"""
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .crud import UserService
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaExceededError(Exception):
+    """Raised when an upload doesn't fit into the user's storage quota."""
+
+
+class StorageReservation:
+    """
+    Space reserved in a user's quota while an upload is in flight.
+
+    Entering the block reserves the expected size with one conditional
+    UPDATE and commits it, so the quota is checked before anything is
+    uploaded and no row lock is held during the upload; enter it before
+    writing anything in the session. ``settle`` moves the space to
+    ``used_storage`` in the caller's transaction, next to the file
+    metadata. If the block raises, the transaction is rolled back and the
+    space is released. Reservations lost to a crash are dropped by the
+    periodic reconciliation job once they are stale.
+
+    Usage:
+        async with StorageReservation(db, user_id, size) as reservation:
+            upload(...)
+            await reservation.settle()
+            await db.commit()
+    """
+
+    def __init__(self, db: AsyncSession, user_id: int, size: int):
+        self.db = db
+        self.user_id = user_id
+        self.size = size
+        self.settled = False
+
+    async def __aenter__(self) -> "StorageReservation":
+        if not await UserService.reserve_upload_async(self.db, self.user_id, self.size):
+            raise QuotaExceededError(f"Storage quota exceeded: {self.size} bytes requested")
+        return self
+
+    async def settle(self) -> None:
+        """Turn the reservation into used storage within the current transaction."""
+        await UserService.settle_upload_async(self.db, self.user_id, self.size)
+        self.settled = True
+
+    async def release(self) -> None:
+        """Return the reserved space to the quota."""
+        await UserService.release_upload_async(self.db, self.user_id, self.size)
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None:
+            # A settle that wasn't committed is undone with the transaction
+            await self.db.rollback()
+            await self.release()
+        elif not self.settled:
+            await self.release()
@@ -2,49 +2,101 @@
 User management routes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from api.database import get_db
-from api.domains.users.models import User
+from api.database import get_async_db
+from api.read_routing import get_read_db
+from api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from api.domains.users.models import FileType
 from api.domains.users.schemas import QuotaResponse, FileMetadataResponse
 from api.domains.users.crud import UserService
 from api.domains.auth.dependencies import get_current_active_user
+from api.domains.auth.cache import CurrentUser
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+FILES_PAGE_SIZE = 100
+MAX_FILES_PAGE_SIZE = 1000
+
 
 @router.get("/quota", response_model=QuotaResponse)
 async def get_user_quota(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's quota information."""
-    quota = UserService.get_user_quota(db, current_user.id)
+    quota = await UserService.get_user_quota_async(db, current_user.id)
     if not quota:
         raise HTTPException(status_code=404, detail="User quota not found")
     return quota
 
 
-@router.get("/files", response_model=List[FileMetadataResponse])
-async def get_user_files(
-    file_type: str = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+def _file_response(file) -> FileMetadataResponse:
+    return FileMetadataResponse(
+        id=file.id,
+        original_filename=file.original_filename,
+        file_type=file.file_type.value,
+        file_size=file.file_size,
+        mime_type=file.mime_type,
+        created_at=file.created_at,
+        expires_at=file.expires_at,
+        access_count=file.access_count
+    )
+
+
+@router.get("/files",
+    response_model=List[FileMetadataResponse],
+    summary="List user files",
+    description="List the current user's files, newest first. Pages are linked with an opaque cursor: "
+                "pass the `X-Next-Cursor` response header as `cursor` to get the next page. "
+                "With `format=ndjson` all matching files are streamed as newline-delimited JSON.",
+    responses={
+        200: {
+            "description": "Page of files, or all files as NDJSON",
+            "headers": {NEXT_CURSOR_HEADER: {"description": "Cursor of the next page, absent on the last page"}},
+            "content": {"application/x-ndjson": {}}
+        },
+        400: {"description": "Invalid cursor"}
+    }
+)
+def get_user_files(
+    response: Response,
+    file_type: Optional[FileType] = Query(None, description="Only files of this type"),
+    task_id: Optional[int] = Query(None, description="Only files of this alignment task"),
+    created_from: Optional[datetime] = Query(None, description="Only files created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only files created before this time"),
+    limit: int = Query(FILES_PAGE_SIZE, ge=1, le=MAX_FILES_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="`json` for one page, `ndjson` to stream all files"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get current user's files."""
-    files = UserService.get_user_files(db, current_user.id, file_type)
-    
-    return [
-        FileMetadataResponse(
-            id=file.id,
-            original_filename=file.original_filename,
-            file_type=file.file_type.value,
-            file_size=file.file_size,
-            mime_type=file.mime_type,
-            created_at=file.created_at,
-            expires_at=file.expires_at,
-            access_count=file.access_count
-        ) for file in files
-    ]
+    filters = dict(file_type=file_type, task_id=task_id, created_from=created_from, created_to=created_to)
+    if cursor:
+        position = decode_cursor(cursor)
+        try:
+            filters["before"] = (datetime.fromisoformat(position["created_at"]), int(position["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if format == "ndjson":
+        files = UserService.iter_user_files(db, current_user.id, **filters)
+        return StreamingResponse(
+            (_file_response(file).model_dump_json() + "\n" for file in files),
+            media_type="application/x-ndjson"
+        )
+
+    # One extra row tells whether another page exists
+    files = UserService.get_user_files(db, current_user.id, limit=limit + 1, **filters)
+    if len(files) > limit:
+        files = files[:limit]
+        last = files[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"created_at": last.created_at, "id": last.id})
+
+    return [_file_response(file) for file in files]
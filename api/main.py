@@ -1,9 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from api.database import dispose_async_engine
+from api.db_pool import render_prometheus
+from api.storage import start_storage_warm_up
 from api.domains.alignment.router import router as alignment_router
 from api.domains.models.router import router as models_router
 from api.domains.auth.routes import router as auth_router
 from api.domains.users.routes import router as users_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_storage_warm_up()
+    yield
+    await dispose_async_engine()
+
+
 app = FastAPI(
     title="Text-Audio Alignment API",
     description="Распределенная система для принудительного выравнивания текста и аудио с использованием MFA",
@@ -13,7 +26,8 @@ app = FastAPI(
         "displayRequestDuration": True,
         "defaultModelsExpandDepth": 0,
         "tryItOutEnabled": True
-    }
+    },
+    lifespan=lifespan
 )
 
 # Include routers
@@ -29,3 +43,8 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Database pool metrics in the Prometheus text format."""
+    return render_prometheus()
@@ -0,0 +1,98 @@
+"""
+Password hashing.
+
+bcrypt is deliberately slow (about 250 ms per call at 12 rounds), so async
+routes must never call it on the event loop. The ``*_async`` functions run
+it on a dedicated, bounded thread pool; when too many calls are already
+queued they fail fast with ``PasswordHashingBusy`` instead of letting a
+login storm pile up CPU work.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+import bcrypt
+
+T = TypeVar("T")
+
+# Password hashing rounds
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Concurrent hashes per process; each one keeps a CPU core busy
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+# Hashes allowed to wait for a worker before new ones are rejected
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_PENDING)
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing pool is saturated."""
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password."""
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash."""
+    try:
+        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    except ValueError:
+        # Malformed stored hash
+        return False
+
+
+def get_password_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used for password hashing."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS,
+                                               thread_name_prefix="password")
+    return _executor
+
+
+def _reset_after_fork() -> None:
+    # Worker threads don't survive fork; the child starts its own pool
+    global _executor, _executor_lock, _slots
+    _executor = None
+    _executor_lock = threading.Lock()
+    _slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_PENDING)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+async def run_password_task(func: Callable[..., T], *args) -> T:
+    """
+    Run a password function on the password hashing pool.
+
+    Raises:
+        PasswordHashingBusy: If the pool already has its maximum of
+            running and queued calls
+    """
+    slots = _slots
+    if not slots.acquire(blocking=False):
+        raise PasswordHashingBusy("Too many password operations in progress")
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_password_executor(), func, *args)
+    finally:
+        slots.release()
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_password_task(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_password_task(verify_password, plain_password, hashed_password)
@@ -0,0 +1,183 @@
+"""
+Routing of read-only requests to the read replica.
+
+Read-only endpoints take their session from ``get_read_db`` /
+``get_read_async_db`` instead of ``get_db`` / ``get_async_db``. Reads go
+to the replica (``MYSQL_REPLICA_HOST``) unless:
+
+- no replica is configured;
+- the replica lags more than ``DB_REPLICA_MAX_LAG`` seconds behind the
+  primary, or its lag can't be determined;
+- the client wrote within the last ``DB_REPLICA_STICKY_SECONDS``, so it
+  reads its own writes.
+
+Write endpoints call ``mark_user_wrote``, which hands the client a signed
+last-write timestamp as the ``last_write`` cookie and the ``X-Last-Write``
+header. Clients send it back as either, so the stickiness window holds
+across API processes; clients that send neither read from the replica.
+"""
+
+import hashlib
+import hmac
+import logging
+import math
+import os
+import threading
+import time
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from fastapi import Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from api import database
+from api.database import get_async_db, get_db
+from api.domains.auth.security import SECRET_KEY
+
+logger = logging.getLogger(__name__)
+
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "2"))
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", "5"))
+
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+
+
+def _sign(written_at: str) -> str:
+    return hmac.new(SECRET_KEY.encode(), f"last_write:{written_at}".encode(), hashlib.sha256).hexdigest()
+
+
+def last_write_marker(written_at: Optional[float] = None) -> str:
+    """Return the signed ``<milliseconds>.<signature>`` marker of a write."""
+    millis = str(int((time.time() if written_at is None else written_at) * 1000))
+    return f"{millis}.{_sign(millis)}"
+
+
+def mark_user_wrote(response: Response) -> None:
+    """Pin the client's reads to the primary for the stickiness window."""
+    marker = last_write_marker()
+    response.set_cookie(
+        LAST_WRITE_COOKIE, marker, max_age=math.ceil(DB_REPLICA_STICKY_SECONDS),
+        httponly=True, samesite="lax"
+    )
+    response.headers[LAST_WRITE_HEADER] = marker
+
+
+def reads_pinned_to_primary(marker: Optional[str], now: Optional[float] = None) -> bool:
+    """
+    Check whether a last-write marker is authentic and within the stickiness window.
+
+    Markers with a bad signature are ignored, so clients can't pin
+    themselves to the primary by forging a timestamp.
+    """
+    millis, _, signature = (marker or "").partition(".")
+    if not millis.isdigit() or not hmac.compare_digest(signature, _sign(millis)):
+        return False
+    age = (time.time() if now is None else now) - int(millis) / 1000
+    return age < DB_REPLICA_STICKY_SECONDS
+
+
+def probe_replica_lag(engine: Engine) -> Optional[float]:
+    """
+    Return the replica's lag in seconds, None if replication isn't running.
+
+    A server that reports no replication status isn't replicating and is
+    treated as current.
+    """
+    with engine.connect() as connection:
+        try:
+            row = connection.execute(text("SHOW REPLICA STATUS")).mappings().first()
+            column = "Seconds_Behind_Source"
+        except Exception:
+            # MySQL before 8.0.22
+            row = connection.execute(text("SHOW SLAVE STATUS")).mappings().first()
+            column = "Seconds_Behind_Master"
+    if row is None:
+        return 0.0
+    lag = row.get(column)
+    return None if lag is None else float(lag)
+
+
+class ReplicaLagMonitor:
+    """
+    Periodically measured replica lag.
+
+    At most one thread measures at a time; others keep using the last
+    result until it is refreshed.
+    """
+
+    def __init__(self, probe: Optional[Callable[[], Optional[float]]] = None,
+                 max_lag: float = DB_REPLICA_MAX_LAG, check_interval: float = DB_REPLICA_LAG_CHECK_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.probe = probe
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._clock = clock
+        self.lag: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def needs_check(self) -> bool:
+        return self._checked_at is None or self._clock() - self._checked_at >= self.check_interval
+
+    def check(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            try:
+                self.lag = self.probe()
+            except Exception as e:
+                logger.warning(f"Replica lag check failed: {e}")
+                self.lag = None
+            self._checked_at = self._clock()
+        finally:
+            self._lock.release()
+
+    @property
+    def healthy(self) -> bool:
+        """Result of the last check; unknown lag counts as unhealthy."""
+        return self.lag is not None and self.lag <= self.max_lag
+
+
+replica_lag_monitor = ReplicaLagMonitor(
+    probe=(lambda: probe_replica_lag(database.replica_engine)) if database.replica_engine is not None else None
+)
+
+
+def _replica_allowed(request: Request) -> bool:
+    marker = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    return (
+        replica_lag_monitor.probe is not None
+        and replica_lag_monitor.healthy
+        and not reads_pinned_to_primary(marker)
+    )
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)) -> Iterator[Session]:
+    """Session for read-only sync endpoints; replica when it is safe to use."""
+    if replica_lag_monitor.probe is not None and replica_lag_monitor.needs_check():
+        replica_lag_monitor.check()
+    if not _replica_allowed(request):
+        yield db
+        return
+    replica = database.ReplicaSessionLocal()
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+
+async def get_read_async_db(request: Request,
+                            db: AsyncSession = Depends(get_async_db)) -> AsyncIterator[AsyncSession]:
+    """Session for read-only async endpoints; replica when it is safe to use."""
+    if replica_lag_monitor.probe is not None and replica_lag_monitor.needs_check():
+        await run_in_threadpool(replica_lag_monitor.check)
+    if not _replica_allowed(request):
+        yield db
+        return
+    async with database.ReplicaAsyncSessionLocal() as replica:
+        yield replica
@@ -0,0 +1,38 @@
+import os
+import threading
+from typing import Optional
+
+from fastapi import Depends
+
+
+def get_storage():
+    """Return the shared MinIO storage service.
+
+    Imported on demand so that importing the API does not require storage
+    to be reachable; tests override this dependency with an in-memory store.
+    """
+    from shared.storage import minio_service
+    return minio_service
+
+
+def get_async_storage(storage=Depends(get_storage)):
+    """Return the storage service wrapped for use from async routes.
+
+    Async routes must use this dependency: calling the blocking service
+    directly from a coroutine stalls the event loop.
+    """
+    from shared.storage.async_service import AsyncStorage
+    return AsyncStorage(storage)
+
+
+def start_storage_warm_up() -> Optional[threading.Thread]:
+    """Verify storage in a background thread so startup never waits on MinIO.
+
+    Disabled with ``STORAGE_WARM_UP=false``; storage is then initialized
+    on first use.
+    """
+    if os.getenv("STORAGE_WARM_UP", "true").lower() != "true":
+        return None
+    thread = threading.Thread(target=lambda: get_storage().warm_up(), name="storage-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,158 @@
+"""
+Streaming responses for files kept in object storage, with HTTP Range support.
+"""
+
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from shared.storage.async_service import AsyncStorage
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header doesn't overlap the file."""
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range`` header.
+
+    Multi-range and malformed headers are ignored (the full file is served),
+    as permitted by RFC 9110.
+
+    Args:
+        range_header: Value of the Range header
+        size: Size of the file in bytes
+
+    Returns:
+        Tuple[int, int]: Inclusive (first, last) byte positions, None for the full file
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    if size == 0:
+        raise RangeNotSatisfiable()
+
+    first, _, last = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if first == "":
+            suffix = int(last)
+            if suffix == 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - suffix), size - 1
+        first_byte = int(first)
+        last_byte = int(last) if last else None
+    except ValueError:
+        return None
+
+    if last_byte is not None and first_byte > last_byte:
+        return None
+    if first_byte >= size:
+        raise RangeNotSatisfiable()
+    if last_byte is None:
+        return first_byte, size - 1
+    return first_byte, min(last_byte, size - 1)
+
+
+def _if_range_matches(if_range: Optional[str], etag: Optional[str], last_modified) -> bool:
+    """Check the If-Range precondition against the current ETag or modification date."""
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Only strong ETags may be used with If-Range
+        return not if_range.startswith("W/") and etag is not None and if_range == f'"{etag}"'
+    try:
+        return last_modified is not None and parsedate_to_datetime(if_range) == last_modified.replace(microsecond=0)
+    except (TypeError, ValueError):
+        return False
+
+
+def content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition header safe for non-ASCII names."""
+    ascii_name = filename.encode("ascii", "replace").decode("ascii").replace('"', "")
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def _plan_response(stat, request: Request, filename: str) -> Tuple[int, int, int, dict]:
+    """
+    Work out the part of a stored file to send and the response headers.
+
+    Returns:
+        Tuple[int, int, int, dict]: Offset, length, status code and headers
+
+    Raises:
+        HTTPException: 404 if the file doesn't exist, 416 for unsatisfiable ranges
+    """
+    if stat is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    size = stat.size
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": content_disposition(filename),
+    }
+    if stat.etag:
+        headers["ETag"] = f'"{stat.etag}"'
+    if stat.last_modified:
+        headers["Last-Modified"] = format_datetime(stat.last_modified, usegmt=True)
+
+    byte_range = None
+    if _if_range_matches(request.headers.get("if-range"), stat.etag, stat.last_modified):
+        try:
+            byte_range = parse_range_header(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            raise HTTPException(
+                status_code=416,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{size}"}
+            )
+
+    if byte_range is None:
+        offset, length, status_code = 0, size, 200
+    else:
+        first, last = byte_range
+        offset, length, status_code = first, last - first + 1, 206
+        headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    headers["Content-Length"] = str(length)
+    return offset, length, status_code, headers
+
+
+def stream_storage_file(storage, file_path: str, request: Request,
+                        media_type: str, filename: str) -> StreamingResponse:
+    """
+    Stream a stored file to the client, honoring Range and If-Range headers.
+
+    Chunks are piped from storage as they arrive, so memory use does not
+    depend on the file size.
+
+    Raises:
+        HTTPException: 404 if the file doesn't exist, 416 for unsatisfiable ranges
+    """
+    offset, length, status_code, headers = _plan_response(storage.stat_file(file_path), request, filename)
+
+    chunks = storage.stream_file(file_path, offset=offset, length=length) if length else iter(())
+    if chunks is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    return StreamingResponse(chunks, status_code=status_code, media_type=media_type, headers=headers)
+
+
+async def _no_chunks():
+    return
+    yield
+
+
+async def stream_storage_file_async(storage: AsyncStorage, file_path: str, request: Request,
+                                    media_type: str, filename: str) -> StreamingResponse:
+    """Async counterpart of :func:`stream_storage_file` for async routes."""
+    stat = await storage.stat_file(file_path)
+    offset, length, status_code, headers = _plan_response(stat, request, filename)
+
+    chunks = await storage.stream_file(file_path, offset=offset, length=length) if length else _no_chunks()
+    if chunks is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    return StreamingResponse(chunks, status_code=status_code, media_type=media_type, headers=headers)
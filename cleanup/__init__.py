@@ -0,0 +1,3 @@
+"""
+Periodic cleanup jobs run by cron.
+"""
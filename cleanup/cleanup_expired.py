@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Delete expired files from storage and their metadata from the database.
+
+Expired rows are read in keyset pages along the ``expires_at`` index
+(``(expires_at, id)`` after the last processed row), so memory use and
+lock time don't grow with the backlog. Each page is removed from MinIO
+with multi-object deletes, together with the objects derived from it
+(seek indexes of audio, columnar results and word indexes of results), its metadata rows are deleted in one statement
+and the freed space is subtracted from every affected user in one UPDATE.
+Progress is saved to a checkpoint file after each page, so an interrupted
+run resumes where it stopped.
+
+Usage:
+    python -m cleanup.cleanup_expired [--dry-run] [--batch-size N]
+        [--max-deletes-per-second N] [--checkpoint PATH]
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from api.domains.users.crud import UserService
+from api.domains.users.models import FileStorageMetadata, FileType
+from shared.audio import seek_index_path_for
+from shared.results import columnar_path_for, word_index_path_for
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHECKPOINT_PATH = os.getenv("CLEANUP_CHECKPOINT_PATH", "cleanup_expired.checkpoint.json")
+
+
+@dataclass
+class CleanupStats:
+    """Counters of a cleanup run."""
+    scanned: int = 0
+    deleted_files: int = 0
+    freed_bytes: int = 0
+    failed_files: int = 0
+    batches: int = 0
+    # Dry runs only count what they would delete
+    would_delete_files: int = 0
+    would_free_bytes: int = 0
+
+
+class Checkpoint:
+    """Progress of a run persisted as JSON, written atomically."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+
+    def load(self) -> Optional[Dict]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return json.load(f)
+
+    def save(self, cutoff: datetime, last_row: Tuple[datetime, int], stats: CleanupStats) -> None:
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({
+                "cutoff": cutoff.isoformat(),
+                "last_expires_at": last_row[0].isoformat(),
+                "last_id": last_row[1],
+                "stats": asdict(stats)
+            }, f)
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def object_paths(file: FileStorageMetadata) -> List[str]:
+    """Return the storage path of a file followed by the paths of objects derived from it."""
+    if file.file_type == FileType.AUDIO:
+        return [file.storage_path, seek_index_path_for(file.storage_path)]
+    if file.file_type == FileType.RESULT:
+        return [file.storage_path, columnar_path_for(file.storage_path), word_index_path_for(file.storage_path)]
+    return [file.storage_path]
+
+
+class RateLimiter:
+    """Limit deletions per second; a limit of 0 disables it."""
+
+    def __init__(self, per_second: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.per_second = per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._next_allowed = clock()
+
+    def acquire(self, count: int) -> None:
+        """Wait until ``count`` more deletions fit into the rate."""
+        if self.per_second <= 0:
+            return
+        now = self._clock()
+        if self._next_allowed > now:
+            self._sleep(self._next_allowed - now)
+        self._next_allowed = max(now, self._next_allowed) + count / self.per_second
+
+
+class ExpiredFileCleanup:
+    """
+    Incremental cleanup of expired files.
+
+    Args:
+        db: Database session
+        storage: Storage service providing ``delete_files`` and ``file_exists``
+        batch_size: Rows per page
+        max_deletes_per_second: Deletion rate limit, 0 for unlimited
+        dry_run: Only report what would be deleted
+        checkpoint_path: File used to resume interrupted runs, None to disable
+    """
+
+    def __init__(self, db: Session, storage, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_deletes_per_second: float = 0, dry_run: bool = False,
+                 checkpoint_path: Optional[str] = DEFAULT_CHECKPOINT_PATH,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.db = db
+        self.storage = storage
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        # A dry run changes nothing, so it must not move the checkpoint either
+        self.checkpoint = Checkpoint(None if dry_run else checkpoint_path)
+        self.rate_limiter = rate_limiter or RateLimiter(max_deletes_per_second)
+
+    def run(self, now: Optional[datetime] = None) -> CleanupStats:
+        """
+        Delete all files that expired before ``now``.
+
+        Returns:
+            CleanupStats: Counters of this run, including resumed progress
+        """
+        stats = CleanupStats()
+        cutoff, last_row = now or datetime.utcnow(), None
+
+        saved = self.checkpoint.load()
+        if saved:
+            # Finish the interrupted run against its original cutoff
+            cutoff = datetime.fromisoformat(saved["cutoff"])
+            last_row = (datetime.fromisoformat(saved["last_expires_at"]), saved["last_id"])
+            stats = CleanupStats(**saved["stats"])
+            logger.info(f"Resuming cleanup after file id {last_row[1]}")
+
+        logger.info(f"Cleanup started (cutoff={cutoff.isoformat()}, dry_run={self.dry_run})")
+        while True:
+            batch = UserService.get_expired_files(self.db, now=cutoff, after=last_row, limit=self.batch_size)
+            if not batch:
+                break
+            last_row = (batch[-1].expires_at, batch[-1].id)
+            self._process_batch(batch, stats)
+            self.checkpoint.save(cutoff, last_row, stats)
+
+        self.checkpoint.clear()
+        if self.dry_run:
+            logger.info(
+                f"Dry run completed: would_delete_count={stats.would_delete_files}, "
+                f"would_free_space={stats.would_free_bytes}"
+            )
+        else:
+            logger.info(
+                f"Cleanup completed: deleted_count={stats.deleted_files}, freed_space={stats.freed_bytes}, "
+                f"failed_count={stats.failed_files}"
+            )
+        return stats
+
+    def _process_batch(self, batch: List[FileStorageMetadata], stats: CleanupStats) -> None:
+        stats.scanned += len(batch)
+        stats.batches += 1
+
+        if self.dry_run:
+            for file in batch:
+                logger.info(f"Would delete {file.storage_path} (user_id={file.user_id}, size={file.file_size})")
+            stats.would_delete_files += len(batch)
+            stats.would_free_bytes += sum(file.file_size for file in batch)
+            self._release(batch)
+            return
+
+        paths = {file.id: object_paths(file) for file in batch}
+        # The limit is on storage deletions, derived objects included
+        self.rate_limiter.acquire(sum(len(file_paths) for file_paths in paths.values()))
+        deleted = self._delete_objects(batch, paths)
+
+        freed_by_user: Dict[int, int] = defaultdict(int)
+        for file in deleted:
+            freed_by_user[file.user_id] += file.file_size
+
+        if deleted:
+            self.db.query(FileStorageMetadata).filter(
+                FileStorageMetadata.id.in_([file.id for file in deleted])
+            ).delete(synchronize_session=False)
+            UserService.release_user_storage(self.db, dict(freed_by_user))
+        # Commit per page to keep transactions and row locks short
+        self.db.commit()
+        self._release(batch)
+
+        stats.deleted_files += len(deleted)
+        stats.freed_bytes += sum(freed_by_user.values())
+        stats.failed_files += len(batch) - len(deleted)
+
+    def _release(self, batch: List[FileStorageMetadata]) -> None:
+        # Drop processed rows from the session so long runs don't accumulate them
+        for file in batch:
+            self.db.expunge(file)
+
+    def _delete_objects(self, batch: List[FileStorageMetadata],
+                        paths: Dict[int, List[str]]) -> List[FileStorageMetadata]:
+        """Delete the objects of a page and return the rows whose objects are all gone."""
+        deleted_count = self.storage.delete_files([path for file_paths in paths.values() for path in file_paths])
+        if deleted_count == sum(len(file_paths) for file_paths in paths.values()):
+            return batch
+        # Some deletes failed or derived objects were never written;
+        # keep metadata only for files with objects that still exist
+        remaining = [file for file in batch if any(self.storage.file_exists(path) for path in paths[file.id])]
+        for file in remaining:
+            logger.warning(f"Failed to delete {file.storage_path}, will retry on next run")
+        remaining_ids = {file.id for file in remaining}
+        return [file for file in batch if file.id not in remaining_ids]
+
+
+def main(argv: Optional[List[str]] = None) -> CleanupStats:
+    parser = argparse.ArgumentParser(description="Delete expired files and their metadata.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report files that would be deleted")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-deletes-per-second", type=float,
+                        default=float(os.getenv("CLEANUP_MAX_DELETES_PER_SECOND", "0")),
+                        help="Deletion rate limit, 0 for unlimited")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Checkpoint file path")
+    args = parser.parse_args(argv)
+
+    from api.database import SessionLocal
+    from shared.storage import minio_service
+
+    db = SessionLocal()
+    try:
+        return ExpiredFileCleanup(
+            db,
+            minio_service,
+            batch_size=args.batch_size,
+            max_deletes_per_second=args.max_deletes_per_second,
+            dry_run=args.dry_run,
+            checkpoint_path=args.checkpoint
+        ).run()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Recompute users' storage usage from file metadata.
+
+Quota accounting is incremental; this job corrects drift left by files
+removed outside the API and drops reservations of crashed uploads. Usage
+is rebuilt in a single aggregate UPDATE. Uploads in flight hold their
+space in ``reserved_storage`` and move it to ``used_storage`` in the same
+transaction as their metadata, so the job can run at any time without
+releasing them; Celery beat runs it every ``STORAGE_RECONCILE_INTERVAL``
+seconds.
+
+Usage:
+    python -m cleanup.reconcile_storage
+"""
+
+import logging
+
+from api.domains.users.crud import UserService
+
+
+def main() -> int:
+    from api.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return UserService.reconcile_storage_usage(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    main()
@@ -0,0 +1,18 @@
+"""
+Audio helpers shared by the API and workers.
+"""
+
+from .seek_index import (
+    SeekIndex,
+    SeekIndexError,
+    build_seek_index,
+    build_wav_seek_index,
+    build_mp3_seek_index,
+    seek_index_path_for,
+    WAV_HEADER_PROBE_SIZE,
+)
+
+__all__ = [
+    'SeekIndex', 'SeekIndexError', 'build_seek_index', 'build_wav_seek_index',
+    'build_mp3_seek_index', 'seek_index_path_for', 'WAV_HEADER_PROBE_SIZE'
+]
@@ -0,0 +1,314 @@
+"""
+Time-to-byte seek indexes for stored audio files.
+
+A seek index is computed once when audio is ingested and stored next to the
+audio object. It lets the API translate a time range into a byte range and
+serve a segment with a single ranged read instead of downloading the file.
+
+- PCM WAV: the mapping is arithmetic, the index only keeps the format chunk
+  and the position of the ``data`` chunk.
+- MP3: frames have variable sizes (VBR, padding), so the index stores the
+  byte offset of every ``stride``-th frame.
+"""
+
+import base64
+import json
+import math
+import struct
+from typing import Dict, List, Optional, Tuple
+
+SEEK_INDEX_SUFFIX = ".seek.json"
+
+# Number of bytes that is always enough to locate the WAV data chunk
+WAV_HEADER_PROBE_SIZE = 64 * 1024
+
+# One MP3 index entry per this many frames (~0.2 s at 44.1 kHz)
+MP3_FRAME_STRIDE = 8
+
+_MP3_BITRATES = {
+    # (mpeg1, layer): kbps by index
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG 1
+    2: [22050, 24000, 16000],  # MPEG 2
+    0: [11025, 12000, 8000],   # MPEG 2.5
+}
+
+
+class SeekIndexError(ValueError):
+    """Raised when audio data cannot be indexed."""
+
+
+def seek_index_path_for(audio_path: str) -> str:
+    """Return the storage path of the seek index for an audio object."""
+    return audio_path + SEEK_INDEX_SUFFIX
+
+
+class SeekIndex:
+    """Time-to-byte mapping for a single audio object."""
+
+    def __init__(self, audio_format: str, duration: float, data_offset: int, data_end: int,
+                 wav_fmt: Optional[bytes] = None, byte_rate: int = 0, block_align: int = 0,
+                 sample_rate: int = 0, samples_per_frame: int = 0, frame_stride: int = 1,
+                 frame_offsets: Optional[List[int]] = None):
+        self.audio_format = audio_format
+        self.duration = duration
+        self.data_offset = data_offset
+        self.data_end = data_end
+        self.wav_fmt = wav_fmt
+        self.byte_rate = byte_rate
+        self.block_align = block_align
+        self.sample_rate = sample_rate
+        self.samples_per_frame = samples_per_frame
+        self.frame_stride = frame_stride
+        self.frame_offsets = frame_offsets or []
+
+    @property
+    def media_type(self) -> str:
+        return "audio/wav" if self.audio_format == "wav" else "audio/mpeg"
+
+    def byte_range(self, start: float, end: float) -> Tuple[int, int, float, float]:
+        """
+        Translate a time range into a byte range of the stored object.
+
+        Args:
+            start: Segment start in seconds
+            end: Segment end in seconds
+
+        Returns:
+            Tuple[int, int, float, float]: (offset, length, actual_start, actual_end)
+            where the actual times reflect frame/sample alignment
+        """
+        start = max(0.0, min(start, self.duration))
+        end = max(start, min(end, self.duration))
+
+        if self.audio_format == "wav":
+            first_block = int(start * self.byte_rate) // self.block_align
+            last_block = math.ceil(end * self.byte_rate / self.block_align)
+            offset = min(self.data_offset + first_block * self.block_align, self.data_end)
+            stop = min(self.data_offset + last_block * self.block_align, self.data_end)
+            return (
+                offset,
+                stop - offset,
+                (offset - self.data_offset) / self.byte_rate,
+                (stop - self.data_offset) / self.byte_rate,
+            )
+
+        frame_duration = self.samples_per_frame / self.sample_rate
+        first_entry = min(int(start / frame_duration) // self.frame_stride, len(self.frame_offsets) - 1)
+        last_entry = math.ceil(math.ceil(end / frame_duration) / self.frame_stride)
+        offset = self.frame_offsets[first_entry]
+        if last_entry < len(self.frame_offsets):
+            stop = self.frame_offsets[last_entry]
+            actual_end = last_entry * self.frame_stride * frame_duration
+        else:
+            stop = self.data_end
+            actual_end = self.duration
+        return offset, stop - offset, first_entry * self.frame_stride * frame_duration, actual_end
+
+    def segment_prefix(self, data_length: int) -> bytes:
+        """Return bytes that must precede a raw segment to make it playable."""
+        if self.audio_format != "wav":
+            return b""
+        fmt_chunk = b"fmt " + struct.pack("<I", len(self.wav_fmt)) + self.wav_fmt
+        if len(self.wav_fmt) % 2:
+            fmt_chunk += b"\x00"
+        riff_size = 4 + len(fmt_chunk) + 8 + data_length
+        return (
+            b"RIFF" + struct.pack("<I", riff_size) + b"WAVE"
+            + fmt_chunk
+            + b"data" + struct.pack("<I", data_length)
+        )
+
+    def to_dict(self) -> Dict:
+        data = {
+            "format": self.audio_format,
+            "duration": self.duration,
+            "data_offset": self.data_offset,
+            "data_end": self.data_end,
+        }
+        if self.audio_format == "wav":
+            data.update({
+                "wav_fmt": base64.b64encode(self.wav_fmt).decode("ascii"),
+                "byte_rate": self.byte_rate,
+                "block_align": self.block_align,
+            })
+        else:
+            data.update({
+                "sample_rate": self.sample_rate,
+                "samples_per_frame": self.samples_per_frame,
+                "frame_stride": self.frame_stride,
+                "frame_offsets": self.frame_offsets,
+            })
+        return data
+
+    def to_json(self) -> bytes:
+        return json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "SeekIndex":
+        raw = json.loads(data)
+        wav_fmt = raw.get("wav_fmt")
+        return cls(
+            audio_format=raw["format"],
+            duration=raw["duration"],
+            data_offset=raw["data_offset"],
+            data_end=raw["data_end"],
+            wav_fmt=base64.b64decode(wav_fmt) if wav_fmt else None,
+            byte_rate=raw.get("byte_rate", 0),
+            block_align=raw.get("block_align", 0),
+            sample_rate=raw.get("sample_rate", 0),
+            samples_per_frame=raw.get("samples_per_frame", 0),
+            frame_stride=raw.get("frame_stride", 1),
+            frame_offsets=raw.get("frame_offsets"),
+        )
+
+
+def build_wav_seek_index(header: bytes, total_size: int) -> SeekIndex:
+    """
+    Build a seek index for a WAV file.
+
+    Args:
+        header: Leading bytes of the file; must include the start of the data chunk
+        total_size: Full size of the object in bytes
+
+    Returns:
+        SeekIndex: Index for the file
+    """
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise SeekIndexError("Not a RIFF/WAVE file")
+
+    position = 12
+    wav_fmt = None
+    while position + 8 <= len(header):
+        chunk_id = header[position:position + 4]
+        chunk_size = struct.unpack_from("<I", header, position + 4)[0]
+        body = position + 8
+
+        if chunk_id == b"fmt ":
+            wav_fmt = bytes(header[body:body + chunk_size])
+        elif chunk_id == b"data":
+            if wav_fmt is None or len(wav_fmt) < 16:
+                raise SeekIndexError("WAV data chunk precedes the format chunk")
+            audio_format, channels, sample_rate, byte_rate, block_align, bits = struct.unpack_from("<HHIIHH", wav_fmt)
+            if audio_format not in (1, 3, 0xFFFE) or not byte_rate or not block_align:
+                raise SeekIndexError(f"Unsupported WAV encoding {audio_format}")
+            # Streaming writers leave the size at 0 or 0xFFFFFFFF
+            data_end = total_size if chunk_size in (0, 0xFFFFFFFF) else min(body + chunk_size, total_size)
+            return SeekIndex(
+                audio_format="wav",
+                duration=(data_end - body) / byte_rate,
+                data_offset=body,
+                data_end=data_end,
+                wav_fmt=wav_fmt,
+                byte_rate=byte_rate,
+                block_align=block_align,
+            )
+
+        position = body + chunk_size + (chunk_size % 2)
+
+    raise SeekIndexError("WAV data chunk not found in header")
+
+
+def _parse_mp3_frame_header(data: bytes, position: int) -> Optional[Tuple[int, int, int]]:
+    """Return (frame_length, sample_rate, samples_per_frame) or None if not a frame."""
+    if position + 4 > len(data):
+        return None
+    b1, b2 = data[position + 1], data[position + 2]
+    if data[position] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0x03
+    layer = 4 - ((b1 >> 1) & 0x03)
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x03
+    padding = (b2 >> 1) & 0x01
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, sample_rate, 384
+    samples_per_frame = 1152 if (mpeg1 or layer == 2) else 576
+    return samples_per_frame // 8 * bitrate // sample_rate + padding, sample_rate, samples_per_frame
+
+
+def _id3v2_size(data: bytes) -> int:
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def build_mp3_seek_index(data: bytes, frame_stride: int = MP3_FRAME_STRIDE) -> SeekIndex:
+    """
+    Build a frame index for an MP3 file.
+
+    Args:
+        data: Full MP3 file content
+        frame_stride: Record the offset of every N-th frame
+
+    Returns:
+        SeekIndex: Index for the file
+    """
+    position = _id3v2_size(data)
+    data_offset = None
+    sample_rate = samples_per_frame = 0
+    frame_count = 0
+    frame_offsets: List[int] = []
+    data_end = position
+
+    while position + 4 <= len(data):
+        if data[position:position + 3] == b"TAG":
+            break  # ID3v1 trailer
+        frame = _parse_mp3_frame_header(data, position)
+        if frame is None:
+            position += 1  # Lost sync, scan for the next frame header
+            continue
+
+        frame_length, frame_sample_rate, frame_samples = frame
+        if data_offset is None:
+            data_offset = position
+            sample_rate, samples_per_frame = frame_sample_rate, frame_samples
+        if frame_count % frame_stride == 0:
+            frame_offsets.append(position)
+        frame_count += 1
+        position += frame_length
+        data_end = min(position, len(data))
+
+    if data_offset is None:
+        raise SeekIndexError("No MPEG audio frames found")
+
+    return SeekIndex(
+        audio_format="mp3",
+        duration=frame_count * samples_per_frame / sample_rate,
+        data_offset=data_offset,
+        data_end=data_end,
+        sample_rate=sample_rate,
+        samples_per_frame=samples_per_frame,
+        frame_stride=frame_stride,
+        frame_offsets=frame_offsets,
+    )
+
+
+def build_seek_index(data: bytes, extension: str) -> SeekIndex:
+    """Build a seek index for a complete audio file based on its extension."""
+    extension = extension.lower().lstrip(".")
+    if extension == "wav":
+        return build_wav_seek_index(data, len(data))
+    if extension == "mp3":
+        return build_mp3_seek_index(data)
+    raise SeekIndexError(f"Unsupported audio format: {extension}")
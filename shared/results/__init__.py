@@ -0,0 +1,27 @@
+"""
+Alignment result formats shared by the API and workers.
+"""
+
+from .columnar import (
+    ColumnarAlignment,
+    ColumnarFormatError,
+    encode_alignment_result,
+    parse_header,
+    read_columnar_words,
+    columnar_path_for,
+)
+from .word_index import (
+    WordIndex,
+    WordIndexFormatError,
+    encode_word_index,
+    normalize_token,
+    word_index_path_for,
+)
+from .store import save_alignment_result
+
+__all__ = [
+    'ColumnarAlignment', 'ColumnarFormatError', 'encode_alignment_result',
+    'parse_header', 'read_columnar_words', 'columnar_path_for',
+    'WordIndex', 'WordIndexFormatError', 'encode_word_index', 'normalize_token',
+    'word_index_path_for', 'save_alignment_result'
+]
@@ -0,0 +1,419 @@
+"""
+Compact columnar format for alignment results.
+
+The JSON produced by MFA stores every interval as ``[start, end, label]``,
+which is large and slow to parse for long recordings. The columnar format
+keeps the same data as flat little-endian arrays:
+
+    header | word starts | word ends | word label ids | word phone ranges
+           | phone starts | phone ends | phone label ids
+           | word label table | phone label table
+           | speaker word ranges | speaker phone ranges | speaker table
+
+Times are float32 seconds, labels are interned into per-tier string tables
+and every word carries the ``[first, last)`` range of phones it spans.
+Words and phones are grouped by speaker: every speaker owns a contiguous
+block of each, sorted by start, so words within a block never overlap
+even when speakers talk over each other.
+Every section is 8-byte aligned and located through the fixed-size header,
+so a reader can fetch the header with a ranged read and then request only
+the sections it needs.
+"""
+
+import io
+import struct
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .encoding import pack_array
+
+MAGIC = b"ALNC"
+FORMAT_VERSION = 2
+COLUMNAR_EXTENSION = ".alnc"
+COLUMNAR_CONTENT_TYPE = "application/vnd.alignment.columnar"
+
+# Tolerance used when deciding whether a phone belongs to a word
+TIME_EPSILON = 1e-4
+
+SECTIONS = (
+    "word_starts",
+    "word_ends",
+    "word_labels",
+    "word_phone_starts",
+    "word_phone_ends",
+    "phone_starts",
+    "phone_ends",
+    "phone_labels",
+    "word_label_table",
+    "phone_label_table",
+    "speaker_word_offsets",
+    "speaker_phone_offsets",
+    "speaker_table",
+)
+
+# magic, version, section count, start, end, word count, phone count,
+# word label count, phone label count, speaker count
+_HEADER_PREFIX = struct.Struct("<4sHHddIIIII")
+_SECTION_ENTRY = struct.Struct("<QQ")
+HEADER_SIZE = _HEADER_PREFIX.size + _SECTION_ENTRY.size * len(SECTIONS)
+
+Interval = Tuple[float, float, str]
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class ColumnarFormatError(ValueError):
+    """Raised when a buffer is not a valid columnar alignment result."""
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _intern(labels: Sequence[str]) -> Tuple[List[str], List[int]]:
+    """Return the label table and the id of every label."""
+    table: Dict[str, int] = {}
+    ids = []
+    for label in labels:
+        ids.append(table.setdefault(label, len(table)))
+    return list(table), ids
+
+
+def _encode_label_table(labels: Sequence[str]) -> bytes:
+    """Encode labels as ``count + 1`` uint32 offsets followed by UTF-8 data."""
+    encoded = [label.encode("utf-8") for label in labels]
+    offsets = [0]
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    return pack_array("I", offsets) + b"".join(encoded)
+
+
+def _tier_entries(tier) -> List[Interval]:
+    items = tier.get("entries", []) if isinstance(tier, dict) else tier
+    return [(float(s), float(e), str(label)) for s, e, label in items]
+
+
+def collect_tier_entries(tiers: Dict, suffix: str) -> List[Interval]:
+    """Collect entries of every tier named ``suffix`` or ``"<speaker> - <suffix>"``, in time order."""
+    entries: List[Interval] = []
+    for name, tier in tiers.items():
+        if name == suffix or name.endswith(f" - {suffix}"):
+            entries.extend(_tier_entries(tier))
+    entries.sort(key=lambda entry: (entry[0], entry[1]))
+    return entries
+
+
+def collect_speaker_tiers(tiers: Dict) -> List[Tuple[str, List[Interval], List[Interval]]]:
+    """
+    Split tiers by speaker into ``(speaker, words, phones)``, sorted by speaker.
+
+    ``"<speaker> - words"`` belongs to ``speaker``; plain ``"words"`` and
+    ``"phones"`` tiers belong to the unnamed speaker ``""``.
+    """
+    speakers: Dict[str, Dict[str, List[Interval]]] = {}
+    for name, tier in tiers.items():
+        speaker, _, kind = name.rpartition(" - ")
+        if kind in ("words", "phones"):
+            speakers.setdefault(speaker, {"words": [], "phones": []})[kind].extend(_tier_entries(tier))
+    return [
+        (speaker,
+         sorted(speakers[speaker]["words"], key=lambda entry: (entry[0], entry[1])),
+         sorted(speakers[speaker]["phones"], key=lambda entry: (entry[0], entry[1])))
+        for speaker in sorted(speakers)
+    ]
+
+
+def _word_phone_ranges(words: Sequence[Interval], phones: Sequence[Interval]) -> Tuple[List[int], List[int]]:
+    """Map each word to the ``[first, last)`` range of phones inside it."""
+    phone_starts = [phone[0] for phone in phones]
+    firsts, lasts = [], []
+    for start, end, _ in words:
+        first = bisect_left(phone_starts, start - TIME_EPSILON)
+        last = first
+        while last < len(phones) and phones[last][1] <= end + TIME_EPSILON:
+            last += 1
+        firsts.append(first)
+        lasts.append(last)
+    return firsts, lasts
+
+
+def encode_alignment_result(result: Dict) -> bytes:
+    """
+    Encode an MFA JSON alignment result into the columnar format.
+
+    Args:
+        result: Parsed MFA JSON (``{"start", "end", "tiers": {...}}``)
+
+    Returns:
+        bytes: Columnar representation of the result
+    """
+    speakers = collect_speaker_tiers(result.get("tiers", {}))
+    words: List[Interval] = []
+    phones: List[Interval] = []
+    phone_firsts: List[int] = []
+    phone_lasts: List[int] = []
+    speaker_word_offsets, speaker_phone_offsets = [0], [0]
+    for _, speaker_words, speaker_phones in speakers:
+        # Phone ranges are looked up within the speaker's own phones
+        firsts, lasts = _word_phone_ranges(speaker_words, speaker_phones)
+        phone_firsts.extend(len(phones) + first for first in firsts)
+        phone_lasts.extend(len(phones) + last for last in lasts)
+        words.extend(speaker_words)
+        phones.extend(speaker_phones)
+        speaker_word_offsets.append(len(words))
+        speaker_phone_offsets.append(len(phones))
+
+    word_table, word_ids = _intern([word[2] for word in words])
+    phone_table, phone_ids = _intern([phone[2] for phone in phones])
+
+    payloads = {
+        "word_starts": pack_array("f", [word[0] for word in words]),
+        "word_ends": pack_array("f", [word[1] for word in words]),
+        "word_labels": pack_array("I", word_ids),
+        "word_phone_starts": pack_array("I", phone_firsts),
+        "word_phone_ends": pack_array("I", phone_lasts),
+        "phone_starts": pack_array("f", [phone[0] for phone in phones]),
+        "phone_ends": pack_array("f", [phone[1] for phone in phones]),
+        "phone_labels": pack_array("I", phone_ids),
+        "word_label_table": _encode_label_table(word_table),
+        "phone_label_table": _encode_label_table(phone_table),
+        "speaker_word_offsets": pack_array("I", speaker_word_offsets),
+        "speaker_phone_offsets": pack_array("I", speaker_phone_offsets),
+        "speaker_table": _encode_label_table([speaker for speaker, _, _ in speakers]),
+    }
+
+    body = io.BytesIO()
+    entries = []
+    offset = HEADER_SIZE
+    for name in SECTIONS:
+        payload = payloads[name]
+        aligned = _align(offset)
+        body.write(b"\x00" * (aligned - offset))
+        body.write(payload)
+        entries.append((aligned, len(payload)))
+        offset = aligned + len(payload)
+
+    start = float(result.get("start", min((word[0] for word in words), default=0.0)))
+    end = float(result.get("end", max((word[1] for word in words), default=0.0)))
+    header = _HEADER_PREFIX.pack(
+        MAGIC, FORMAT_VERSION, len(SECTIONS), start, end,
+        len(words), len(phones), len(word_table), len(phone_table), len(speakers)
+    )
+    header += b"".join(_SECTION_ENTRY.pack(*entry) for entry in entries)
+    return header + body.getvalue()
+
+
+class LabelTable:
+    """Lazily decoded view over an interned label table."""
+
+    def __init__(self, buffer: memoryview, count: int):
+        self._offsets = buffer[:(count + 1) * 4].cast("I")
+        self._data = buffer[(count + 1) * 4:]
+        self._count = count
+        self._index: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, label_id: int) -> str:
+        if not 0 <= label_id < self._count:
+            raise IndexError(label_id)
+        return bytes(self._data[self._offsets[label_id]:self._offsets[label_id + 1]]).decode("utf-8")
+
+    def id_of(self, label: str) -> Optional[int]:
+        """Return the id of ``label`` or None if it is not in the table."""
+        if self._index is None:
+            self._index = {self[i]: i for i in range(self._count)}
+        return self._index.get(label)
+
+
+class ColumnarAlignment:
+    """
+    Read-only accessor for a columnar alignment result.
+
+    Works on any buffer (bytes, memoryview); arrays are exposed as
+    zero-copy memoryviews over it.
+    """
+
+    def __init__(self, buffer: Buffer):
+        self._buffer = memoryview(buffer)
+        header = parse_header(self._buffer)
+        self.start = header["start"]
+        self.end = header["end"]
+        self.word_count = header["word_count"]
+        self.phone_count = header["phone_count"]
+        self.speaker_count = header["speaker_count"]
+        self.sections = header["sections"]
+
+        if sys.byteorder != "little":
+            raise ColumnarFormatError("Columnar results can only be read on little-endian hosts")
+
+        self.word_starts = self._array("word_starts", "f")
+        self.word_ends = self._array("word_ends", "f")
+        self.word_label_ids = self._array("word_labels", "I")
+        self.word_phone_starts = self._array("word_phone_starts", "I")
+        self.word_phone_ends = self._array("word_phone_ends", "I")
+        self.phone_starts = self._array("phone_starts", "f")
+        self.phone_ends = self._array("phone_ends", "f")
+        self.phone_label_ids = self._array("phone_labels", "I")
+        self.word_labels = LabelTable(self._section("word_label_table"), header["word_label_count"])
+        self.phone_labels = LabelTable(self._section("phone_label_table"), header["phone_label_count"])
+        self.speaker_word_offsets = self._array("speaker_word_offsets", "I")
+        self.speaker_phone_offsets = self._array("speaker_phone_offsets", "I")
+        self.speakers = LabelTable(self._section("speaker_table"), self.speaker_count)
+
+    def _section(self, name: str) -> memoryview:
+        offset, length = self.sections[name]
+        if offset + length > len(self._buffer):
+            raise ColumnarFormatError(f"Section {name} is truncated")
+        return self._buffer[offset:offset + length]
+
+    def _array(self, name: str, typecode: str) -> memoryview:
+        return self._section(name).cast(typecode)
+
+    def word(self, index: int) -> Interval:
+        """Return ``(start, end, label)`` of the word at ``index``."""
+        return (
+            self.word_starts[index],
+            self.word_ends[index],
+            self.word_labels[self.word_label_ids[index]],
+        )
+
+    def phone(self, index: int) -> Interval:
+        """Return ``(start, end, label)`` of the phone at ``index``."""
+        return (
+            self.phone_starts[index],
+            self.phone_ends[index],
+            self.phone_labels[self.phone_label_ids[index]],
+        )
+
+    def phones_for_word(self, index: int) -> List[Interval]:
+        """Return all phones spanned by the word at ``index``."""
+        return [
+            self.phone(i)
+            for i in range(self.word_phone_starts[index], self.word_phone_ends[index])
+        ]
+
+    def speaker_of_word(self, index: int) -> str:
+        """Return the speaker of the word at ``index`` (``""`` for unnamed tiers)."""
+        return self.speakers[bisect_right(self.speaker_word_offsets, index) - 1]
+
+    def words_between(self, start: float, end: float) -> Iterator[int]:
+        """Yield indexes of words overlapping the ``[start, end)`` time range, in time order."""
+        indexes = []
+        for speaker in range(self.speaker_count):
+            lo, hi = self.speaker_word_offsets[speaker], self.speaker_word_offsets[speaker + 1]
+            # A speaker's words are sorted and non-overlapping, so their ends are sorted as well
+            first = bisect_right(self.word_ends, start, lo, hi)
+            last = bisect_left(self.word_starts, end, lo, hi)
+            indexes.extend(range(first, last))
+        if self.speaker_count > 1:
+            indexes.sort(key=lambda index: self.word_starts[index])
+        return iter(indexes)
+
+    def to_dict(self) -> Dict:
+        """Convert back to the MFA JSON structure, with one pair of tiers per speaker."""
+        tiers = {}
+        for speaker in range(self.speaker_count):
+            name = self.speakers[speaker]
+            prefix = f"{name} - " if name else ""
+            words = range(self.speaker_word_offsets[speaker], self.speaker_word_offsets[speaker + 1])
+            phones = range(self.speaker_phone_offsets[speaker], self.speaker_phone_offsets[speaker + 1])
+            tiers[f"{prefix}words"] = {"type": "interval", "entries": [list(self.word(i)) for i in words]}
+            tiers[f"{prefix}phones"] = {"type": "interval", "entries": [list(self.phone(i)) for i in phones]}
+        return {"start": self.start, "end": self.end, "tiers": tiers}
+
+
+def parse_header(buffer: Buffer) -> Dict:
+    """
+    Parse the fixed-size header of a columnar result.
+
+    Only the first ``HEADER_SIZE`` bytes are needed, which lets callers
+    fetch the header with a ranged read and then request single sections.
+
+    Returns:
+        dict: start/end times, counts and ``sections`` as name -> (offset, length)
+    """
+    view = memoryview(buffer)
+    if len(view) < HEADER_SIZE:
+        raise ColumnarFormatError("Buffer is too short for a columnar header")
+
+    (magic, version, section_count, start, end, word_count, phone_count,
+     word_label_count, phone_label_count, speaker_count) = _HEADER_PREFIX.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ColumnarFormatError("Not a columnar alignment result")
+    if version != FORMAT_VERSION or section_count != len(SECTIONS):
+        raise ColumnarFormatError(f"Unsupported columnar format version {version}")
+
+    sections = {}
+    for i, name in enumerate(SECTIONS):
+        sections[name] = _SECTION_ENTRY.unpack_from(view, _HEADER_PREFIX.size + i * _SECTION_ENTRY.size)
+
+    return {
+        "version": version,
+        "start": start,
+        "end": end,
+        "word_count": word_count,
+        "phone_count": phone_count,
+        "word_label_count": word_label_count,
+        "phone_label_count": phone_label_count,
+        "speaker_count": speaker_count,
+        "sections": sections,
+    }
+
+
+def _download_span(storage, path: str, offset: int, length: int) -> memoryview:
+    data = storage.download_range(path, offset, length) if length else b""
+    if data is None or len(data) != length:
+        raise ColumnarFormatError(f"Columnar result {path} is truncated")
+    return memoryview(data)
+
+
+def read_columnar_words(storage, path: str) -> Optional[List[Interval]]:
+    """
+    Read the words of a stored columnar result with ranged reads.
+
+    Fetches the header, the contiguous word arrays and the word label
+    table; phones, usually the bulk of the file, are never downloaded.
+
+    Args:
+        storage: Storage backend providing ``download_range``
+        path: Storage path of the columnar result
+
+    Returns:
+        list: ``(start, end, label)`` of every word, None if the result doesn't exist
+    """
+    header_data = storage.download_range(path, 0, HEADER_SIZE)
+    if header_data is None:
+        return None
+    header = parse_header(header_data)
+    if sys.byteorder != "little":
+        raise ColumnarFormatError("Columnar results can only be read on little-endian hosts")
+
+    sections = header["sections"]
+    word_count = header["word_count"]
+    # Starts, ends and label ids are adjacent, so one request covers all three
+    first, _ = sections["word_starts"]
+    last, last_length = sections["word_labels"]
+    span = _download_span(storage, path, first, last + last_length - first)
+
+    def word_array(name: str, typecode: str) -> memoryview:
+        offset, length = sections[name]
+        return span[offset - first:offset - first + length].cast(typecode)
+
+    starts = word_array("word_starts", "f")
+    ends = word_array("word_ends", "f")
+    label_ids = word_array("word_labels", "I")
+    labels = LabelTable(
+        _download_span(storage, path, *sections["word_label_table"]),
+        header["word_label_count"]
+    )
+    if len(starts) != word_count or len(ends) != word_count or len(label_ids) != word_count:
+        raise ColumnarFormatError(f"Columnar result {path} has inconsistent word sections")
+    return [(starts[i], ends[i], labels[label_ids[i]]) for i in range(word_count)]
+
+
+def columnar_path_for(json_path: str) -> str:
+    """Return the storage path of the columnar sibling of a JSON result."""
+    base = json_path[:-len(".json")] if json_path.endswith(".json") else json_path
+    return base + COLUMNAR_EXTENSION
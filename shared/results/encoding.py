@@ -0,0 +1,24 @@
+"""
+Little-endian array encoding shared by the binary result formats.
+"""
+
+import sys
+from array import array
+from typing import Sequence
+
+
+def pack_array(typecode: str, values: Sequence) -> bytes:
+    """Encode ``values`` as a little-endian array of ``typecode`` items."""
+    data = array(typecode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+def unpack_array(typecode: str, data) -> array:
+    """Decode a little-endian array of ``typecode`` items from ``data``."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
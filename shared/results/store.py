@@ -0,0 +1,33 @@
+"""
+Storing alignment results together with their derived formats.
+"""
+
+import io
+import json
+from typing import Dict
+
+from .columnar import encode_alignment_result, columnar_path_for, COLUMNAR_CONTENT_TYPE
+from .word_index import encode_word_index, word_index_path_for, WORD_INDEX_CONTENT_TYPE
+
+
+def save_alignment_result(storage, json_path: str, result: Dict) -> bool:
+    """
+    Store an alignment result as JSON, its columnar sibling and word index.
+
+    Args:
+        storage: Storage service (e.g. MinIOService)
+        json_path: Path of the JSON result in storage
+        result: Parsed MFA JSON result
+
+    Returns:
+        bool: True if all objects were stored
+    """
+    objects = [
+        (json_path, json.dumps(result, ensure_ascii=False).encode("utf-8"), "application/json"),
+        (columnar_path_for(json_path), encode_alignment_result(result), COLUMNAR_CONTENT_TYPE),
+        (word_index_path_for(json_path), encode_word_index(result), WORD_INDEX_CONTENT_TYPE),
+    ]
+    for path, data, content_type in objects:
+        if not storage.upload_file(path, io.BytesIO(data), len(data), content_type):
+            return False
+    return True
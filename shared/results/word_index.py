@@ -0,0 +1,137 @@
+"""
+Word index of an alignment result.
+
+Maps every normalized word to the time intervals where it is spoken, so a
+word lookup does not need to parse the full result. Binary layout
+(little-endian):
+
+    magic "ALWI" | version u16 | token count u32 | interval count u32
+    | token offsets u32[count + 1] | interval offsets u32[count + 1]
+    | intervals float32[interval count * 2] | UTF-8 token data
+
+Tokens are stored sorted, so equal results always encode to equal bytes.
+"""
+
+import re
+import struct
+import unicodedata
+from typing import Dict, Iterable, List, Tuple, Union
+
+from .columnar import Interval, collect_tier_entries
+from .encoding import pack_array, unpack_array
+
+MAGIC = b"ALWI"
+FORMAT_VERSION = 1
+WORD_INDEX_EXTENSION = ".words"
+WORD_INDEX_CONTENT_TYPE = "application/vnd.alignment.words"
+
+_HEADER = struct.Struct("<4sHII")
+
+# Placeholder labels MFA emits for silence and unknown words
+_SKIPPED_TOKENS = {"", "<eps>", "<unk>", "sil", "sp", "spn"}
+_EDGE_PUNCTUATION = re.compile(r"^[^\w']+|[^\w']+$")
+
+
+class WordIndexFormatError(ValueError):
+    """Raised when a buffer is not a valid word index."""
+
+
+def normalize_token(word: str) -> str:
+    """Normalize a word for lookup: NFKC, case-folded, edge punctuation removed."""
+    token = unicodedata.normalize("NFKC", word).casefold().strip()
+    return _EDGE_PUNCTUATION.sub("", token)
+
+
+def word_index_path_for(json_path: str) -> str:
+    """Return the storage path of the word index of a JSON result."""
+    base = json_path[:-len(".json")] if json_path.endswith(".json") else json_path
+    return base + WORD_INDEX_EXTENSION
+
+
+def encode_word_index(result: Dict) -> bytes:
+    """
+    Build the word index of an MFA JSON result.
+
+    Args:
+        result: Parsed MFA JSON (``{"start", "end", "tiers": {...}}``)
+
+    Returns:
+        bytes: Encoded word index
+    """
+    return encode_word_entries(collect_tier_entries(result.get("tiers", {}), "words"))
+
+
+def encode_word_entries(words: Iterable[Interval]) -> bytes:
+    """
+    Build a word index from ``(start, end, label)`` word intervals.
+
+    Args:
+        words: Word intervals of every speaker, in any order
+
+    Returns:
+        bytes: Encoded word index
+    """
+    intervals: Dict[str, List[Tuple[float, float]]] = {}
+    for start, end, label in sorted(words, key=lambda word: (word[0], word[1])):
+        if label in _SKIPPED_TOKENS:
+            continue
+        token = normalize_token(label)
+        if token:
+            intervals.setdefault(token, []).append((start, end))
+
+    tokens = sorted(intervals)
+    encoded_tokens = [token.encode("utf-8") for token in tokens]
+
+    token_offsets, interval_offsets, times = [0], [0], []
+    for token, encoded in zip(tokens, encoded_tokens):
+        token_offsets.append(token_offsets[-1] + len(encoded))
+        interval_offsets.append(interval_offsets[-1] + len(intervals[token]))
+        for start, end in intervals[token]:
+            times.extend((start, end))
+
+    return (
+        _HEADER.pack(MAGIC, FORMAT_VERSION, len(tokens), len(times) // 2)
+        + pack_array("I", token_offsets)
+        + pack_array("I", interval_offsets)
+        + pack_array("f", times)
+        + b"".join(encoded_tokens)
+    )
+
+
+class WordIndex:
+    """Decoded word index with O(1) token lookup."""
+
+    def __init__(self, data: Union[bytes, memoryview]):
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            raise WordIndexFormatError("Buffer is too short for a word index")
+        magic, version, token_count, interval_count = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise WordIndexFormatError("Not a word index")
+
+        position = _HEADER.size
+        offsets_size = (token_count + 1) * 4
+        token_offsets = unpack_array("I", view[position:position + offsets_size])
+        position += offsets_size
+        interval_offsets = unpack_array("I", view[position:position + offsets_size])
+        position += offsets_size
+        times = unpack_array("f", view[position:position + interval_count * 8])
+        position += interval_count * 8
+
+        token_data = bytes(view[position:])
+        self._entries: Dict[str, Tuple[int, int]] = {}
+        for i in range(token_count):
+            token = token_data[token_offsets[i]:token_offsets[i + 1]].decode("utf-8")
+            self._entries[token] = (interval_offsets[i], interval_offsets[i + 1])
+        self._times = times
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, word: str) -> bool:
+        return normalize_token(word) in self._entries
+
+    def lookup(self, word: str) -> List[Tuple[float, float]]:
+        """Return ``(start, end)`` intervals of every occurrence of ``word``."""
+        first, last = self._entries.get(normalize_token(word), (0, 0))
+        return [(self._times[i * 2], self._times[i * 2 + 1]) for i in range(first, last)]
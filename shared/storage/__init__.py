@@ -2,6 +2,11 @@
 Storage module for shared file operations.
 """
 
+from .client import StorageClientConfig, ProcessLocalClient, create_minio_client
 from .minio_service import minio_service, MinIOService
+from .async_service import AsyncStorage
 
-__all__ = ['minio_service', 'MinIOService']
+__all__ = [
+    'minio_service', 'MinIOService', 'AsyncStorage',
+    'StorageClientConfig', 'ProcessLocalClient', 'create_minio_client',
+]
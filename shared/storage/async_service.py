@@ -0,0 +1,127 @@
+"""
+Asyncio interface to the storage service.
+
+``MinIOService`` is blocking; calling it from a coroutine stalls the
+event loop for every request handled by that worker. ``AsyncStorage``
+runs each call on a dedicated, bounded thread pool so async code can
+await storage without blocking the loop and without exhausting the
+threadpool FastAPI uses for sync endpoints.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, BinaryIO, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from .client import StorageClientConfig
+
+T = TypeVar("T")
+
+# Storage calls in flight per process; no more than the connection pool holds
+STORAGE_ASYNC_WORKERS = int(os.getenv("STORAGE_ASYNC_WORKERS", str(StorageClientConfig.pool_maxsize)))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_storage_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used for storage calls."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=STORAGE_ASYNC_WORKERS,
+                                               thread_name_prefix="storage")
+    return _executor
+
+
+def _reset_after_fork() -> None:
+    # Worker threads don't survive fork; the child starts its own pool
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+_END = object()
+
+
+class AsyncStorage:
+    """Awaitable wrapper around a synchronous storage service."""
+
+    def __init__(self, storage, executor: Optional[ThreadPoolExecutor] = None):
+        self.storage = storage
+        self._executor = executor
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking storage function on the storage thread pool."""
+        loop = asyncio.get_running_loop()
+        executor = self._executor or get_storage_executor()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+    async def upload_file(self, file_path: str, file_data: BinaryIO, file_size: int,
+                          content_type: str = 'application/octet-stream') -> bool:
+        return await self.run(self.storage.upload_file, file_path, file_data, file_size, content_type)
+
+    async def download_file(self, file_path: str) -> Optional[bytes]:
+        return await self.run(self.storage.download_file, file_path)
+
+    async def download_range(self, file_path: str, offset: int, length: int) -> Optional[bytes]:
+        return await self.run(self.storage.download_range, file_path, offset, length)
+
+    async def stat_file(self, file_path: str):
+        return await self.run(self.storage.stat_file, file_path)
+
+    async def get_file_size(self, file_path: str) -> Optional[int]:
+        return await self.run(self.storage.get_file_size, file_path)
+
+    async def delete_file(self, file_path: str) -> bool:
+        return await self.run(self.storage.delete_file, file_path)
+
+    async def file_exists(self, file_path: str) -> bool:
+        return await self.run(self.storage.file_exists, file_path)
+
+    async def list_files(self, prefix: str = "") -> List[str]:
+        return await self.run(self.storage.list_files, prefix)
+
+    async def delete_files(self, file_paths: Iterable[str]) -> int:
+        return await self.run(self.storage.delete_files, file_paths)
+
+    async def delete_prefixes(self, prefixes: Iterable[str]) -> int:
+        return await self.run(self.storage.delete_prefixes, prefixes)
+
+    async def list_files_parallel(self, prefixes: Iterable[str]) -> Dict[str, List[str]]:
+        return await self.run(self.storage.list_files_parallel, prefixes)
+
+    async def get_file_url(self, file_path: str, expires: int = 3600) -> Optional[str]:
+        return await self.run(self.storage.get_file_url, file_path, expires)
+
+    async def stream_file(self, file_path: str, offset: int = 0,
+                          length: int = 0) -> Optional[AsyncIterator[bytes]]:
+        """
+        Open a file for streaming.
+
+        Returns:
+            AsyncIterator[bytes]: File chunks, None if the file doesn't exist
+        """
+        chunks = await self.run(self.storage.stream_file, file_path, offset=offset, length=length)
+        if chunks is None:
+            return None
+        return self._iter_chunks(chunks)
+
+    async def _iter_chunks(self, chunks) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                chunk = await self.run(next, chunks, _END)
+                if chunk is _END:
+                    break
+                yield chunk
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                await self.run(close)
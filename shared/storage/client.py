@@ -0,0 +1,155 @@
+"""
+MinIO client factory with a tuned, per-process connection pool.
+
+The default ``Minio`` client uses a 10-connection pool with 5-minute
+timeouts. API threadpool workers and Celery children share the service,
+so bursts of storage calls overflow the pool and connections are opened
+and thrown away. Clients built here size the pool from the environment,
+use short connect timeouts, retry throttled and failed requests with
+backoff, and are recreated in forked children instead of reusing
+sockets inherited from the parent.
+"""
+
+import os
+import socket
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+import certifi
+import urllib3
+from urllib3.connection import HTTPConnection
+from urllib3.util import Retry, Timeout
+from minio import Minio
+
+# Throttling (429, 503 SlowDown) and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+@dataclass(frozen=True)
+class StorageClientConfig:
+    """Connection settings of the MinIO client."""
+    endpoint: str
+    access_key: str
+    secret_key: str
+    secure: bool = False
+    # Matches the default size of the threadpool that runs sync endpoints
+    pool_maxsize: int = 40
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    max_retries: int = 3
+    retry_backoff: float = 0.5
+
+    @classmethod
+    def from_env(cls) -> "StorageClientConfig":
+        """Read settings from ``MINIO_*`` environment variables."""
+        return cls(
+            endpoint=os.getenv('MINIO_HOST', 'localhost') + ':' + os.getenv('MINIO_PORT', '9000'),
+            access_key=os.getenv('MINIO_ROOT_USER', 'minioadmin'),
+            secret_key=os.getenv('MINIO_ROOT_PASSWORD', 'minioadmin'),
+            secure=os.getenv('MINIO_SECURE', 'false').lower() == 'true',
+            pool_maxsize=_env_int('MINIO_POOL_MAXSIZE', cls.pool_maxsize),
+            connect_timeout=_env_float('MINIO_CONNECT_TIMEOUT', cls.connect_timeout),
+            read_timeout=_env_float('MINIO_READ_TIMEOUT', cls.read_timeout),
+            max_retries=_env_int('MINIO_MAX_RETRIES', cls.max_retries),
+            retry_backoff=_env_float('MINIO_RETRY_BACKOFF', cls.retry_backoff),
+        )
+
+
+def create_http_client(config: StorageClientConfig) -> urllib3.PoolManager:
+    """
+    Build the urllib3 pool used by the MinIO client.
+
+    Args:
+        config: Client settings
+
+    Returns:
+        urllib3.PoolManager: Keep-alive pool with timeouts and retries
+    """
+    retries = Retry(
+        total=config.max_retries,
+        backoff_factor=config.retry_backoff,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        # Let the MinIO client turn the final error response into an S3Error
+        raise_on_status=False,
+    )
+    return urllib3.PoolManager(
+        num_pools=4,
+        maxsize=config.pool_maxsize,
+        timeout=Timeout(connect=config.connect_timeout, read=config.read_timeout),
+        retries=retries,
+        socket_options=HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ],
+        cert_reqs='CERT_REQUIRED',
+        ca_certs=os.getenv('SSL_CERT_FILE') or certifi.where(),
+    )
+
+
+def create_minio_client(config: StorageClientConfig) -> Minio:
+    """Build a MinIO client backed by a tuned connection pool."""
+    return Minio(
+        endpoint=config.endpoint,
+        access_key=config.access_key,
+        secret_key=config.secret_key,
+        secure=config.secure,
+        http_client=create_http_client(config),
+    )
+
+
+_process_clients: "weakref.WeakSet[ProcessLocalClient]" = weakref.WeakSet()
+
+
+class ProcessLocalClient:
+    """
+    Lazily created MinIO client owned by the current process.
+
+    Threads of one process share the client and its pool (urllib3 pools
+    are thread-safe). A forked child drops the inherited client and builds
+    its own on first use.
+    """
+
+    def __init__(self, config: StorageClientConfig):
+        self.config = config
+        self._client: Optional[Minio] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        _process_clients.add(self)
+
+    def get(self) -> Minio:
+        """Return the client of the current process, creating it if needed."""
+        client, pid = self._client, os.getpid()
+        if client is not None and self._pid == pid:
+            return client
+        with self._lock:
+            if self._client is None or self._pid != pid:
+                self._client = create_minio_client(self.config)
+                self._pid = pid
+            return self._client
+
+    def reset(self) -> None:
+        """Forget the current client without closing its connections."""
+        self._client = None
+        self._pid = None
+        # The lock may have been held by another thread at fork time
+        self._lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # Sockets inherited from the parent must not be reused or closed by the child
+    for holder in list(_process_clients):
+        holder.reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
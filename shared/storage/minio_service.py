@@ -3,44 +3,86 @@ MinIO File Storage Service for alignment API.
 """
 
 import os
-import io
-from typing import Optional, BinaryIO, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, BinaryIO, Dict, Iterable, List, Iterator
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 from dotenv import load_dotenv
 
+from .client import StorageClientConfig, ProcessLocalClient
+
 load_dotenv()
 
+# Size of chunks yielded by streaming downloads
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Maximum number of keys in one S3 multi-object delete request
+DELETE_BATCH_SIZE = 1000
+
+# Concurrent listings/deletes when fanning out over prefixes
+LIST_WORKERS = int(os.getenv('MINIO_LIST_WORKERS', '8'))
+
+
+def _batched(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
 
 class MinIOService:
     """MinIO service for file storage operations."""
     
-    def __init__(self):
-        self.endpoint = os.getenv('MINIO_HOST', 'localhost') + ':' + os.getenv('MINIO_PORT', '9000')
-        self.access_key = os.getenv('MINIO_ROOT_USER', 'minioadmin')
-        self.secret_key = os.getenv('MINIO_ROOT_PASSWORD', 'minioadmin')
-        self.secure = os.getenv('MINIO_SECURE', 'false').lower() == 'true'
+    def __init__(self, config: Optional[StorageClientConfig] = None):
+        self.config = config or StorageClientConfig.from_env()
+        self.endpoint = self.config.endpoint
+        self.access_key = self.config.access_key
+        self.secret_key = self.config.secret_key
+        self.secure = self.config.secure
         self.bucket_name = 'alignment-storage'
         
-        # Initialize MinIO client
-        self.client = Minio(
-            endpoint=self.endpoint,
-            access_key=self.access_key,
-            secret_key=self.secret_key,
-            secure=self.secure
-        )
-        
-        # Ensure bucket exists
-        self._ensure_bucket_exists()
+        # Each process gets its own client and connection pool. Nothing is
+        # sent over the network until the first storage call or warm_up().
+        self._clients = ProcessLocalClient(self.config)
+        self._bucket_verified = False
+        self._bucket_lock = threading.Lock()
     
-    def _ensure_bucket_exists(self) -> None:
+    @property
+    def client(self) -> Minio:
+        """MinIO client of the current process, with the bucket verified."""
+        if not self._bucket_verified:
+            self._ensure_bucket_exists()
+        return self._clients.get()
+    
+    def _ensure_bucket_exists(self) -> bool:
         """Create bucket if it doesn't exist."""
+        with self._bucket_lock:
+            if self._bucket_verified:
+                return True
+            client = self._clients.get()
+            try:
+                if not client.bucket_exists(self.bucket_name):
+                    client.make_bucket(self.bucket_name)
+                    print(f"Created bucket: {self.bucket_name}")
+                self._bucket_verified = True
+            except S3Error as e:
+                print(f"Error creating bucket: {e}")
+            return self._bucket_verified
+    
+    def warm_up(self) -> bool:
+        """
+        Open the connection pool and verify the bucket ahead of the first request.
+        
+        Returns:
+            bool: True if storage is ready
+        """
         try:
-            if not self.client.bucket_exists(self.bucket_name):
-                self.client.make_bucket(self.bucket_name)
-                print(f"Created bucket: {self.bucket_name}")
-        except S3Error as e:
-            print(f"Error creating bucket: {e}")
+            return self._ensure_bucket_exists()
+        except Exception as e:
+            print(f"MinIO warm-up failed: {e}")
+            return False
     
     def upload_file(self, file_path: str, file_data: BinaryIO, file_size: int, 
                    content_type: str = 'application/octet-stream') -> bool:
@@ -79,12 +121,105 @@ class MinIOService:
         Returns:
             bytes: File content if successful, None otherwise
         """
+        response = None
         try:
             response = self.client.get_object(self.bucket_name, file_path)
             return response.read()
         except S3Error as e:
             print(f"Error downloading file {file_path}: {e}")
             return None
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+    
+    def stream_file(self, file_path: str, offset: int = 0, length: int = 0,
+                    chunk_size: int = STREAM_CHUNK_SIZE) -> Optional[Iterator[bytes]]:
+        """
+        Stream file (or a byte range of it) from MinIO storage in chunks.
+        
+        The object is opened eagerly so that missing files are reported
+        before a response is started; the connection is returned to the
+        pool when the iterator is exhausted or closed.
+        
+        Args:
+            file_path: Path in storage
+            offset: Start of the range in bytes
+            length: Number of bytes to read (0 reads to the end)
+            chunk_size: Size of yielded chunks
+            
+        Returns:
+            Iterator[bytes]: File chunks if successful, None otherwise
+        """
+        try:
+            response = self.client.get_object(self.bucket_name, file_path, offset=offset, length=length)
+        except S3Error as e:
+            print(f"Error streaming file {file_path}: {e}")
+            return None
+        return self._iter_response(response, chunk_size)
+    
+    @staticmethod
+    def _iter_response(response, chunk_size: int) -> Iterator[bytes]:
+        try:
+            yield from response.stream(chunk_size)
+        finally:
+            response.close()
+            response.release_conn()
+    
+    def download_range(self, file_path: str, offset: int, length: int) -> Optional[bytes]:
+        """
+        Download a byte range of a file from MinIO storage.
+        
+        Args:
+            file_path: Path in storage
+            offset: Start of the range in bytes
+            length: Number of bytes to read
+            
+        Returns:
+            bytes: Range content if successful, None otherwise
+        """
+        response = None
+        try:
+            response = self.client.get_object(self.bucket_name, file_path, offset=offset, length=length)
+            return response.read()
+        except S3Error as e:
+            print(f"Error downloading range of file {file_path}: {e}")
+            return None
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+    
+    def stat_file(self, file_path: str):
+        """
+        Get metadata of a file in storage.
+        
+        Args:
+            file_path: Path in storage
+            
+        Returns:
+            Object: MinIO object info (size, etag, last_modified, content_type),
+            None if file doesn't exist
+        """
+        try:
+            return self.client.stat_object(self.bucket_name, file_path)
+        except S3Error:
+            return None
+    
+    def get_file_size(self, file_path: str) -> Optional[int]:
+        """
+        Get size of a file in storage.
+        
+        Args:
+            file_path: Path in storage
+            
+        Returns:
+            int: File size in bytes, None if file doesn't exist
+        """
+        try:
+            return self.client.stat_object(self.bucket_name, file_path).size
+        except S3Error:
+            return None
     
     def delete_file(self, file_path: str) -> bool:
         """
@@ -103,6 +238,52 @@ class MinIOService:
             print(f"Error deleting file {file_path}: {e}")
             return False
     
+    def delete_files(self, file_paths: Iterable[str], batch_size: int = DELETE_BATCH_SIZE) -> int:
+        """
+        Delete many files using multi-object delete requests.
+        
+        Paths are consumed lazily, so a streaming listing can be passed in
+        directly without materializing it.
+        
+        Args:
+            file_paths: Paths in storage
+            batch_size: Objects per request (S3 allows at most 1000)
+            
+        Returns:
+            int: Number of deleted files
+        """
+        deleted = 0
+        for batch in _batched(file_paths, min(batch_size, DELETE_BATCH_SIZE)):
+            try:
+                # Errors are reported lazily; the request is sent when iterated
+                errors = list(self.client.remove_objects(
+                    self.bucket_name, [DeleteObject(path) for path in batch]
+                ))
+            except S3Error as e:
+                print(f"Error deleting {len(batch)} files: {e}")
+                continue
+            for error in errors:
+                print(f"Error deleting file {error.name}: {error.message}")
+            deleted += len(batch) - len(errors)
+        return deleted
+    
+    def delete_prefixes(self, prefixes: Iterable[str], max_workers: int = LIST_WORKERS) -> int:
+        """
+        Delete every file under the given prefixes, several prefixes at a time.
+        
+        Args:
+            prefixes: Path prefixes, e.g. one per user or task
+            max_workers: Maximum number of prefixes processed in parallel
+            
+        Returns:
+            int: Number of deleted files
+        """
+        prefixes = list(prefixes)
+        if not prefixes:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prefixes))) as executor:
+            return sum(executor.map(lambda prefix: self.delete_files(self.iter_files(prefix)), prefixes))
+    
     def file_exists(self, file_path: str) -> bool:
         """
         Check if file exists in storage.
@@ -119,6 +300,22 @@ class MinIOService:
         except S3Error:
             return False
     
+    def iter_files(self, prefix: str = "") -> Iterator[str]:
+        """
+        Iterate over files with given prefix without loading the whole listing.
+        
+        Args:
+            prefix: Path prefix to filter files
+            
+        Yields:
+            str: File paths, page by page as the listing is fetched
+        """
+        try:
+            for obj in self.client.list_objects(self.bucket_name, prefix=prefix, recursive=True):
+                yield obj.object_name
+        except S3Error as e:
+            print(f"Error listing files with prefix {prefix}: {e}")
+    
     def list_files(self, prefix: str = "") -> List[str]:
         """
         List files with given prefix.
@@ -129,16 +326,25 @@ class MinIOService:
         Returns:
             List[str]: List of file paths
         """
-        try:
-            objects = self.client.list_objects(
-                self.bucket_name, 
-                prefix=prefix, 
-                recursive=True
-            )
-            return [obj.object_name for obj in objects]
-        except S3Error as e:
-            print(f"Error listing files with prefix {prefix}: {e}")
-            return []
+        return list(self.iter_files(prefix))
+    
+    def list_files_parallel(self, prefixes: Iterable[str],
+                            max_workers: int = LIST_WORKERS) -> Dict[str, List[str]]:
+        """
+        List several prefixes concurrently.
+        
+        Args:
+            prefixes: Path prefixes, e.g. one per user
+            max_workers: Maximum number of listings in flight
+            
+        Returns:
+            Dict[str, List[str]]: File paths by prefix
+        """
+        prefixes = list(prefixes)
+        if not prefixes:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prefixes))) as executor:
+            return dict(zip(prefixes, executor.map(self.list_files, prefixes)))
     
     def get_file_url(self, file_path: str, expires: int = 3600) -> Optional[str]:
         """
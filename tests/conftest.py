@@ -1,9 +1,21 @@
 import pytest
 import os
 import tempfile
+import hashlib
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+# Tests use in-memory storage; don't reach out to MinIO on app startup
+os.environ.setdefault("STORAGE_WARM_UP", "false")
+
 from api.main import app
-from api.database import get_db, Base
+from api.database import get_db, get_async_db, to_async_url, Base
+from api.storage import get_storage
+from api.domains.alignment.queue import get_task_queue
+from api.domains.alignment.words import word_index_cache
 from api.domains.users.models import User, SubscriptionType
 from api.domains.users.schemas import UserCreate
 from api.domains.users.crud import UserService
@@ -14,6 +26,9 @@ import pika
 from minio import Minio
 from tests.test_database_setup import get_test_engine, setup_test_database, get_test_session_factory
 from api.domains.auth.security import create_access_token
+from api.domains.auth.cache import clear_auth_caches
+from api.domains.auth.rate_limit import login_rate_limiter
+from api.domains.models.catalog import catalog_cache
 
 # Create test database using universal setup
 engine = get_test_engine()
@@ -36,6 +51,125 @@ def override_get_db():
 
 app.dependency_overrides[get_db] = override_get_db
 
+# Async endpoints use their own connections to the same test database;
+# NullPool because each TestClient runs its own event loop
+async_engine = create_async_engine(to_async_url(str(engine.url)), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+app.dependency_overrides[get_async_db] = override_get_async_db
+
+class InMemoryStorage:
+    """In-memory replacement for MinIOService used by endpoint tests."""
+
+    def __init__(self):
+        self.objects = {}
+        self.content_types = {}
+        self.bytes_read = 0
+        self.last_modified = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def upload_file(self, file_path, file_data, file_size, content_type='application/octet-stream'):
+        self.objects[file_path] = file_data.read(file_size)
+        self.content_types[file_path] = content_type
+        return True
+
+    def stat_file(self, file_path):
+        data = self.objects.get(file_path)
+        if data is None:
+            return None
+        return SimpleNamespace(
+            size=len(data),
+            etag=hashlib.md5(data).hexdigest(),
+            last_modified=self.last_modified,
+            content_type=self.content_types.get(file_path, 'application/octet-stream')
+        )
+
+    def stream_file(self, file_path, offset=0, length=0, chunk_size=64 * 1024):
+        data = self.objects.get(file_path)
+        if data is None:
+            return None
+        end = offset + length if length else len(data)
+
+        def chunks():
+            for position in range(offset, end, chunk_size):
+                chunk = data[position:min(position + chunk_size, end)]
+                self.bytes_read += len(chunk)
+                yield chunk
+        return chunks()
+
+    def download_file(self, file_path):
+        data = self.objects.get(file_path)
+        if data is not None:
+            self.bytes_read += len(data)
+        return data
+
+    def download_range(self, file_path, offset, length):
+        data = self.objects.get(file_path)
+        if data is None:
+            return None
+        chunk = data[offset:offset + length]
+        self.bytes_read += len(chunk)
+        return chunk
+
+    def get_file_size(self, file_path):
+        data = self.objects.get(file_path)
+        return None if data is None else len(data)
+
+    def delete_file(self, file_path):
+        return self.objects.pop(file_path, None) is not None
+
+    def file_exists(self, file_path):
+        return file_path in self.objects
+
+    def iter_files(self, prefix=""):
+        return iter(sorted(path for path in self.objects if path.startswith(prefix)))
+
+    def list_files(self, prefix=""):
+        return list(self.iter_files(prefix))
+
+    def list_files_parallel(self, prefixes):
+        return {prefix: self.list_files(prefix) for prefix in prefixes}
+
+    def delete_files(self, file_paths):
+        return sum(self.delete_file(path) for path in list(file_paths))
+
+    def delete_prefixes(self, prefixes):
+        return sum(self.delete_files(self.iter_files(prefix)) for prefix in prefixes)
+
+
+@pytest.fixture(autouse=True)
+def storage():
+    """Replace MinIO storage with an in-memory store for every test"""
+    memory_storage = InMemoryStorage()
+    app.dependency_overrides[get_storage] = lambda: memory_storage
+    yield memory_storage
+    app.dependency_overrides.pop(get_storage, None)
+    word_index_cache.clear()
+
+class FakeTaskQueue:
+    """Records published batches instead of sending them to the broker."""
+
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+
+    def enqueue(self, tasks):
+        if self.fail:
+            raise ConnectionError("broker unavailable")
+        self.batches.append(list(tasks))
+
+
+@pytest.fixture(autouse=True)
+def task_queue():
+    """Keep every test away from the Celery broker"""
+    queue = FakeTaskQueue()
+    app.dependency_overrides[get_task_queue] = lambda: queue
+    yield queue
+    app.dependency_overrides.pop(get_task_queue, None)
+
 @pytest.fixture
 def client():
     # Client created for each test to match db_session lifecycle
@@ -47,6 +181,10 @@ def db_session():
     """Create a clean database session for each test"""
     global _test_db_session
     
+    # Ids are reused across tests, so cached users must not leak between them
+    clear_auth_caches()
+    login_rate_limiter.clear()
+    catalog_cache.clear()
     # Setup test database with all tables
     setup_test_database(engine)
     
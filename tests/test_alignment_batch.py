@@ -0,0 +1,180 @@
+import json
+import pytest
+
+from api.domains.alignment.models import AlignmentQueue, CorpusFile
+from api.domains.models.crud import create_language, create_mfa_model
+from api.domains.models.models import ModelType
+from api.domains.models.schemas import LanguageCreate, MFAModelCreate
+from api.domains.users.models import FileStorageMetadata, SubscriptionType, User
+
+MODEL_FIELDS = {
+    "acoustic_model_name": "russian_mfa", "acoustic_model_version": "3.1.0",
+    "dictionary_model_name": "russian_mfa", "dictionary_model_version": "3.1.0",
+}
+
+
+class TestAlignmentBatch:
+
+    @pytest.fixture
+    def models(self, db_session):
+        russian = create_language(db_session, LanguageCreate(code="ru", name="Russian"))
+        english = create_language(db_session, LanguageCreate(code="en", name="English"))
+        for name, model_type, language in [
+            ("russian_mfa", ModelType.ACOUSTIC, russian),
+            ("russian_mfa", ModelType.DICTIONARY, russian),
+            ("english_mfa", ModelType.DICTIONARY, english),
+        ]:
+            create_mfa_model(db_session, MFAModelCreate(
+                name=name, model_type=model_type, version="3.1.0", language_id=language.id
+            ))
+
+    def _files(self, count, audio_size=10):
+        return (
+            [("audio_files", (f"clip_{i}.wav", b"a" * audio_size, "audio/wav")) for i in range(count)]
+            + [("text_files", (f"clip_{i}.txt", b"text", "text/plain")) for i in range(count)]
+        )
+
+    def test_paired_files(self, client, db_session, test_user, auth_headers, models, task_queue):
+        """Test that N file pairs become N tasks in one transaction and one publish"""
+        response = client.post("/alignment/batch", data=MODEL_FIELDS, files=self._files(3), headers=auth_headers)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["enqueued"] is True
+        assert [task["original_audio_filename"] for task in body["tasks"]] == ["clip_0.wav", "clip_1.wav", "clip_2.wav"]
+
+        tasks = db_session.query(AlignmentQueue).order_by(AlignmentQueue.id).all()
+        assert len(task_queue.batches) == 1
+        assert task_queue.batches[0] == [(task.id, task.celery_task_id) for task in tasks]
+        assert all(task.celery_task_id and task.enqueued_at for task in tasks)
+        assert db_session.query(FileStorageMetadata).count() == 6
+        corpus_files = db_session.query(CorpusFile).order_by(CorpusFile.id).all()
+        assert [corpus_file.task_id for corpus_file in corpus_files] == [task.id for task in tasks]
+        assert body["tasks"][0]["audio_file_path"] == f"{test_user.id}/corpus/{tasks[0].id}/{corpus_files[0].id}.wav"
+        assert db_session.query(User.used_storage).filter(User.id == test_user.id).scalar() == 3 * (10 + 4)
+
+    def test_manifest(self, client, db_session, auth_headers, models, task_queue):
+        """Test that manifest entries match uploads by filename"""
+        manifest = [
+            {"audio_filename": "clip_1.wav", "text_filename": "clip_0.txt",
+             "acoustic_model": {"name": "russian_mfa", "version": "3.1.0"},
+             "dictionary_model": {"name": "russian_mfa", "version": "3.1.0"}},
+            {"audio_filename": "clip_0.wav", "text_filename": "clip_1.txt",
+             "acoustic_model": {"name": "russian_mfa", "version": "3.1.0"},
+             "dictionary_model": {"name": "russian_mfa", "version": "3.1.0"}},
+        ]
+        response = client.post("/alignment/batch", data={"manifest": json.dumps(manifest)},
+                               files=self._files(2), headers=auth_headers)
+
+        assert response.status_code == 200
+        assert [(task["original_audio_filename"], task["original_text_filename"]) for task in response.json()["tasks"]] == [
+            ("clip_1.wav", "clip_0.txt"), ("clip_0.wav", "clip_1.txt")
+        ]
+
+    def test_models_validated_once(self, client, auth_headers, models, task_queue, monkeypatch):
+        """Test that a shared model combination is validated once per batch"""
+        import api.domains.alignment.router as router
+        calls = []
+        validate = router.validate_models_same_language_async
+
+        async def counted(*args, **kwargs):
+            calls.append(1)
+            return await validate(*args, **kwargs)
+        monkeypatch.setattr(router, "validate_models_same_language_async", counted)
+
+        response = client.post("/alignment/batch", data=MODEL_FIELDS, files=self._files(5), headers=auth_headers)
+
+        assert response.status_code == 200
+        assert len(calls) == 1
+
+    def test_invalid_models_reject_batch(self, client, db_session, auth_headers, models, task_queue):
+        """Test that one invalid model combination rejects the whole batch"""
+        fields = dict(MODEL_FIELDS, dictionary_model_name="english_mfa")
+        response = client.post("/alignment/batch", data=fields, files=self._files(2), headers=auth_headers)
+
+        assert response.status_code == 400
+        assert db_session.query(AlignmentQueue).count() == 0
+        assert task_queue.batches == []
+
+    def test_quota_exceeded_rolls_back(self, client, db_session, test_user, auth_headers, models, task_queue, storage):
+        """Test that nothing is stored when the batch doesn't fit the quota"""
+        db_session.query(SubscriptionType).update({SubscriptionType.total_storage_limit: 20})
+        db_session.commit()
+
+        response = client.post("/alignment/batch", data=MODEL_FIELDS, files=self._files(2), headers=auth_headers)
+
+        assert response.status_code == 413
+        assert db_session.query(AlignmentQueue).count() == 0
+        assert db_session.query(User.used_storage).filter(User.id == test_user.id).scalar() == 0
+        assert storage.objects == {}
+
+    def test_malformed_batches(self, client, auth_headers, models, task_queue):
+        """Test rejection of mismatched pairs, bad manifests and file types"""
+        files = self._files(2)[:-1]
+        assert client.post("/alignment/batch", data=MODEL_FIELDS, files=files, headers=auth_headers).status_code == 400
+
+        response = client.post("/alignment/batch", data={"manifest": "[{}]"}, files=self._files(1), headers=auth_headers)
+        assert response.status_code == 400
+
+        files = [("audio_files", ("clip.ogg", b"a", "audio/ogg")), ("text_files", ("clip.txt", b"t", "text/plain"))]
+        response = client.post("/alignment/batch", data=MODEL_FIELDS, files=files, headers=auth_headers)
+        assert response.status_code == 400
+        assert "invalid audio file" in response.json()["detail"]
+
+    def test_broker_failure_keeps_tasks(self, client, db_session, auth_headers, models, task_queue):
+        """Test that tasks are kept for re-publishing when the broker is down"""
+        task_queue.fail = True
+
+        response = client.post("/alignment/batch", data=MODEL_FIELDS, files=self._files(2), headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["enqueued"] is False
+        tasks = db_session.query(AlignmentQueue).all()
+        assert len(tasks) == 2
+        assert all(task.celery_task_id and task.enqueued_at is None for task in tasks)
+
+    def test_failed_enqueue_is_republished(self, client, db_session, auth_headers, models, task_queue, monkeypatch):
+        """Test that the periodic task publishes tasks whose enqueue failed, once"""
+        import api.database
+        import workers.tasks
+        from api.domains.alignment.queue import CeleryTaskQueue
+        from tests.conftest import TestingSessionLocal
+        monkeypatch.setattr(api.database, "SessionLocal", TestingSessionLocal)
+        monkeypatch.setattr(CeleryTaskQueue, "enqueue", lambda self, tasks: task_queue.batches.append(list(tasks)))
+        task_queue.fail = True
+        client.post("/alignment/batch", data=MODEL_FIELDS, files=self._files(2), headers=auth_headers)
+        task_queue.fail = False
+        client.post("/alignment/batch", data=MODEL_FIELDS, files=self._files(1), headers=auth_headers)
+
+        assert workers.tasks.republish_alignment_tasks.run(min_age=3600) == {"republished_tasks": 0}
+        assert workers.tasks.republish_alignment_tasks.run(min_age=0) == {"republished_tasks": 2}
+        assert workers.tasks.republish_alignment_tasks.run(min_age=0) == {"republished_tasks": 0}
+
+        db_session.expire_all()
+        tasks = db_session.query(AlignmentQueue).order_by(AlignmentQueue.id).all()
+        assert task_queue.batches[-1] == [(task.id, task.celery_task_id) for task in tasks[:2]]
+        assert all(task.enqueued_at for task in tasks)
+
+    def test_celery_queue_uses_one_producer(self, monkeypatch):
+        """Test that a batch is published through a single producer"""
+        from contextlib import contextmanager
+        from api.domains.alignment.queue import CeleryTaskQueue, PROCESS_ALIGNMENT_TASK
+        from workers.celery_app import celery_app
+
+        acquired, sent = [], []
+
+        @contextmanager
+        def producer_or_acquire(producer=None):
+            acquired.append(object())
+            yield acquired[-1]
+
+        monkeypatch.setattr(celery_app, "producer_or_acquire", producer_or_acquire)
+        monkeypatch.setattr(celery_app, "send_task", lambda name, **kwargs: sent.append((name, kwargs)))
+
+        CeleryTaskQueue().enqueue([(1, "a"), (2, "b")])
+
+        assert len(acquired) == 1
+        assert [(name, kwargs["args"], kwargs["task_id"]) for name, kwargs in sent] == [
+            (PROCESS_ALIGNMENT_TASK, [1], "a"), (PROCESS_ALIGNMENT_TASK, [2], "b")
+        ]
+        assert all(kwargs["producer"] is acquired[0] for _, kwargs in sent)
@@ -328,7 +328,7 @@ class TestAlignmentEndpoints:
         response = client.put("/alignment/999", json=update_data, headers=auth_headers)
         assert response.status_code == 404
     
-    def test_delete_alignment_task(self, client, sample_audio_file, sample_text_file, setup_database):
+    def test_delete_alignment_task(self, client, sample_audio_file, sample_text_file, setup_database, storage):
         """Test deleting alignment task"""
         test_data = setup_database
         models = test_data
@@ -354,6 +354,10 @@ class TestAlignmentEndpoints:
             )
         
         task_id = create_response.json()["id"]
+        user_id = test_data["user"].id
+        storage.objects[f"{user_id}/corpus/{task_id}/1.wav"] = b"audio"
+        storage.objects[f"{user_id}/results/{task_id}/1.json"] = b"{}"
+        storage.objects["other/corpus/1/1.wav"] = b"keep"
         
         # Delete the task
         response = client.delete(f"/alignment/{task_id}", headers=auth_headers)
@@ -363,6 +367,7 @@ class TestAlignmentEndpoints:
         # Verify task is deleted
         get_response = client.get(f"/alignment/{task_id}", headers=auth_headers)
         assert get_response.status_code == 404
+        assert storage.objects == {"other/corpus/1/1.wav": b"keep"}
     
     def test_delete_nonexistent_alignment_task(self, client, setup_database):
         """Test deleting non-existent alignment task"""
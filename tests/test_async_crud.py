@@ -0,0 +1,86 @@
+import pytest
+
+from api.database import to_async_url
+from api.domains.alignment.crud import (
+    create_alignment_task_async,
+    get_alignment_task_async,
+    get_alignment_tasks_async,
+    validate_models_same_language_async,
+)
+from api.domains.alignment.schemas import AlignmentQueueCreate, ModelParameter
+from api.domains.models.crud import create_language, create_mfa_model, get_mfa_models_async, count_mfa_models_async
+from api.domains.models.models import ModelType
+from api.domains.models.schemas import LanguageCreate, MFAModelCreate
+from api.domains.users.crud import UserService
+from tests.conftest import TestingAsyncSessionLocal
+
+
+@pytest.fixture
+def models(db_session):
+    russian = create_language(db_session, LanguageCreate(code="ru", name="Russian"))
+    english = create_language(db_session, LanguageCreate(code="en", name="English"))
+    for name, model_type, language in [
+        ("russian_mfa", ModelType.ACOUSTIC, russian),
+        ("russian_mfa", ModelType.DICTIONARY, russian),
+        ("english_us_arpa_acoustic", ModelType.ACOUSTIC, english),
+    ]:
+        create_mfa_model(db_session, MFAModelCreate(
+            name=name, model_type=model_type, version="3.1.0", language_id=language.id
+        ))
+    return russian, english
+
+
+class TestAsyncCrud:
+
+    def test_to_async_url(self):
+        """Test that sync drivers are mapped to their asyncio drivers"""
+        assert to_async_url("mysql+pymysql://user:secret@db:3306/align") == "mysql+aiomysql://user:secret@db:3306/align"
+        assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+    @pytest.mark.asyncio
+    async def test_validate_models(self, models):
+        """Test model validation, including the type-suffixed name fallback"""
+        russian, _ = models
+        async with TestingAsyncSessionLocal() as db:
+            assert await validate_models_same_language_async(
+                db, ModelParameter(name="russian_mfa", version="3.1.0"), ModelParameter(name="russian_mfa", version="3.1.0")
+            ) == (True, None, russian.id)
+
+            is_valid, error, _ = await validate_models_same_language_async(
+                db, ModelParameter(name="english_us_arpa", version="3.1.0"), ModelParameter(name="russian_mfa", version="3.1.0")
+            )
+            assert not is_valid
+            assert error == "Acoustic and dictionary models must be for the same language"
+
+    @pytest.mark.asyncio
+    async def test_models_load_language(self, models):
+        """Test that listed models come with their language loaded"""
+        async with TestingAsyncSessionLocal() as db:
+            listed = await get_mfa_models_async(db, language_code="ru")
+            assert await count_mfa_models_async(db) == 3
+
+        assert {model.language.code for model in listed} == {"ru"}
+
+    @pytest.mark.asyncio
+    async def test_alignment_tasks(self, test_user):
+        """Test creating and reading tasks through an async session"""
+        task = AlignmentQueueCreate(
+            original_audio_filename="a.wav", original_text_filename="a.txt",
+            acoustic_model=ModelParameter(name="russian_mfa", version="3.1.0"),
+            dictionary_model=ModelParameter(name="russian_mfa", version="3.1.0"),
+        )
+        async with TestingAsyncSessionLocal() as db:
+            created = await create_alignment_task_async(db, task, "a.wav", "a.txt", test_user.id)
+
+            assert (await get_alignment_task_async(db, created.id, user_id=test_user.id)).id == created.id
+            assert await get_alignment_task_async(db, created.id, user_id=test_user.id + 1) is None
+            assert [t.id for t in await get_alignment_tasks_async(db, user_id=test_user.id)] == [created.id]
+
+    @pytest.mark.asyncio
+    async def test_user_quota(self, test_user):
+        """Test that the quota is built from the eagerly loaded subscription"""
+        async with TestingAsyncSessionLocal() as db:
+            quota = await UserService.get_user_quota_async(db, test_user.id)
+
+        assert quota.total_storage_limit == 100 * 1024 * 1024
+        assert quota.subscription_type == "Free Plan"
@@ -0,0 +1,167 @@
+import io
+import wave
+import pytest
+
+from api.domains.alignment.audio import store_corpus_audio, read_audio_segment
+from api.domains.alignment.crud import create_alignment_task
+from api.domains.alignment.models import CorpusFile
+from api.domains.alignment.paths import corpus_file_path
+from api.domains.alignment.schemas import AlignmentQueueCreate, ModelParameter
+from shared.audio.seek_index import (
+    SeekIndex,
+    SeekIndexError,
+    build_seek_index,
+    build_wav_seek_index,
+    build_mp3_seek_index,
+    seek_index_path_for,
+)
+
+MP3_FRAME_HEADER = b"\xff\xfb\x90\x00"  # MPEG 1 Layer III, 128 kbps, 44.1 kHz
+MP3_FRAME_LENGTH = 417
+MP3_FRAME_DURATION = 1152 / 44100
+
+
+def make_wav(seconds: float, sample_rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x01\x00" * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+def make_mp3(frame_count: int) -> bytes:
+    id3 = b"ID3\x03\x00\x00\x00\x00\x00\x14" + b"\x00" * 20
+    frame = MP3_FRAME_HEADER + b"\x00" * (MP3_FRAME_LENGTH - 4)
+    return id3 + frame * frame_count
+
+
+
+def add_corpus_file(db, task, corpus_file_id, audio_filename=None, text_filename=None):
+    """Add a corpus file to a task created without one, under a known id"""
+    corpus_file = CorpusFile(
+        id=corpus_file_id, task_id=task.id,
+        original_audio_filename=audio_filename or task.original_audio_filename,
+        original_text_filename=text_filename or task.original_text_filename
+    )
+    db.add(corpus_file)
+    db.commit()
+    return corpus_file
+
+class TestSeekIndex:
+
+    def test_wav_byte_range(self):
+        """Test time to byte mapping for PCM WAV"""
+        data = make_wav(10)
+        index = build_wav_seek_index(data[:1024], len(data))
+
+        assert index.duration == pytest.approx(10)
+        offset, length, start, end = index.byte_range(2.0, 3.5)
+        assert offset == 44 + 2 * 32000
+        assert length == int(1.5 * 32000)
+        assert (start, end) == (pytest.approx(2.0), pytest.approx(3.5))
+
+    def test_wav_segment_is_playable(self):
+        """Test that the segment prefix makes a valid WAV file"""
+        data = make_wav(5)
+        index = build_seek_index(data, "wav")
+        offset, length, _, _ = index.byte_range(1.0, 2.0)
+        segment = index.segment_prefix(length) + data[offset:offset + length]
+
+        with wave.open(io.BytesIO(segment)) as wav:
+            assert wav.getframerate() == 16000
+            assert wav.getnframes() == 16000
+
+    def test_mp3_frame_index(self):
+        """Test that MP3 frames are indexed after the ID3 tag"""
+        data = make_mp3(500)
+        index = build_mp3_seek_index(data, frame_stride=8)
+
+        assert index.data_offset == 30
+        assert index.duration == pytest.approx(500 * MP3_FRAME_DURATION)
+        assert len(index.frame_offsets) == 63
+        assert index.frame_offsets[1] == 30 + 8 * MP3_FRAME_LENGTH
+
+    def test_mp3_byte_range_is_frame_aligned(self):
+        """Test that MP3 ranges start and end on frame boundaries"""
+        index = build_mp3_seek_index(make_mp3(500), frame_stride=8)
+        offset, length, start, end = index.byte_range(3.0, 4.0)
+
+        assert (offset - 30) % MP3_FRAME_LENGTH == 0
+        assert length % MP3_FRAME_LENGTH == 0
+        assert start <= 3.0 and end >= 4.0
+
+    def test_json_round_trip(self):
+        """Test that stored indexes restore identically"""
+        for index in (build_seek_index(make_wav(1), "wav"), build_seek_index(make_mp3(20), "mp3")):
+            restored = SeekIndex.from_json(index.to_json())
+            assert restored.to_dict() == index.to_dict()
+
+    def test_invalid_audio(self):
+        """Test that unsupported data is rejected"""
+        with pytest.raises(SeekIndexError):
+            build_seek_index(b"fake audio content", "wav")
+        with pytest.raises(SeekIndexError):
+            build_seek_index(b"fake audio content", "mp3")
+        with pytest.raises(SeekIndexError):
+            build_seek_index(b"fake audio content", "ogg")
+
+
+class TestAudioSegmentEndpoint:
+
+    @pytest.fixture
+    def task(self, db_session, test_user):
+        task = create_alignment_task(db_session, AlignmentQueueCreate(
+            original_audio_filename="speech.wav",
+            original_text_filename="speech.txt",
+            acoustic_model=ModelParameter(name="test_acoustic", version="1.0.0"),
+            dictionary_model=ModelParameter(name="test_dictionary", version="1.0.0")
+        ), "audio.wav", "text.txt", test_user.id)
+        add_corpus_file(db_session, task, 1)
+        return task
+
+    def test_segment_reads_only_requested_bytes(self, client, storage, task, auth_headers):
+        """Test that a short segment of a long file is served from a ranged read"""
+        audio_path = corpus_file_path(task.user_id, task.id, 1, "wav")
+        store_corpus_audio(storage, audio_path, make_wav(120), "wav")
+        storage.bytes_read = 0
+
+        response = client.get(
+            f"/alignment/{task.id}/audio/1/segment?start=10&end=13",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/wav"
+        with wave.open(io.BytesIO(response.content)) as wav:
+            assert wav.getnframes() == 3 * 16000
+        assert storage.bytes_read < 3 * 32000 + 1024
+
+    def test_segment_builds_missing_index(self, storage):
+        """Test that audio stored without an index gets one on first request"""
+        audio_path = "1/corpus/1/1.wav"
+        storage.objects[audio_path] = make_wav(30)
+
+        segment = read_audio_segment(storage, audio_path, "wav", 1.0, 2.0)
+
+        assert segment.media_type == "audio/wav"
+        assert seek_index_path_for(audio_path) in storage.objects
+
+    def test_segment_invalid_range(self, client, storage, task, auth_headers):
+        """Test that invalid time ranges are rejected"""
+        response = client.get(f"/alignment/{task.id}/audio/1/segment?start=5&end=2", headers=auth_headers)
+        assert response.status_code == 400
+
+        response = client.get(f"/alignment/{task.id}/audio/1/segment?start=0&end=1000", headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_segment_missing_audio(self, client, storage, task, auth_headers):
+        """Test 404 when the corpus file doesn't exist"""
+        response = client.get(f"/alignment/{task.id}/audio/99/segment?start=0&end=1", headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_segment_other_user_task(self, client, storage, auth_headers):
+        """Test 404 for tasks that don't exist or belong to another user"""
+        response = client.get("/alignment/12345/audio/1/segment?start=0&end=1", headers=auth_headers)
+        assert response.status_code == 404
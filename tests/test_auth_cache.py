@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy import update
+
+from api.cache import TTLCache
+from api.domains.auth.cache import invalidate_users, token_cache, user_cache
+from api.domains.auth.security import create_access_token
+from api.domains.users.crud import UserService
+from api.domains.users.models import SubscriptionType, User
+
+
+class TestAuthCache:
+
+    @pytest.fixture
+    def login_headers(self, test_user):
+        token = create_access_token(data={"sub": test_user.username, "user_id": test_user.id})
+        return {"Authorization": f"Bearer {token}"}
+
+    def _count_user_queries(self, monkeypatch):
+        calls = []
+        for name in ("get_user_by_id_async", "get_user_by_username_async"):
+            original = getattr(UserService, name)
+
+            async def counted(*args, _original=original, **kwargs):
+                calls.append(1)
+                return await _original(*args, **kwargs)
+            monkeypatch.setattr(UserService, name, staticmethod(counted))
+        return calls
+
+    def test_repeated_requests_hit_cache(self, client, login_headers, monkeypatch):
+        """Test that only the first request loads the user from the database"""
+        calls = self._count_user_queries(monkeypatch)
+
+        for _ in range(5):
+            assert client.get("/alignment/", headers=login_headers).status_code == 200
+
+        assert len(calls) == 1
+
+    def test_token_without_user_id(self, client, auth_headers, monkeypatch):
+        """Test that legacy tokens are resolved by username once, then by id"""
+        calls = self._count_user_queries(monkeypatch)
+
+        for _ in range(3):
+            assert client.get("/alignment/", headers=auth_headers).status_code == 200
+
+        assert len(calls) == 1
+
+    def test_deactivation_invalidates_snapshot(self, client, db_session, test_user, login_headers):
+        """Test that a deactivated user is rejected on the next request"""
+        assert client.get("/users/quota", headers=login_headers).status_code == 200
+
+        test_user.is_active = False
+        db_session.commit()
+
+        response = client.get("/users/quota", headers=login_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Inactive user"
+
+    def test_bulk_deactivation_invalidates_snapshot(self, client, db_session, test_user, login_headers):
+        """Test that a user deactivated by a bulk statement is rejected once invalidated"""
+        assert client.get("/users/quota", headers=login_headers).status_code == 200
+
+        db_session.execute(update(User).where(User.id == test_user.id).values(is_active=False))
+        db_session.commit()
+        # Bulk statements bypass the ORM events
+        assert user_cache.get(test_user.id) is not None
+        invalidate_users([test_user.id])
+
+        response = client.get("/users/quota", headers=login_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Inactive user"
+
+    def test_storage_accounting_keeps_snapshot(self, client, db_session, test_user, login_headers):
+        """Test that storage accounting, which snapshots don't carry, leaves them cached"""
+        client.get("/users/quota", headers=login_headers)
+
+        UserService.reserve_storage(db_session, test_user.id, 100)
+
+        assert user_cache.get(test_user.id) is not None
+
+    def test_subscription_change_invalidates_snapshots(self, client, db_session, test_user, login_headers):
+        """Test that updated plan limits are not served from stale snapshots"""
+        client.get("/users/quota", headers=login_headers)
+        assert user_cache.get(test_user.id).max_concurrent_tasks == 1
+
+        db_session.query(SubscriptionType).filter_by(name="free").one().max_concurrent_tasks = 5
+        db_session.commit()
+
+        assert user_cache.get(test_user.id) is None
+
+    def test_invalid_token_not_cached(self, client, db_session):
+        """Test that rejected tokens are neither accepted nor cached"""
+        response = client.get("/users/quota", headers={"Authorization": "Bearer not-a-token"})
+
+        assert response.status_code == 401
+        assert len(token_cache) == 0
+
+    def test_claims_expire_with_token(self):
+        """Test that claims are not cached beyond the token's expiry"""
+        clock = [0.0]
+        cache = TTLCache(maxsize=2, ttl=300, clock=lambda: clock[0])
+        cache.set("token", {"sub": "user"}, ttl=10)
+
+        clock[0] = 9
+        assert cache.get("token") == {"sub": "user"}
+        clock[0] = 10
+        assert cache.get("token") is None
+
+        cache.set("expired", {"sub": "user"}, ttl=-1)
+        assert cache.get("expired") is None
+
+    def test_cache_is_bounded(self):
+        """Test that least recently used entries are evicted"""
+        cache = TTLCache(maxsize=2, ttl=300)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from api.domains.models.crud import start_catalog_refresh
+from api.domains.models.models import CatalogRefresh, RefreshStatus
+from workers.catalog import refresh_catalog
+
+UPDATE_MODELS = 'api.domains.models.services.mfa_service.MFAModelService.update_models_from_github'
+
+
+class TestCatalogRefresh:
+    """Test cases for the background catalog refresh"""
+
+    def test_refresh_started_by_api(self, db_session):
+        """Test that the worker runs a pending refresh and records its outcome"""
+        refresh, _ = start_catalog_refresh(db_session)
+
+        with patch(UPDATE_MODELS, AsyncMock(return_value=(25, 5))):
+            finished = refresh_catalog(db_session, refresh.id)
+
+        assert finished.status == RefreshStatus.COMPLETED
+        assert (finished.updated_models, finished.updated_languages) == (25, 5)
+        assert finished.active is None
+        assert finished.finished_at is not None
+
+    def test_redelivered_refresh_runs_once(self, db_session):
+        """Test that a refresh message delivered twice syncs the catalog once"""
+        refresh, _ = start_catalog_refresh(db_session)
+
+        with patch(UPDATE_MODELS, AsyncMock(return_value=(1, 1))) as update:
+            refresh_catalog(db_session, refresh.id)
+            assert refresh_catalog(db_session, refresh.id) is None
+
+        update.assert_awaited_once()
+
+    def test_failed_refresh(self, db_session):
+        """Test that a failing sync marks the refresh failed and frees the slot"""
+        refresh, _ = start_catalog_refresh(db_session)
+
+        with patch(UPDATE_MODELS, AsyncMock(side_effect=RuntimeError("git pull failed"))):
+            finished = refresh_catalog(db_session, refresh.id)
+
+        assert finished.status == RefreshStatus.FAILED
+        assert finished.error_message == "git pull failed"
+        assert start_catalog_refresh(db_session)[1] is True
+
+    def test_scheduled_refresh_skips_active(self, db_session):
+        """Test that a scheduled refresh is skipped while another one is active"""
+        start_catalog_refresh(db_session)
+
+        with patch(UPDATE_MODELS, AsyncMock(return_value=(0, 0))) as update:
+            assert refresh_catalog(db_session) is None
+
+        update.assert_not_awaited()
+
+    def test_scheduled_refresh(self, db_session):
+        """Test that a scheduled refresh creates and runs its own job"""
+        with patch(UPDATE_MODELS, AsyncMock(return_value=(3, 1))):
+            finished = refresh_catalog(db_session)
+
+        assert finished.status == RefreshStatus.COMPLETED
+        assert db_session.query(CatalogRefresh).count() == 1
+
+    def test_lost_refresh_expires(self, db_session):
+        """Test that a refresh whose worker died doesn't block refreshes forever"""
+        lost, _ = start_catalog_refresh(db_session)
+        lost.created_at = datetime.utcnow() - timedelta(hours=1)
+        db_session.commit()
+
+        refresh, created = start_catalog_refresh(db_session)
+
+        assert created
+        db_session.refresh(lost)
+        assert lost.status == RefreshStatus.FAILED
+        assert lost.error_message == "Refresh timed out"
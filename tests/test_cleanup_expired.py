@@ -0,0 +1,178 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+
+from api.domains.users.crud import UserService
+from api.domains.users.models import FileStorageMetadata, FileType, User
+from api.domains.users.schemas import UserCreate
+from cleanup.cleanup_expired import ExpiredFileCleanup, RateLimiter, object_paths
+from shared.audio import seek_index_path_for
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+class TestExpiredFileCleanup:
+
+    @pytest.fixture
+    def users(self, db_session, test_user):
+        other_user = UserService.create_user(db_session, UserCreate(
+            username="otheruser",
+            email="other@example.com",
+            password="otherpassword123"
+        ))
+        test_user.used_storage = 1000
+        other_user.used_storage = 50
+        db_session.commit()
+        return test_user.id, other_user.id
+
+    @pytest.fixture
+    def files(self, db_session, storage, users):
+        """Five expired files, one live file and one without expiry"""
+        user_id, other_id = users
+        rows = [
+            (user_id, NOW - timedelta(days=3), 100),
+            (user_id, NOW - timedelta(days=2), 200),
+            (other_id, NOW - timedelta(days=2), 30),
+            (user_id, NOW - timedelta(days=1), 300),
+            (other_id, NOW - timedelta(minutes=1), 40),
+            (user_id, NOW + timedelta(days=1), 10),
+            (user_id, None, 10),
+        ]
+        for i, (owner_id, expires_at, size) in enumerate(rows):
+            path = f"{owner_id}/corpus/1/{i}.wav"
+            storage.objects[path] = b"x" * size
+            db_session.add(FileStorageMetadata(
+                user_id=owner_id, file_type=FileType.AUDIO, original_filename=f"{i}.wav",
+                storage_path=path, file_size=size, expires_at=expires_at
+            ))
+        db_session.commit()
+        return rows
+
+    def _used_storage(self, db_session, user_id):
+        return db_session.query(User.used_storage).filter(User.id == user_id).scalar()
+
+    def test_cleanup_deletes_expired_files(self, db_session, storage, users, files, tmp_path):
+        """Test that expired objects, metadata and quota usage are cleaned up"""
+        user_id, other_id = users
+        cleanup = ExpiredFileCleanup(db_session, storage, batch_size=2,
+                                     checkpoint_path=str(tmp_path / "checkpoint.json"))
+
+        stats = cleanup.run(now=NOW)
+
+        assert stats.deleted_files == 5
+        assert stats.freed_bytes == 670
+        assert stats.batches == 3
+        assert sorted(storage.objects) == [f"{user_id}/corpus/1/5.wav", f"{user_id}/corpus/1/6.wav"]
+        assert db_session.query(FileStorageMetadata).count() == 2
+        assert self._used_storage(db_session, user_id) == 400
+        # Usage never goes below zero
+        assert self._used_storage(db_session, other_id) == 0
+        assert not (tmp_path / "checkpoint.json").exists()
+
+    def test_dry_run(self, db_session, storage, users, files, tmp_path):
+        """Test that a dry run reports files without deleting anything"""
+        user_id, _ = users
+        cleanup = ExpiredFileCleanup(db_session, storage, batch_size=2, dry_run=True,
+                                     checkpoint_path=str(tmp_path / "checkpoint.json"))
+
+        stats = cleanup.run(now=NOW)
+
+        assert stats.would_delete_files == 5
+        assert stats.would_free_bytes == 670
+        assert stats.deleted_files == 0
+        assert stats.freed_bytes == 0
+        assert len(storage.objects) == 7
+        assert db_session.query(FileStorageMetadata).count() == 7
+        assert self._used_storage(db_session, user_id) == 1000
+        assert not (tmp_path / "checkpoint.json").exists()
+
+    def test_resume_from_checkpoint(self, db_session, storage, users, files, tmp_path):
+        """Test that an interrupted run continues after the last processed id"""
+        second = UserService.get_expired_files(db_session, now=NOW, limit=2)[-1]
+        checkpoint = tmp_path / "checkpoint.json"
+        checkpoint.write_text(json.dumps({
+            "cutoff": NOW.isoformat(),
+            "last_expires_at": second.expires_at.isoformat(),
+            "last_id": second.id,
+            "stats": {"scanned": 2, "deleted_files": 2, "freed_bytes": 300, "failed_files": 0, "batches": 1}
+        }))
+
+        stats = ExpiredFileCleanup(db_session, storage, checkpoint_path=str(checkpoint)).run()
+
+        assert stats.deleted_files == 5
+        assert stats.freed_bytes == 670
+        # Rows before the checkpoint are left for the next run
+        assert db_session.query(FileStorageMetadata).count() == 4
+
+    def test_failed_deletes_keep_metadata(self, db_session, storage, users, files, tmp_path):
+        """Test that rows are kept when their objects could not be deleted"""
+        user_id, _ = users
+        stuck_path = f"{user_id}/corpus/1/0.wav"
+        delete_file = storage.delete_file
+        storage.delete_file = lambda path: False if path == stuck_path else delete_file(path)
+
+        stats = ExpiredFileCleanup(db_session, storage, checkpoint_path=None).run(now=NOW)
+
+        assert stats.deleted_files == 4
+        assert stats.failed_files == 1
+        assert db_session.query(FileStorageMetadata).filter_by(storage_path=stuck_path).count() == 1
+        assert self._used_storage(db_session, user_id) == 500
+
+    def test_derived_objects_are_deleted(self, db_session, storage, users, tmp_path):
+        """Test that seek indexes, columnar results and word indexes go with their files"""
+        user_id, _ = users
+        for file_type, path, expires_at in [
+            (FileType.AUDIO, f"{user_id}/corpus/1/a.wav", NOW - timedelta(days=1)),
+            (FileType.RESULT, f"{user_id}/results/1/a.json", NOW - timedelta(days=1)),
+            (FileType.RESULT, f"{user_id}/results/2/b.json", NOW + timedelta(days=1)),
+        ]:
+            for object_path in object_paths(FileStorageMetadata(file_type=file_type, storage_path=path)):
+                storage.objects[object_path] = b"x"
+            db_session.add(FileStorageMetadata(
+                user_id=user_id, file_type=file_type, original_filename=path.rsplit("/", 1)[-1],
+                storage_path=path, file_size=1, expires_at=expires_at
+            ))
+        db_session.commit()
+        assert len(storage.objects) == 8
+        acquired = []
+        limiter = RateLimiter(0)
+        limiter.acquire = acquired.append
+
+        stats = ExpiredFileCleanup(db_session, storage, checkpoint_path=None, rate_limiter=limiter).run(now=NOW)
+
+        assert stats.deleted_files == 2
+        # Derived objects count against the deletion rate
+        assert acquired == [5]
+        assert sorted(storage.objects) == [
+            f"{user_id}/results/2/b.alnc", f"{user_id}/results/2/b.json", f"{user_id}/results/2/b.words"
+        ]
+
+    def test_failed_derived_delete_keeps_metadata(self, db_session, storage, users, files, tmp_path):
+        """Test that a row is kept while an object derived from it still exists"""
+        user_id, _ = users
+        stuck_path = seek_index_path_for(f"{user_id}/corpus/1/0.wav")
+        storage.objects[stuck_path] = b"{}"
+        delete_file = storage.delete_file
+        storage.delete_file = lambda path: False if path == stuck_path else delete_file(path)
+
+        stats = ExpiredFileCleanup(db_session, storage, checkpoint_path=None).run(now=NOW)
+
+        assert stats.deleted_files == 4
+        assert stats.failed_files == 1
+        assert db_session.query(FileStorageMetadata).filter_by(storage_path=f"{user_id}/corpus/1/0.wav").count() == 1
+
+    def test_rate_limiter(self):
+        """Test that deletions are spread out to the configured rate"""
+        clock = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        limiter = RateLimiter(100, clock=lambda: clock[0], sleep=sleep)
+        limiter.acquire(100)
+        limiter.acquire(50)
+        limiter.acquire(50)
+
+        assert sleeps == [pytest.approx(1.0), pytest.approx(0.5)]
@@ -0,0 +1,190 @@
+import json
+import pytest
+
+from shared.results.columnar import (
+    ColumnarAlignment,
+    ColumnarFormatError,
+    HEADER_SIZE,
+    encode_alignment_result,
+    parse_header,
+    read_columnar_words,
+    columnar_path_for,
+)
+from shared.results.store import save_alignment_result
+from shared.results.word_index import WordIndex, word_index_path_for
+
+
+SAMPLE_RESULT = {
+    "start": 0.0,
+    "end": 2.5,
+    "tiers": {
+        "words": {
+            "type": "interval",
+            "entries": [
+                [0.1, 0.5, "привет"],
+                [0.6, 1.0, "мир"],
+                [1.2, 1.6, "привет"],
+            ]
+        },
+        "phones": {
+            "type": "interval",
+            "entries": [
+                [0.1, 0.2, "p"], [0.2, 0.35, "rʲ"], [0.35, 0.5, "i"],
+                [0.5, 0.6, "sil"],
+                [0.6, 0.8, "mʲ"], [0.8, 1.0, "i"],
+                [1.2, 1.3, "p"], [1.3, 1.6, "rʲ"],
+            ]
+        }
+    }
+}
+
+
+class TestColumnarResults:
+
+    def test_round_trip(self):
+        """Test that encoding and decoding preserves intervals and labels"""
+        alignment = ColumnarAlignment(encode_alignment_result(SAMPLE_RESULT))
+
+        assert alignment.word_count == 3
+        assert alignment.phone_count == 8
+        assert alignment.end == 2.5
+
+        start, end, label = alignment.word(1)
+        assert label == "мир"
+        assert start == pytest.approx(0.6)
+        assert end == pytest.approx(1.0)
+
+        restored = alignment.to_dict()
+        assert [entry[2] for entry in restored["tiers"]["phones"]["entries"]] == \
+            [entry[2] for entry in SAMPLE_RESULT["tiers"]["phones"]["entries"]]
+
+    def test_labels_are_interned(self):
+        """Test that repeated labels are stored once"""
+        alignment = ColumnarAlignment(encode_alignment_result(SAMPLE_RESULT))
+
+        assert len(alignment.word_labels) == 2
+        assert len(alignment.phone_labels) == 5
+        assert alignment.word_labels.id_of("привет") == alignment.word_label_ids[2]
+        assert alignment.word_labels.id_of("unknown") is None
+
+    def test_word_to_phone_offsets(self):
+        """Test that words map to the phones inside them, skipping silence"""
+        alignment = ColumnarAlignment(encode_alignment_result(SAMPLE_RESULT))
+
+        assert [phone[2] for phone in alignment.phones_for_word(0)] == ["p", "rʲ", "i"]
+        assert [phone[2] for phone in alignment.phones_for_word(1)] == ["mʲ", "i"]
+        assert [phone[2] for phone in alignment.phones_for_word(2)] == ["p", "rʲ"]
+
+    def test_words_between(self):
+        """Test time range lookup of words"""
+        alignment = ColumnarAlignment(encode_alignment_result(SAMPLE_RESULT))
+
+        assert list(alignment.words_between(0.55, 1.3)) == [1, 2]
+        assert list(alignment.words_between(2.0, 2.5)) == []
+
+    def test_speaker_tiers(self):
+        """Test that each speaker keeps its own words and phones"""
+        result = {
+            "start": 0,
+            "end": 2,
+            "tiers": {
+                "b - words": {"type": "interval", "entries": [[1.0, 1.5, "two"]]},
+                "a - words": {"type": "interval", "entries": [[0.0, 0.5, "one"]]},
+                "a - phones": {"type": "interval", "entries": [[0.0, 0.5, "w"]]},
+                "b - phones": {"type": "interval", "entries": [[1.0, 1.5, "t"]]},
+            }
+        }
+        alignment = ColumnarAlignment(encode_alignment_result(result))
+
+        assert [alignment.word(i)[2] for i in range(alignment.word_count)] == ["one", "two"]
+        assert alignment.speaker_of_word(1) == "b"
+        assert alignment.phones_for_word(1)[0][2] == "t"
+        assert set(alignment.to_dict()["tiers"]) == {"a - words", "a - phones", "b - words", "b - phones"}
+
+    def test_overlapping_speakers(self):
+        """Test that overlapping speech keeps phone ranges and time lookups per speaker"""
+        result = {
+            "start": 0,
+            "end": 3,
+            "tiers": {
+                "a - words": {"type": "interval", "entries": [[0.0, 2.0, "long"], [2.0, 2.5, "end"]]},
+                "a - phones": {"type": "interval", "entries": [[0.0, 1.0, "l"], [1.0, 2.0, "o"], [2.0, 2.5, "e"]]},
+                "b - words": {"type": "interval", "entries": [[0.5, 1.0, "hi"]]},
+                "b - phones": {"type": "interval", "entries": [[0.5, 0.7, "h"], [0.7, 1.0, "i"]]},
+            }
+        }
+        alignment = ColumnarAlignment(encode_alignment_result(result))
+        labels = [alignment.word(i)[2] for i in range(alignment.word_count)]
+
+        long_index, hi_index = labels.index("long"), labels.index("hi")
+        assert [phone[2] for phone in alignment.phones_for_word(long_index)] == ["l", "o"]
+        assert [phone[2] for phone in alignment.phones_for_word(hi_index)] == ["h", "i"]
+        assert [alignment.word(i)[2] for i in alignment.words_between(1.5, 2.2)] == ["long", "end"]
+        assert [alignment.word(i)[2] for i in alignment.words_between(0.6, 0.8)] == ["long", "hi"]
+
+    def test_header_is_enough_to_locate_sections(self):
+        """Test that the header alone describes section byte ranges"""
+        data = encode_alignment_result(SAMPLE_RESULT)
+        header = parse_header(data[:HEADER_SIZE])
+
+        offset, length = header["sections"]["word_starts"]
+        assert offset % 8 == 0
+        assert length == header["word_count"] * 4
+
+    def test_invalid_buffer(self):
+        """Test that garbage input is rejected"""
+        with pytest.raises(ColumnarFormatError):
+            ColumnarAlignment(b"not a columnar result" * 20)
+        with pytest.raises(ColumnarFormatError):
+            parse_header(b"short")
+
+    def test_smaller_than_json(self):
+        """Test that the columnar form is smaller than JSON for long results"""
+        words = [[i * 0.5, i * 0.5 + 0.4, f"word{i % 50}"] for i in range(5000)]
+        phones = [[i * 0.1, i * 0.1 + 0.1, f"ph{i % 40}"] for i in range(25000)]
+        result = {"start": 0, "end": 2500, "tiers": {
+            "words": {"type": "interval", "entries": words},
+            "phones": {"type": "interval", "entries": phones},
+        }}
+
+        json_size = len(json.dumps(result).encode("utf-8"))
+        assert len(encode_alignment_result(result)) * 2 < json_size
+
+    def test_read_words_with_ranged_reads(self, storage):
+        """Test that words are read from storage without downloading phones"""
+        data = encode_alignment_result(SAMPLE_RESULT)
+        storage.objects["1/results/1/1.alnc"] = data
+
+        words = read_columnar_words(storage, "1/results/1/1.alnc")
+
+        assert [word[2] for word in words] == ["привет", "мир", "привет"]
+        assert words[1][0] == pytest.approx(0.6)
+        sections = parse_header(data)["sections"]
+        word_arrays = sum(sections["word_labels"]) - sections["word_starts"][0]
+        assert storage.bytes_read == HEADER_SIZE + word_arrays + sections["word_label_table"][1]
+        assert storage.bytes_read < sections["phone_starts"][0]
+
+    def test_read_words_of_missing_result(self, storage):
+        """Test that a missing columnar result reads as None"""
+        assert read_columnar_words(storage, "1/results/1/1.alnc") is None
+
+    def test_read_words_of_truncated_result(self, storage):
+        """Test that a truncated columnar result is rejected"""
+        storage.objects["1/results/1/1.alnc"] = encode_alignment_result(SAMPLE_RESULT)[:HEADER_SIZE + 8]
+
+        with pytest.raises(ColumnarFormatError):
+            read_columnar_words(storage, "1/results/1/1.alnc")
+
+    def test_save_alignment_result(self):
+        """Test that JSON, columnar and word index objects are stored side by side"""
+        stored = {}
+
+        class MockStorage:
+            def upload_file(self, file_path, file_data, file_size, content_type='application/octet-stream'):
+                stored[file_path] = file_data.read()
+                return True
+
+        assert save_alignment_result(MockStorage(), "1/results/2/3.json", SAMPLE_RESULT) == True
+        assert json.loads(stored["1/results/2/3.json"]) == SAMPLE_RESULT
+        assert ColumnarAlignment(stored[columnar_path_for("1/results/2/3.json")]).word_count == 3
+        assert WordIndex(stored[word_index_path_for("1/results/2/3.json")]).lookup("мир") != []
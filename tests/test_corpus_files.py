@@ -0,0 +1,248 @@
+import pytest
+
+import workers.alignment
+import workers.tasks
+from api.domains.alignment.crud import start_alignment_task
+from api.domains.alignment.models import AlignmentQueue, AlignmentStatus, CorpusFile
+from api.domains.alignment.paths import corpus_file_path, result_file_path
+from api.domains.models.crud import create_language, create_mfa_model
+from api.domains.models.models import ModelType
+from api.domains.models.schemas import LanguageCreate, MFAModelCreate
+from api.domains.users.models import FileStorageMetadata, SubscriptionType, User
+from shared.audio.seek_index import seek_index_path_for
+from tests.test_audio_segments import make_wav
+from tests.test_word_playback import RESULT
+
+MODEL_FIELDS = {
+    "acoustic_model_name": "russian_mfa", "acoustic_model_version": "3.1.0",
+    "dictionary_model_name": "russian_mfa", "dictionary_model_version": "3.1.0",
+}
+
+
+def corpus_upload(count):
+    return (
+        [("audio_files", (f"part_{i}.wav", b"a" * 10, "audio/wav")) for i in range(count)]
+        + [("text_files", (f"part_{i}.txt", b"text", "text/plain")) for i in range(count)]
+    )
+
+
+@pytest.fixture
+def models(db_session):
+    russian = create_language(db_session, LanguageCreate(code="ru", name="Russian"))
+    for model_type in (ModelType.ACOUSTIC, ModelType.DICTIONARY):
+        create_mfa_model(db_session, MFAModelCreate(
+            name="russian_mfa", model_type=model_type, version="3.1.0", language_id=russian.id
+        ))
+
+
+class FakeGroup:
+    published = []
+
+    def __init__(self, signatures):
+        self.signatures = list(signatures)
+
+    def apply_async(self):
+        FakeGroup.published.extend(self.signatures)
+
+
+class TestCorpusUpload:
+
+    def test_multi_file_corpus(self, client, db_session, test_user, auth_headers, models, storage):
+        """Test that N file pairs become one task with N corpus files at computed paths"""
+        response = client.post("/alignment/", data=MODEL_FIELDS, files=corpus_upload(3), headers=auth_headers)
+
+        assert response.status_code == 200
+        task = db_session.query(AlignmentQueue).one()
+        corpus_files = db_session.query(CorpusFile).order_by(CorpusFile.id).all()
+        assert [corpus_file.original_audio_filename for corpus_file in corpus_files] == [
+            "part_0.wav", "part_1.wav", "part_2.wav"
+        ]
+        for corpus_file in corpus_files:
+            assert corpus_file_path(test_user.id, task.id, corpus_file.id, "wav") in storage.objects
+            assert corpus_file_path(test_user.id, task.id, corpus_file.id, "txt") in storage.objects
+        assert response.json()["audio_file_path"] == corpus_file_path(test_user.id, task.id, corpus_files[0].id, "wav")
+        assert db_session.query(FileStorageMetadata).filter(FileStorageMetadata.task_id == task.id).count() == 6
+        assert db_session.query(User.used_storage).filter(User.id == test_user.id).scalar() == 3 * (10 + 4)
+
+    def test_task_is_enqueued(self, client, db_session, auth_headers, models, task_queue):
+        """Test that a created task is published under its Celery id"""
+        response = client.post("/alignment/", data=MODEL_FIELDS, files=corpus_upload(2), headers=auth_headers)
+
+        assert response.status_code == 200
+        task = db_session.query(AlignmentQueue).one()
+        assert task.celery_task_id and task.enqueued_at
+        assert task_queue.batches == [[(task.id, task.celery_task_id)]]
+
+    def test_broker_failure_leaves_task_for_republishing(self, client, db_session, auth_headers, models, task_queue):
+        """Test that a task whose enqueue failed is still created and left unpublished"""
+        task_queue.fail = True
+        response = client.post("/alignment/", data=MODEL_FIELDS, files=corpus_upload(1), headers=auth_headers)
+
+        assert response.status_code == 200
+        task = db_session.query(AlignmentQueue).one()
+        assert task.celery_task_id and task.enqueued_at is None
+
+    def test_uploaded_audio_is_indexed(self, client, db_session, test_user, auth_headers, models, storage):
+        """Test that uploaded audio is stored with its seek index and segments are served from it"""
+        files = [("audio_files", ("speech.wav", make_wav(60), "audio/wav")),
+                 ("text_files", ("speech.txt", b"text", "text/plain"))]
+        task_id = client.post("/alignment/", data=MODEL_FIELDS, files=files, headers=auth_headers).json()["id"]
+        corpus_file = db_session.query(CorpusFile).one()
+        audio_path = corpus_file_path(test_user.id, task_id, corpus_file.id, "wav")
+
+        assert seek_index_path_for(audio_path) in storage.objects
+        storage.bytes_read = 0
+        response = client.get(f"/alignment/{task_id}/audio/{corpus_file.id}/segment?start=10&end=11",
+                              headers=auth_headers)
+        assert response.status_code == 200
+        assert storage.bytes_read < 32000 + 1024
+
+    def test_list_corpus_files(self, client, auth_headers, models):
+        """Test that corpus files are listed with their status"""
+        task_id = client.post("/alignment/", data=MODEL_FIELDS, files=corpus_upload(2), headers=auth_headers).json()["id"]
+
+        response = client.get(f"/alignment/{task_id}/files", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert [(item["original_text_filename"], item["status"]) for item in response.json()] == [
+            ("part_0.txt", "pending"), ("part_1.txt", "pending")
+        ]
+        assert client.get("/alignment/999/files", headers=auth_headers).status_code == 404
+
+    def test_mismatched_files_rejected(self, client, db_session, auth_headers, models):
+        """Test that every audio file needs a text file"""
+        response = client.post("/alignment/", data=MODEL_FIELDS, files=corpus_upload(2)[:-1], headers=auth_headers)
+
+        assert response.status_code == 400
+        assert db_session.query(AlignmentQueue).count() == 0
+
+    def test_quota_exceeded_stores_nothing(self, client, db_session, test_user, auth_headers, models, storage):
+        """Test that a corpus over the quota leaves no task, rows or objects behind"""
+        db_session.query(SubscriptionType).update({SubscriptionType.total_storage_limit: 20})
+        db_session.commit()
+        uploads = []
+        storage.upload_file = lambda *args, **kwargs: uploads.append(args)
+
+        response = client.post("/alignment/", data=MODEL_FIELDS, files=corpus_upload(2), headers=auth_headers)
+
+        assert response.status_code == 413
+        assert db_session.query(AlignmentQueue).count() == 0
+        assert db_session.query(CorpusFile).count() == 0
+        # The quota is checked before anything is uploaded
+        assert uploads == []
+        assert db_session.query(User.reserved_storage).filter(User.id == test_user.id).scalar() == 0
+
+    def test_failed_upload_releases_reservation(self, client, db_session, test_user, auth_headers, models, storage):
+        """Test that space reserved for a corpus is given back when storing it fails"""
+        storage.upload_file = lambda *args, **kwargs: False
+
+        response = client.post("/alignment/", data=MODEL_FIELDS, files=corpus_upload(2), headers=auth_headers)
+
+        assert response.status_code == 500
+        assert db_session.query(AlignmentQueue).count() == 0
+        user = db_session.query(User).filter(User.id == test_user.id).one()
+        assert (user.used_storage, user.reserved_storage) == (0, 0)
+
+    def test_delete_releases_corpus(self, client, db_session, test_user, auth_headers, models, storage):
+        """Test that deleting a task removes its corpus files and releases their quota"""
+        task_id = client.post("/alignment/", data=MODEL_FIELDS, files=corpus_upload(2), headers=auth_headers).json()["id"]
+
+        assert client.delete(f"/alignment/{task_id}", headers=auth_headers).status_code == 200
+
+        db_session.expire_all()
+        assert db_session.query(CorpusFile).count() == 0
+        assert db_session.query(FileStorageMetadata).count() == 0
+        assert db_session.query(User.used_storage).filter(User.id == test_user.id).scalar() == 0
+        assert storage.objects == {}
+
+
+class TestCorpusProcessing:
+
+    @pytest.fixture
+    def task(self, client, auth_headers, db_session, models):
+        response = client.post("/alignment/", data=MODEL_FIELDS, files=corpus_upload(2), headers=auth_headers)
+        return db_session.get(AlignmentQueue, response.json()["id"])
+
+    def test_partial_results(self, client, db_session, storage, auth_headers, task, monkeypatch):
+        """Test that a file's result is available while the rest of the corpus is pending"""
+        monkeypatch.setattr(workers.alignment, "run_aligner", lambda audio_path, text_path, task: RESULT)
+        first, second = start_alignment_task(db_session, task.id)
+
+        assert workers.alignment.align_corpus_file(db_session, storage, first) == AlignmentStatus.COMPLETED
+
+        statuses = [item["status"] for item in client.get(f"/alignment/{task.id}/files", headers=auth_headers).json()]
+        assert statuses == ["completed", "pending"]
+        assert result_file_path(task.user_id, task.id, first) in storage.objects
+        assert client.get(f"/alignment/{task.id}/download/result/{first}", headers=auth_headers).status_code == 200
+        db_session.refresh(task)
+        assert task.status == AlignmentStatus.PROCESSING
+
+        workers.alignment.align_corpus_file(db_session, storage, second)
+        db_session.refresh(task)
+        assert task.status == AlignmentStatus.COMPLETED
+        assert task.error_message is None
+
+    def test_failed_file_doesnt_fail_corpus(self, db_session, storage, task, monkeypatch):
+        """Test that a failing file is recorded and the task completes with the others"""
+        def aligner(audio_path, text_path, task):
+            if audio_path.endswith(f"{second}.wav"):
+                raise RuntimeError("beam too narrow")
+            return RESULT
+        monkeypatch.setattr(workers.alignment, "run_aligner", aligner)
+        first, second = start_alignment_task(db_session, task.id)
+
+        workers.alignment.align_corpus_file(db_session, storage, first)
+        assert workers.alignment.align_corpus_file(db_session, storage, second) == AlignmentStatus.FAILED
+
+        db_session.refresh(task)
+        assert task.corpus_files[1].error_message == "beam too narrow"
+        assert task.status == AlignmentStatus.COMPLETED
+        assert task.error_message == "1 of 2 corpus files failed"
+
+    def test_all_files_failed(self, db_session, storage, task, monkeypatch):
+        """Test that a task fails when none of its files could be aligned"""
+        def aligner(audio_path, text_path, task):
+            raise RuntimeError("beam too narrow")
+        monkeypatch.setattr(workers.alignment, "run_aligner", aligner)
+        for corpus_file_id in start_alignment_task(db_session, task.id):
+            workers.alignment.align_corpus_file(db_session, storage, corpus_file_id)
+
+        db_session.refresh(task)
+        assert task.status == AlignmentStatus.FAILED
+        assert task.corpus_files[0].error_message == "beam too narrow"
+
+    def test_without_aligner_files_stay_pending(self, db_session, storage, task):
+        """Test that a missing aligner leaves files pending instead of failing them"""
+        first, _ = start_alignment_task(db_session, task.id)
+
+        assert workers.alignment.align_corpus_file(db_session, storage, first) == AlignmentStatus.PENDING
+
+        db_session.refresh(task)
+        assert task.corpus_files[0].error_message is None
+        assert task.status == AlignmentStatus.PROCESSING
+
+    def test_without_aligner_task_not_started(self, db_session, task):
+        """Test that tasks aren't started while no aligner is installed"""
+        assert workers.tasks.process_alignment_task.run(task.id)["status"] == "placeholder"
+
+        db_session.refresh(task)
+        assert task.status == AlignmentStatus.PENDING
+        assert {corpus_file.status for corpus_file in task.corpus_files} == {AlignmentStatus.PENDING}
+
+    def test_task_fans_out_per_file(self, db_session, task, monkeypatch):
+        """Test that the task is split into one Celery task per corpus file"""
+        import api.database
+        from tests.conftest import TestingSessionLocal
+        monkeypatch.setattr(api.database, "SessionLocal", TestingSessionLocal)
+        monkeypatch.setattr(workers.alignment, "ALIGNER_AVAILABLE", True)
+        monkeypatch.setattr(workers.tasks, "group", FakeGroup)
+        monkeypatch.setattr(FakeGroup, "published", [])
+
+        result = workers.tasks.process_alignment_task.run(task.id)
+
+        assert result["corpus_files"] == 2
+        assert [signature.args for signature in FakeGroup.published] == [
+            (task.id, corpus_file.id) for corpus_file in task.corpus_files
+        ]
+        db_session.refresh(task)
+        assert task.status == AlignmentStatus.PROCESSING
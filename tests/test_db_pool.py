@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from api.db_pool import PoolSettings, get_pool_metrics, render_prometheus, timed_pool_class
+
+
+class TestPoolSettings:
+
+    def test_role_defaults(self, monkeypatch):
+        """Test that workers get a smaller pool than API processes"""
+        for name in ("DB_POOL_SIZE", "DB_POOL_MAX_OVERFLOW", "API_DB_POOL_SIZE", "WORKER_DB_POOL_SIZE"):
+            monkeypatch.delenv(name, raising=False)
+
+        assert PoolSettings.from_env("api").size == 10
+        assert PoolSettings.from_env("worker").size == 2
+        assert PoolSettings.from_env("api").pre_ping
+
+    def test_role_overrides(self, monkeypatch):
+        """Test that role-specific variables take precedence"""
+        monkeypatch.setenv("DB_POOL_SIZE", "7")
+        monkeypatch.setenv("WORKER_DB_POOL_SIZE", "3")
+        monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+
+        assert PoolSettings.from_env("api").size == 7
+        assert PoolSettings.from_env("worker").size == 3
+        assert PoolSettings.from_env("worker").engine_options()["pool_recycle"] == 600
+
+
+class TestPoolMetrics:
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=timed_pool_class("test_pool"),
+            **PoolSettings(size=1, max_overflow=0, timeout=0.05).engine_options()
+        )
+        yield engine
+        engine.dispose()
+
+    def test_checkouts_and_timeouts(self, engine):
+        """Test that checkouts, in-use connections and timeouts are counted"""
+        metrics = get_pool_metrics("test_pool")
+        before = metrics.snapshot()
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert metrics.snapshot()["checked_out"] == 1
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+
+        after = metrics.snapshot()
+        assert after["checkouts"] - before["checkouts"] == 1
+        assert after["timeouts"] - before["timeouts"] == 1
+        assert after["checked_out"] == 0
+        assert after["size"] == 1
+
+    def test_metrics_survive_dispose(self, engine):
+        """Test that the replacement pool reports under the same name"""
+        engine.dispose()
+        with engine.connect():
+            assert get_pool_metrics("test_pool").snapshot()["checked_out"] == 1
+
+    def test_prometheus_endpoint(self, client, engine):
+        """Test that /metrics exposes the pool gauges"""
+        with engine.connect():
+            pass
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert 'db_pool_checkouts_total{pool="test_pool"}' in response.text
+        assert 'db_pool_checkout_wait_seconds_bucket{pool="test_pool",le="+Inf"}' in response.text
+        assert render_prometheus().startswith("# HELP")
@@ -0,0 +1,210 @@
+import io
+import zipfile
+import pytest
+
+from api.domains.alignment.audio import store_corpus_audio
+from api.domains.alignment.crud import create_alignment_task
+from api.domains.alignment.models import CorpusFile
+from api.domains.alignment.paths import corpus_file_path, result_file_path
+from api.domains.alignment.schemas import AlignmentQueueCreate, ModelParameter
+from api.streaming import parse_range_header, content_disposition, RangeNotSatisfiable
+from api.zipstream import ZipMember, iter_zip
+from tests.test_audio_segments import add_corpus_file, make_wav
+
+
+class TestRangeParsing:
+
+    def test_parse_range_header(self):
+        """Test supported single-range forms"""
+        assert parse_range_header("bytes=0-99", 1000) == (0, 99)
+        assert parse_range_header("bytes=900-", 1000) == (900, 999)
+        assert parse_range_header("bytes=-100", 1000) == (900, 999)
+        assert parse_range_header("bytes=990-2000", 1000) == (990, 999)
+
+    def test_ignored_ranges(self):
+        """Test that absent, multi-range and malformed headers serve the full file"""
+        assert parse_range_header(None, 1000) is None
+        assert parse_range_header("bytes=0-1,5-9", 1000) is None
+        assert parse_range_header("items=0-1", 1000) is None
+        assert parse_range_header("bytes=abc-", 1000) is None
+        assert parse_range_header("bytes=50-10", 1000) is None
+
+    def test_unsatisfiable_range(self):
+        """Test ranges that start beyond the end of the file"""
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header("bytes=1000-", 1000)
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header("bytes=-0", 1000)
+
+    def test_content_disposition_non_ascii(self):
+        """Test that non-ASCII filenames are encoded per RFC 6266"""
+        header = content_disposition("запись.wav")
+        assert "filename*=UTF-8''%D0%B7" in header
+        assert header.startswith('attachment; filename="')
+
+
+class TestDownloadEndpoints:
+
+    @pytest.fixture
+    def task(self, db_session, test_user, storage):
+        task = create_alignment_task(db_session, AlignmentQueueCreate(
+            original_audio_filename="speech.mp3",
+            original_text_filename="speech.txt",
+            acoustic_model=ModelParameter(name="test_acoustic", version="1.0.0"),
+            dictionary_model=ModelParameter(name="test_dictionary", version="1.0.0")
+        ), "audio.mp3", "text.txt", test_user.id)
+        add_corpus_file(db_session, task, 1)
+        storage.objects[corpus_file_path(task.user_id, task.id, 1, "mp3")] = bytes(range(256)) * 4096
+        storage.objects[corpus_file_path(task.user_id, task.id, 1, "txt")] = "привет мир".encode()
+        storage.objects[result_file_path(task.user_id, task.id, 1)] = b'{"tiers": {}}'
+        return task
+
+    def test_full_download(self, client, storage, task, auth_headers):
+        """Test that the whole file is streamed with range metadata"""
+        response = client.get(f"/alignment/{task.id}/download/audio/1", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-type"] == "audio/mpeg"
+        assert response.headers["content-length"] == str(256 * 4096)
+        assert "etag" in response.headers
+        assert len(response.content) == 256 * 4096
+
+    def test_range_download(self, client, storage, task, auth_headers):
+        """Test that only the requested range is read and returned"""
+        headers = {**auth_headers, "Range": "bytes=1000-1999"}
+        response = client.get(f"/alignment/{task.id}/download/audio/1", headers=headers)
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 1000-1999/{256 * 4096}"
+        assert response.content == (bytes(range(256)) * 8)[1000:2000]
+        assert storage.bytes_read == 1000
+
+    def test_if_range_mismatch_returns_full_file(self, client, storage, task, auth_headers):
+        """Test that a stale If-Range validator disables the range"""
+        headers = {**auth_headers, "Range": "bytes=0-9", "If-Range": '"stale-etag"'}
+        response = client.get(f"/alignment/{task.id}/download/audio/1", headers=headers)
+
+        assert response.status_code == 200
+        assert len(response.content) == 256 * 4096
+
+    def test_if_range_match(self, client, storage, task, auth_headers):
+        """Test that a matching If-Range validator keeps the range"""
+        etag = client.get(f"/alignment/{task.id}/download/text/1", headers=auth_headers).headers["etag"]
+        headers = {**auth_headers, "Range": "bytes=0-11", "If-Range": etag}
+        response = client.get(f"/alignment/{task.id}/download/text/1", headers=headers)
+
+        assert response.status_code == 206
+        assert response.content.decode() == "привет"
+
+    def test_unsatisfiable_range(self, client, storage, task, auth_headers):
+        """Test 416 for ranges beyond the end of the file"""
+        headers = {**auth_headers, "Range": "bytes=999999999-"}
+        response = client.get(f"/alignment/{task.id}/download/result/1", headers=headers)
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */13"
+
+    def test_result_download(self, client, storage, task, auth_headers):
+        """Test result download name and type"""
+        response = client.get(f"/alignment/{task.id}/download/result/1", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"tiers": {}}
+        assert 'filename="speech.json"' in response.headers["content-disposition"]
+
+    def test_missing_file(self, client, storage, task, auth_headers):
+        """Test 404 for corpus files that don't exist"""
+        response = client.get(f"/alignment/{task.id}/download/text/42", headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_other_corpus_file_names(self, client, db_session, storage, task, auth_headers):
+        """Test that every corpus file is served under its own name and format"""
+        add_corpus_file(db_session, task, 2, "second.wav", "second.txt")
+        storage.objects[corpus_file_path(task.user_id, task.id, 2, "wav")] = b"RIFF"
+
+        response = client.get(f"/alignment/{task.id}/download/audio/2", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/wav"
+        assert 'filename="second.wav"' in response.headers["content-disposition"]
+
+    def test_corpus_file_of_other_task(self, client, db_session, test_user, storage, task, auth_headers):
+        """Test that a corpus file can't be reached through another task"""
+        other = create_alignment_task(db_session, AlignmentQueueCreate(
+            original_audio_filename="other.mp3",
+            original_text_filename="other.txt",
+            acoustic_model=ModelParameter(name="test_acoustic", version="1.0.0"),
+            dictionary_model=ModelParameter(name="test_dictionary", version="1.0.0")
+        ), "audio.mp3", "text.txt", test_user.id)
+
+        response = client.get(f"/alignment/{other.id}/download/audio/1", headers=auth_headers)
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Corpus file not found"
+
+
+class TestCorpusArchive:
+
+    @pytest.fixture
+    def task(self, db_session, test_user, storage):
+        task = create_alignment_task(db_session, AlignmentQueueCreate(
+            original_audio_filename="speech.wav",
+            original_text_filename="speech.txt",
+            acoustic_model=ModelParameter(name="test_acoustic", version="1.0.0"),
+            dictionary_model=ModelParameter(name="test_dictionary", version="1.0.0")
+        ), "audio.wav", "text.txt", test_user.id)
+        add_corpus_file(db_session, task, 1)
+        store_corpus_audio(storage, corpus_file_path(task.user_id, task.id, 1, "wav"), make_wav(2), "wav")
+        storage.objects[corpus_file_path(task.user_id, task.id, 1, "txt")] = "привет мир ".encode() * 1000
+        return task
+
+    def test_corpus_archive(self, client, storage, task, auth_headers):
+        """Test that the archive contains every corpus file under its uploaded name"""
+        response = client.get(f"/alignment/{task.id}/download/corpus", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert archive.testzip() is None
+            assert sorted(archive.namelist()) == ["speech.txt", "speech.wav"]
+            assert archive.getinfo("speech.wav").compress_type == zipfile.ZIP_STORED
+            assert archive.getinfo("speech.txt").compress_type == zipfile.ZIP_DEFLATED
+            assert archive.read("speech.wav") == storage.objects[corpus_file_path(task.user_id, task.id, 1, "wav")]
+
+    def test_duplicate_names_are_prefixed(self, client, db_session, storage, task, auth_headers):
+        """Test that files uploaded under the same name get unique archive names"""
+        add_corpus_file(db_session, task, 2, text_filename="other.txt")
+        storage.objects[corpus_file_path(task.user_id, task.id, 2, "wav")] = make_wav(1)
+        storage.objects[corpus_file_path(task.user_id, task.id, 2, "txt")] = b"text"
+
+        response = client.get(f"/alignment/{task.id}/download/corpus", headers=auth_headers)
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert sorted(archive.namelist()) == ["1_speech.wav", "2_speech.wav", "other.txt", "speech.txt"]
+            assert archive.read("2_speech.wav") == make_wav(1)
+
+    def test_archive_is_streamed(self, storage):
+        """Test that archive output starts before all members are read"""
+        storage.objects["a.wav"] = b"\x00" * 300_000
+        storage.objects["b.wav"] = b"\x01" * 300_000
+        pieces = iter_zip(storage, [ZipMember("a.wav", "a.wav"), ZipMember("b.wav", "b.wav")])
+
+        next(pieces)
+
+        assert storage.bytes_read < 300_000
+
+    def test_missing_members_are_skipped(self, storage):
+        """Test that objects deleted after listing are left out"""
+        storage.objects["a.txt"] = b"text"
+        data = b"".join(iter_zip(storage, [ZipMember("gone.txt", "gone.txt"), ZipMember("a.txt", "a.txt")]))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.namelist() == ["a.txt"]
+
+    def test_empty_corpus(self, client, db_session, task, auth_headers):
+        """Test 404 when the task has no corpus files"""
+        db_session.query(CorpusFile).delete()
+        db_session.commit()
+        response = client.get(f"/alignment/{task.id}/download/corpus", headers=auth_headers)
+        assert response.status_code == 404
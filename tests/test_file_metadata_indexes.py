@@ -0,0 +1,113 @@
+import enum
+import os
+import time
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import inspect, insert, text
+from sqlalchemy.dialects import sqlite
+
+from api.domains.users.crud import UserService
+from api.domains.users.models import FileStorageMetadata, FileType
+from tests.conftest import engine
+
+RUN_BENCHMARKS = os.getenv("RUN_BENCHMARKS", "").lower() in ("1", "true", "yes")
+BENCHMARK_ROWS = int(os.getenv("BENCHMARK_ROWS", "2000000"))
+BENCHMARK_USERS = 1000
+NOW = datetime(2025, 6, 1)
+
+
+def query_plan(db, query) -> str:
+    """Return the SQLite query plan of an ORM query as one string."""
+    compiled = query.statement.compile(dialect=sqlite.dialect(paramstyle="named"))
+    # Enum columns are stored by member name
+    params = {key: value.name if isinstance(value, enum.Enum) else value for key, value in compiled.params.items()}
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"), params)
+    return " | ".join(row[-1] for row in rows)
+
+
+def assert_uses_index(plan: str, index_name: str):
+    assert f"USING INDEX {index_name}" in plan or f"USING COVERING INDEX {index_name}" in plan, plan
+    # Ordering must come from the index, not from a sort step
+    assert "TEMP B-TREE" not in plan, plan
+
+
+class TestFileMetadataIndexes:
+
+    def test_indexes_exist(self, db_session):
+        """Test that the model declares the cleanup and listing indexes"""
+        indexes = {index["name"]: index["column_names"] for index in inspect(engine).get_indexes("file_storage_metadata")}
+
+        assert indexes["ix_file_storage_metadata_expires_at"] == ["expires_at"]
+        assert indexes["ix_file_storage_metadata_user_created"] == ["user_id", "created_at"]
+        assert indexes["ix_file_storage_metadata_user_type_created"] == ["user_id", "file_type", "created_at"]
+
+    def test_expired_files_query_plan(self, db_session):
+        """Test that expired-file pages are read along the expires_at index"""
+        plan = query_plan(db_session, UserService.expired_files_query(db_session, NOW, after=(NOW, 10)))
+        assert_uses_index(plan, "ix_file_storage_metadata_expires_at")
+
+    def test_user_files_query_plan(self, db_session):
+        """Test that user file listings are served in index order"""
+        plan = query_plan(db_session, UserService.user_files_query(db_session, 1))
+        assert_uses_index(plan, "ix_file_storage_metadata_user_created")
+
+        plan = query_plan(db_session, UserService.user_files_query(db_session, 1, FileType.AUDIO))
+        assert_uses_index(plan, "ix_file_storage_metadata_user_type_created")
+
+
+@pytest.fixture
+def populated_file_metadata(db_session):
+    """
+    Fill file_storage_metadata with BENCHMARK_ROWS rows spread over
+    BENCHMARK_USERS users, about 1% of them expired.
+    """
+    file_types = list(FileType)
+    chunk_size = 50000
+    for start in range(0, BENCHMARK_ROWS, chunk_size):
+        db_session.execute(insert(FileStorageMetadata), [
+            {
+                "user_id": i % BENCHMARK_USERS + 1,
+                "file_type": file_types[i % len(file_types)],
+                "original_filename": f"{i}.wav",
+                "storage_path": f"{i % BENCHMARK_USERS + 1}/corpus/{i}.wav",
+                "file_size": 1024,
+                "created_at": NOW - timedelta(minutes=i),
+                "expires_at": NOW - timedelta(days=1) if i % 100 == 0 else NOW + timedelta(days=30),
+            }
+            for i in range(start, min(start + chunk_size, BENCHMARK_ROWS))
+        ])
+    db_session.commit()
+    db_session.execute(text("ANALYZE"))
+    return BENCHMARK_ROWS
+
+
+@pytest.mark.skipif(not RUN_BENCHMARKS, reason="set RUN_BENCHMARKS=1 to run benchmarks")
+class TestFileMetadataBenchmarks:
+
+    def _timed(self, func):
+        started = time.perf_counter()
+        result = func()
+        return result, time.perf_counter() - started
+
+    def test_expired_files_at_scale(self, db_session, populated_file_metadata):
+        """Benchmark paging through expired files"""
+        query = UserService.expired_files_query(db_session, NOW)
+        assert_uses_index(query_plan(db_session, query), "ix_file_storage_metadata_expires_at")
+
+        page, elapsed = self._timed(lambda: UserService.get_expired_files(db_session, NOW, limit=1000))
+        last = page[-1]
+        next_page, next_elapsed = self._timed(
+            lambda: UserService.get_expired_files(db_session, NOW, after=(last.expires_at, last.id), limit=1000)
+        )
+        print(f"\nexpired files over {populated_file_metadata} rows: "
+              f"first page {elapsed * 1000:.1f} ms, next page {next_elapsed * 1000:.1f} ms")
+        assert len(page) == len(next_page) == 1000
+
+    def test_user_files_at_scale(self, db_session, populated_file_metadata):
+        """Benchmark listing one user's files"""
+        query = UserService.user_files_query(db_session, 42, FileType.AUDIO)
+        assert_uses_index(query_plan(db_session, query), "ix_file_storage_metadata_user_type_created")
+
+        files, elapsed = self._timed(lambda: UserService.get_user_files(db_session, 42))
+        print(f"\nuser files over {populated_file_metadata} rows: {len(files)} rows in {elapsed * 1000:.1f} ms")
+        assert len(files) == populated_file_metadata // BENCHMARK_USERS
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from api.domains.models.models import ModelType
+from api.domains.models.services.local_mfa_service import LocalMFAService
+
+
+def make_dir(root, *parts, meta=None):
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True)
+    if meta is not None:
+        (path / "meta.json").write_text(json.dumps(meta))
+    return path
+
+
+class TestLocalMFAService:
+    """Test cases for the local mfa-models repository scan"""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        make_dir(tmp_path, ".git", "refs", "heads")
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        (tmp_path / ".git" / "refs" / "heads" / "main").write_text("a" * 40 + "\n")
+        make_dir(tmp_path, "acoustic", "english", "mfa", "v3.0.0", meta={"version": "3.0.1", "phone_set_type": "IPA"})
+        make_dir(tmp_path, "acoustic", "english", "us_arpa", "v2.0.0")
+        make_dir(tmp_path, "dictionary", "russian", "v3.1.0")
+        make_dir(tmp_path, "g2p", "german")
+        make_dir(tmp_path, "g2p", ".hidden")
+        return tmp_path
+
+    @pytest.fixture
+    def service(self, repo):
+        service = LocalMFAService(repo_path=str(repo))
+        with patch.object(service, "update_repository", AsyncMock(return_value=True)):
+            yield service
+
+    @pytest.mark.asyncio
+    async def test_scan_models(self, service):
+        """Test that every model type is scanned and meta.json wins over directory names"""
+        models = await service.fetch_models()
+
+        by_name = {(model["name"], model["model_type"]): model for model in models}
+        assert len(models) == 4
+        assert by_name[("english_mfa", ModelType.ACOUSTIC)]["version"] == "3.0.1"
+        assert by_name[("english_mfa", ModelType.ACOUSTIC)]["phone_set"] == "IPA"
+        assert by_name[("english_us_arpa", ModelType.ACOUSTIC)]["version"] == "2.0.0"
+        assert by_name[("english_us_arpa", ModelType.ACOUSTIC)]["phone_set"] is None
+        assert by_name[("russian", ModelType.DICTIONARY)]["version"] == "3.1.0"
+        assert by_name[("german", ModelType.G2P)]["version"] == "latest"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_head_uses_manifest(self, service, repo):
+        """Test that the repository isn't walked again while HEAD stays the same"""
+        models = await service.fetch_models()
+        assert service.manifest_path.is_file()
+
+        with patch.object(service, "_scan_type", side_effect=AssertionError("rescanned")):
+            assert await service.fetch_models() == models
+
+        (repo / ".git" / "refs" / "heads" / "main").write_text("b" * 40 + "\n")
+        make_dir(repo, "g2p", "french")
+        assert len(await service.fetch_models()) == 5
+
+    def test_packed_head(self, service, repo):
+        """Test that HEAD is resolved through packed-refs after git gc"""
+        (repo / ".git" / "refs" / "heads" / "main").unlink()
+        (repo / ".git" / "packed-refs").write_text(f"# pack-refs with: peeled\n{'c' * 40} refs/heads/main\n")
+
+        assert service._git_head() == "c" * 40
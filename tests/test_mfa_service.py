@@ -176,7 +176,7 @@ class TestMFAModelService:
     async def test_update_models_from_github_duplicate_handling(
         self, mfa_service: MFAModelService, db_session: Session
     ):
-        """Test that duplicate models are not created"""
+        """Test that duplicate models collapse into one row by natural key"""
         duplicate_models = [
             {
                 "name": "test_model",
@@ -206,13 +206,12 @@ class TestMFAModelService:
             # Run update
             updated_models, updated_languages = await mfa_service.update_models_from_github(db_session)
             
-            # Should create 2 models (duplicates are handled by bulk_create_mfa_models)
-            assert updated_models == 2
+            # Should create 1 model (name, type and version identify a model)
+            assert updated_models == 1
             assert updated_languages == 1
             
-            # Verify both models exist in database (no deduplication in bulk_create)
             all_models = get_mfa_models(db_session)
-            assert len(all_models) == 2
+            assert len(all_models) == 1
     
     @pytest.mark.asyncio
     async def test_update_models_from_github_error_handling(
@@ -258,6 +257,62 @@ class TestMFAModelService:
             assert updated_models >= 1
             assert updated_languages >= 1
     
+    @pytest.mark.asyncio
+    async def test_incremental_sync(
+        self, mfa_service: MFAModelService, db_session: Session, mock_github_models
+    ):
+        """Test that a resync only writes changes and keeps model ids"""
+        with patch.object(mfa_service.local_service, 'fetch_models') as mock_fetch:
+            mock_fetch.return_value = mock_github_models
+            await mfa_service.update_models_from_github(db_session)
+            ids = {model.name: model.id for model in get_mfa_models(db_session)}
+            
+            # Unchanged repository: nothing to write
+            assert await mfa_service.update_models_from_github(db_session) == (0, 0)
+            
+            # One model gets a new variant, one disappears from the repository
+            changed = [dict(model) for model in mock_github_models[:-1]]
+            changed[2]["variant"] = "mfa"
+            mock_fetch.return_value = changed
+            assert await mfa_service.update_models_from_github(db_session) == (1, 1)
+            
+            db_session.expire_all()
+            models = {model.name: model for model in get_mfa_models(db_session)}
+            assert "spanish_acoustic" not in models
+            assert models["russian_mfa"].variant == "mfa"
+            assert {name: model.id for name, model in models.items()} == {
+                name: model_id for name, model_id in ids.items() if name != "spanish_acoustic"
+            }
+            
+            # The removed model is kept for references and hidden from listings
+            removed = db_session.query(MFAModel).filter(MFAModel.name == "spanish_acoustic").one()
+            assert removed.deleted_at is not None
+            assert "spanish" not in [language.code for language in get_languages(db_session)]
+            
+            # A model returning to the repository is restored under its old id
+            mock_fetch.return_value = mock_github_models
+            await mfa_service.update_models_from_github(db_session)
+            db_session.expire_all()
+            assert removed.deleted_at is None
+            assert removed.id == ids["spanish_acoustic"]
+    
+    @pytest.mark.asyncio
+    async def test_failed_sync_keeps_catalog(
+        self, mfa_service: MFAModelService, db_session: Session, mock_github_models
+    ):
+        """Test that a failing sync leaves the previous catalog in place"""
+        with patch.object(mfa_service.local_service, 'fetch_models') as mock_fetch:
+            mock_fetch.return_value = mock_github_models
+            await mfa_service.update_models_from_github(db_session)
+            
+            mock_fetch.return_value = mock_github_models[:1]
+            with patch('api.domains.models.services.mfa_service.soft_delete_mfa_models',
+                       side_effect=RuntimeError("connection lost")):
+                with pytest.raises(RuntimeError):
+                    await mfa_service.update_models_from_github(db_session)
+            
+            assert len(get_mfa_models(db_session)) == 4
+    
     @pytest.mark.asyncio
     async def test_close_service(self, mfa_service: MFAModelService):
         """Test closing the service"""
@@ -0,0 +1,92 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from api.domains.alignment.crud import validate_models_same_language_async
+from api.domains.alignment.schemas import ModelParameter
+from api.domains.models.crud import create_language, create_mfa_model
+from api.domains.models.models import ModelType
+from api.domains.models.schemas import LanguageCreate, MFAModelCreate
+from tests.conftest import TestingAsyncSessionLocal
+
+FIND_MODEL = "api.domains.alignment.crud.find_model_by_param_async"
+
+
+@pytest.fixture
+def catalog(db_session):
+    english = create_language(db_session, LanguageCreate(code="en", name="English"))
+    russian = create_language(db_session, LanguageCreate(code="ru", name="Russian"))
+    for name, model_type, phone_set, language in [
+        ("english_mfa", ModelType.ACOUSTIC, "IPA", english),
+        ("english_us_arpa", ModelType.ACOUSTIC, "ARPA", english),
+        ("english_mfa", ModelType.DICTIONARY, "IPA", english),
+        ("english_us_arpa", ModelType.DICTIONARY, "ARPA", english),
+        ("english_us_arpa", ModelType.G2P, "ARPA", english),
+        ("russian_mfa", ModelType.ACOUSTIC, None, russian),
+        ("russian_mfa", ModelType.DICTIONARY, "IPA", russian),
+    ]:
+        create_mfa_model(db_session, MFAModelCreate(
+            name=name, model_type=model_type, version="3.0.0", phone_set=phone_set, language_id=language.id
+        ))
+
+
+def combinations(compatibility):
+    return [
+        (combination["acoustic"]["name"], combination["dictionary"]["name"],
+         [g2p["name"] for g2p in combination["g2p"]])
+        for combination in compatibility["combinations"]
+    ]
+
+
+class TestModelsCompatibility:
+    """Test cases for the model compatibility matrix"""
+
+    def test_compatibility_matrix(self, client, catalog):
+        """Test that only models of one language and phone set are combined"""
+        response = client.get("/models/compatibility")
+
+        assert response.status_code == 200
+        english, russian = response.json()
+        assert english["language"]["code"] == "en"
+        assert combinations(english) == [
+            ("english_mfa", "english_mfa", []),
+            ("english_us_arpa", "english_us_arpa", ["english_us_arpa"]),
+        ]
+        # A model without a declared phone set fits any
+        assert combinations(russian) == [("russian_mfa", "russian_mfa", [])]
+        assert "max-age" in response.headers["Cache-Control"]
+
+    def test_compatibility_of_language(self, client, catalog):
+        """Test the lookup of one language"""
+        assert [item["language"]["code"] for item in client.get("/models/compatibility?language=ru").json()] == ["ru"]
+        assert client.get("/models/compatibility?language=de").json() == []
+
+    @pytest.mark.asyncio
+    async def test_validation_from_index(self, catalog):
+        """Test that submissions of known models are validated without model queries"""
+        with patch(FIND_MODEL, AsyncMock(side_effect=AssertionError("queried"))):
+            async with TestingAsyncSessionLocal() as db:
+                valid = await validate_models_same_language_async(
+                    db, ModelParameter(name="english_us_arpa", version="3.0.0"),
+                    ModelParameter(name="english_us_arpa", version="3.0.0"),
+                    ModelParameter(name="english_us_arpa", version="3.0.0")
+                )
+                mixed = await validate_models_same_language_async(
+                    db, ModelParameter(name="english_mfa", version="3.0.0"),
+                    ModelParameter(name="english_us_arpa", version="3.0.0")
+                )
+
+        assert valid[0] is True
+        assert mixed == (False, "Acoustic and dictionary models must use the same phone set", None)
+
+    @pytest.mark.asyncio
+    async def test_unknown_model_checked_in_database(self, catalog):
+        """Test that models missing from the snapshot are looked up in the database"""
+        async with TestingAsyncSessionLocal() as db:
+            with patch(FIND_MODEL, AsyncMock(return_value=None)) as find_model:
+                is_valid, error_message, _ = await validate_models_same_language_async(
+                    db, ModelParameter(name="german_mfa", version="3.0.0"),
+                    ModelParameter(name="german_mfa", version="3.0.0")
+                )
+
+        assert find_model.await_count == 1
+        assert (is_valid, error_message) == (False, "Acoustic model 'german_mfa' not found")
@@ -6,7 +6,19 @@ from sqlalchemy.orm import Session
 from api.main import app
 from api.domains.models.models import Language, MFAModel, ModelType
 from api.domains.models.schemas import LanguageCreate, MFAModelCreate
-from api.domains.models.crud import create_language, create_mfa_model
+from api.domains.models.crud import create_language, create_mfa_model, finish_catalog_refresh
+from api.domains.models.queue import get_refresh_queue
+
+
+class FakeRefreshQueue:
+    def __init__(self):
+        self.enqueued = []
+        self.fail = False
+
+    def enqueue(self, refresh_id):
+        if self.fail:
+            raise ConnectionError("broker unavailable")
+        self.enqueued.append(refresh_id)
 
 
 class TestModelsEndpoints:
@@ -184,51 +196,58 @@ class TestModelsEndpoints:
         assert isinstance(data, list)
         assert len(data) <= 1
     
-    @patch('api.domains.models.services.mfa_service.MFAModelService.update_models_from_github')
-    def test_update_models_success(self, mock_update, client: TestClient):
-        """Test POST /models/update endpoint success"""
-        # Mock successful update
-        mock_update.return_value = (25, 5)  # 25 models, 5 languages
-        
+    @pytest.fixture
+    def refresh_queue(self, db_session: Session):
+        queue = FakeRefreshQueue()
+        app.dependency_overrides[get_refresh_queue] = lambda: queue
+        yield queue
+        app.dependency_overrides.pop(get_refresh_queue, None)
+    
+    def test_update_models_starts_refresh(self, client: TestClient, refresh_queue):
+        """Test POST /models/update enqueues a refresh and returns its job"""
         response = client.post("/models/update")
         
-        assert response.status_code == 200
+        assert response.status_code == 202
         data = response.json()
         
-        assert data["message"] == "Models updated successfully"
-        assert data["updated_models"] == 25
-        assert data["updated_languages"] == 5
+        assert data["status"] == "pending"
+        assert refresh_queue.enqueued == [data["id"]]
         
-        mock_update.assert_called_once()
+        status = client.get(f"/models/update/{data['id']}")
+        assert status.status_code == 200
+        assert status.json()["status"] == "pending"
     
-    @patch('api.domains.models.services.mfa_service.MFAModelService.update_models_from_github')
-    def test_update_models_failure(self, mock_update, client: TestClient):
-        """Test POST /models/update endpoint failure"""
-        # Mock update failure
-        mock_update.side_effect = Exception("GitHub API error")
+    def test_update_models_single_flight(self, client: TestClient, db_session: Session, refresh_queue):
+        """Test that concurrent refresh requests join the active refresh"""
+        first = client.post("/models/update").json()
+        second = client.post("/models/update").json()
         
-        response = client.post("/models/update")
+        assert second["id"] == first["id"]
+        assert refresh_queue.enqueued == [first["id"]]
         
-        assert response.status_code == 500
-        data = response.json()
+        finish_catalog_refresh(db_session, first["id"], 25, 5)
+        finished = client.get(f"/models/update/{first['id']}").json()
+        assert (finished["status"], finished["updated_models"], finished["updated_languages"]) == ("completed", 25, 5)
         
-        assert "Failed to update models" in data["detail"]
-        assert "GitHub API error" in data["detail"]
+        third = client.post("/models/update").json()
+        assert third["id"] != first["id"]
     
-    @patch('api.domains.models.services.mfa_service.MFAModelService.update_models_from_github')
-    def test_update_models_no_updates(self, mock_update, client: TestClient):
-        """Test POST /models/update when no updates are needed"""
-        # Mock no updates needed
-        mock_update.return_value = (0, 0)
+    def test_update_models_enqueue_failure(self, client: TestClient, refresh_queue):
+        """Test that a refresh that can't be enqueued fails and doesn't block the next one"""
+        refresh_queue.fail = True
         
         response = client.post("/models/update")
         
-        assert response.status_code == 200
-        data = response.json()
+        assert response.status_code == 500
+        assert "Failed to update models" in response.json()["detail"]
         
-        assert data["message"] == "Models updated successfully"
-        assert data["updated_models"] == 0
-        assert data["updated_languages"] == 0
+        refresh_queue.fail = False
+        assert client.post("/models/update").status_code == 202
+        assert len(refresh_queue.enqueued) == 1
+    
+    def test_update_status_not_found(self, client: TestClient, db_session: Session):
+        """Test GET /models/update/{id} for an unknown refresh"""
+        assert client.get("/models/update/999").status_code == 404
     
     def test_models_endpoint_structure(self, client: TestClient, sample_data):
         """Test that model responses have correct structure including variant field"""
@@ -0,0 +1,78 @@
+import pytest
+
+import api.domains.models.catalog
+from api.cache import TTLCache
+from api.domains.models.crud import create_language, create_mfa_model, soft_delete_mfa_models
+from api.domains.models.models import ModelType
+from api.domains.models.schemas import LanguageCreate, MFAModelCreate
+
+
+@pytest.fixture(params=["sql", "cached"])
+def catalog(request, db_session, monkeypatch):
+    """Models of two languages, queried through the database or the cached index"""
+    monkeypatch.setattr(api.domains.models.catalog, "catalog_cache",
+                        TTLCache(1, 0 if request.param == "sql" else 60))
+    english = create_language(db_session, LanguageCreate(code="en", name="English"))
+    russian = create_language(db_session, LanguageCreate(code="ru", name="Russian"))
+    rows = [
+        ("english_us_arpa", ModelType.G2P, "2.2.1", "us_arpa", english),
+        ("english_mfa", ModelType.G2P, "3.0.0", "mfa", english),
+        ("english_mfa", ModelType.ACOUSTIC, "3.0.0", "mfa", english),
+        ("english_100%", ModelType.ACOUSTIC, "1.0.0", None, english),
+        ("russian_mfa", ModelType.ACOUSTIC, "3.1.0", "mfa", russian),
+        ("russian_mfa", ModelType.DICTIONARY, "3.1.0", "mfa", russian),
+    ]
+    return [
+        create_mfa_model(db_session, MFAModelCreate(
+            name=name, model_type=model_type, version=version, variant=variant, language_id=language.id
+        ))
+        for name, model_type, version, variant, language in rows
+    ]
+
+
+class TestModelsQuery:
+    """Test cases for filtering and paginating GET /models/"""
+
+    @pytest.mark.parametrize("params, expected", [
+        ({"model_type": "acoustic"}, [2, 3, 4]),
+        ({"model_type": "acoustic", "language": "en"}, [2, 3]),
+        ({"name": "english_"}, [0, 1, 2, 3]),
+        ({"name": "english_100%"}, [3]),
+        ({"name": "english_1%"}, []),
+        ({"version": "3.0.0", "variant": "mfa"}, [1, 2]),
+        ({"language": "ru", "model_type": "g2p"}, []),
+    ])
+    def test_filters(self, client, catalog, params, expected):
+        """Test that every filter is applied and the total is reported"""
+        response = client.get("/models/", params=params)
+
+        assert response.status_code == 200
+        assert [model["id"] for model in response.json()] == [catalog[i].id for i in expected]
+        assert response.headers["X-Total-Count"] == str(len(expected))
+
+    def test_cursor_pages(self, client, catalog):
+        """Test that cursor pages cover the filtered catalog once, in id order"""
+        seen, params = [], {"model_type": "acoustic", "limit": 2}
+        while True:
+            response = client.get("/models/", params=params)
+            assert response.headers["X-Total-Count"] == "3"
+            seen += [model["id"] for model in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+
+        assert seen == [catalog[i].id for i in (2, 3, 4)]
+
+    def test_removed_models_hidden(self, client, db_session, catalog):
+        """Test that models removed from the catalog are neither listed nor counted"""
+        soft_delete_mfa_models(db_session, [catalog[0].id])
+        db_session.commit()
+
+        response = client.get("/models/", params={"model_type": "g2p"})
+
+        assert [model["id"] for model in response.json()] == [catalog[1].id]
+        assert response.headers["X-Total-Count"] == "1"
+
+    def test_invalid_cursor(self, client, catalog):
+        """Test that a malformed cursor is rejected"""
+        assert client.get("/models/", params={"cursor": "not-a-cursor"}).status_code == 400
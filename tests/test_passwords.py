@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import pytest
+from starlette.requests import Request
+
+import api.passwords as passwords
+from api.domains.auth.rate_limit import LoginRateLimiter, _parse_networks, client_address, login_rate_limiter
+from api.passwords import PasswordHashingBusy, get_password_hash, verify_password
+
+
+class TestPasswordHashing:
+
+    def test_hash_and_verify(self):
+        """Test that the shared helpers round-trip and reject malformed hashes"""
+        password_hash = get_password_hash("secret")
+
+        assert verify_password("secret", password_hash)
+        assert not verify_password("wrong", password_hash)
+        assert not verify_password("secret", "not-a-bcrypt-hash")
+
+    @pytest.mark.asyncio
+    async def test_hashing_does_not_block_event_loop(self):
+        """Test that the event loop keeps running while a hash is computed"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(ticker())
+        password_hash = await passwords.get_password_hash_async("secret")
+        task.cancel()
+
+        assert await passwords.verify_password_async("secret", password_hash)
+        assert ticks > 5
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_rejects(self, monkeypatch):
+        """Test that calls beyond the pool's capacity fail fast"""
+        monkeypatch.setattr(passwords, "_slots", threading.BoundedSemaphore(1))
+        release = threading.Event()
+
+        blocked = asyncio.ensure_future(passwords.run_password_task(release.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(PasswordHashingBusy):
+            await passwords.verify_password_async("secret", "hash")
+
+        release.set()
+        assert await blocked
+
+
+class TestLoginRateLimit:
+
+    def test_failed_logins_are_limited(self, client, test_user):
+        """Test that repeated failures are rejected before checking the password"""
+        credentials = {"username": test_user.username, "password": "wrongpassword"}
+        statuses = [client.post("/auth/login", json=credentials).status_code
+                    for _ in range(login_rate_limiter.per_user.limit + 1)]
+
+        assert statuses[-1] == 429
+        assert set(statuses[:-1]) == {401}
+
+        response = client.post("/auth/login", json={"username": test_user.username, "password": "testpassword123"})
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) > 0
+
+    def test_success_resets_user_counter(self, client, test_user):
+        """Test that a successful login clears earlier failures"""
+        for _ in range(login_rate_limiter.per_user.limit - 1):
+            client.post("/auth/login", json={"username": test_user.username, "password": "wrongpassword"})
+
+        response = client.post("/auth/login", json={"username": test_user.username, "password": "testpassword123"})
+        assert response.status_code == 200
+        assert login_rate_limiter.retry_after("testclient", test_user.username) is None
+
+    def test_window_expires(self):
+        """Test that failures older than the window no longer count"""
+        clock = [0.0]
+        limiter = LoginRateLimiter(max_failures=2, max_failures_per_client=10, window=60, clock=lambda: clock[0])
+        limiter.record_failure("10.0.0.1", "alice")
+        clock[0] = 30
+        limiter.record_failure("10.0.0.1", "Alice")
+
+        assert limiter.retry_after("10.0.0.1", "alice") == pytest.approx(30)
+        assert limiter.retry_after("10.0.0.2", "alice") is None
+
+        clock[0] = 60
+        assert limiter.retry_after("10.0.0.1", "alice") is None
+
+    def test_per_client_limit(self):
+        """Test that one client can't spread failures over many usernames"""
+        limiter = LoginRateLimiter(max_failures=5, max_failures_per_client=3, window=60)
+        for name in ("a", "b", "c"):
+            limiter.record_failure("10.0.0.1", name)
+
+        assert limiter.retry_after("10.0.0.1", "d") is not None
+
+    @staticmethod
+    def _request(peer, forwarded=None):
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return Request({"type": "http", "headers": headers, "client": (peer, 50000)})
+
+    def test_forwarded_client_behind_trusted_proxy(self):
+        """Test that the client address is read from X-Forwarded-For only when a trusted proxy sent it"""
+        proxies = _parse_networks("10.0.0.1, 172.16.0.0/12")
+
+        assert client_address(self._request("10.0.0.1", "203.0.113.7"), proxies) == "203.0.113.7"
+        # Chained trusted proxies are skipped; spoofed entries left of the client are ignored
+        assert client_address(self._request("10.0.0.1", "198.51.100.1, 203.0.113.7, 172.16.0.5"),
+                              proxies) == "203.0.113.7"
+        assert client_address(self._request("10.0.0.1"), proxies) == "10.0.0.1"
+        # Untrusted peers can't choose their address
+        assert client_address(self._request("203.0.113.9", "198.51.100.1"), proxies) == "203.0.113.9"
+        assert client_address(self._request("10.0.0.1", "198.51.100.1"), []) == "10.0.0.1"
@@ -0,0 +1,139 @@
+import time
+
+import pytest
+
+import api.database as database
+from api import read_routing
+from api.domains.alignment.crud import create_alignment_task
+from api.domains.alignment.schemas import AlignmentQueueCreate, ModelParameter
+from api.read_routing import (
+    LAST_WRITE_COOKIE,
+    LAST_WRITE_HEADER,
+    ReplicaLagMonitor,
+    last_write_marker,
+    reads_pinned_to_primary,
+)
+from tests.conftest import TestingAsyncSessionLocal, TestingSessionLocal
+
+
+class TestReadRouting:
+
+    @pytest.fixture
+    def replica(self, monkeypatch):
+        """Route replica sessions to the test database and count them"""
+        opened = []
+
+        def sync_session():
+            opened.append("sync")
+            return TestingSessionLocal()
+
+        def async_session():
+            opened.append("async")
+            return TestingAsyncSessionLocal()
+
+        monkeypatch.setattr(database, "ReplicaSessionLocal", sync_session)
+        monkeypatch.setattr(database, "ReplicaAsyncSessionLocal", async_session)
+        monitor = ReplicaLagMonitor(probe=lambda: 0.5, max_lag=2)
+        monkeypatch.setattr(read_routing, "replica_lag_monitor", monitor)
+        return opened, monitor
+
+    def test_reads_use_replica(self, client, auth_headers, replica):
+        """Test that read-only listings are served by the replica"""
+        opened, _ = replica
+
+        assert client.get("/models/").status_code == 200
+        assert client.get("/models/languages").status_code == 200
+        assert client.get("/alignment/", headers=auth_headers).status_code == 200
+        assert client.get("/users/files", headers=auth_headers).status_code == 200
+
+        assert opened == ["async", "async", "async", "sync"]
+
+    @pytest.fixture
+    def task(self, db_session, test_user):
+        return create_alignment_task(db_session, AlignmentQueueCreate(
+            original_audio_filename="speech.wav",
+            original_text_filename="speech.txt",
+            acoustic_model=ModelParameter(name="test_acoustic", version="1.0.0"),
+            dictionary_model=ModelParameter(name="test_dictionary", version="1.0.0")
+        ), "audio.wav", "text.txt", test_user.id)
+
+    def test_recent_writer_reads_primary(self, client, auth_headers, replica, task):
+        """Test read-your-writes through the cookie set by a write endpoint"""
+        opened, _ = replica
+        client.get("/alignment/", headers=auth_headers)
+        response = client.put(f"/alignment/{task.id}", json={"error_message": "retry"}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert reads_pinned_to_primary(response.cookies[LAST_WRITE_COOKIE])
+        assert client.get("/alignment/", headers=auth_headers).status_code == 200
+        assert opened == ["async"]
+
+        # A client without the marker, e.g. another device, still reads the replica
+        client.cookies.clear()
+        assert client.get("/alignment/", headers=auth_headers).status_code == 200
+        assert opened == ["async", "async"]
+
+    def test_marker_header(self, client, auth_headers, replica, task):
+        """Test that clients without cookies can send the marker back as a header"""
+        opened, _ = replica
+        response = client.delete(f"/alignment/{task.id}", headers=auth_headers)
+        client.cookies.clear()
+
+        marker = response.headers[LAST_WRITE_HEADER]
+        assert client.get("/alignment/", headers={**auth_headers, LAST_WRITE_HEADER: marker}).status_code == 200
+        assert opened == []
+
+    def test_marker_expires(self):
+        """Test that a marker only pins reads within the stickiness window"""
+        written_at = time.time()
+        marker = last_write_marker(written_at)
+
+        assert reads_pinned_to_primary(marker, now=written_at + 1)
+        assert not reads_pinned_to_primary(marker, now=written_at + read_routing.DB_REPLICA_STICKY_SECONDS)
+
+    def test_forged_marker_is_ignored(self, client, auth_headers, replica):
+        """Test that a marker with a bad signature doesn't pin reads to the primary"""
+        opened, _ = replica
+        millis = int((time.time() + 3600) * 1000)
+
+        for marker in (f"{millis}.{'0' * 64}", str(millis), "garbage"):
+            assert not reads_pinned_to_primary(marker)
+            client.get("/alignment/", headers={**auth_headers, LAST_WRITE_HEADER: marker})
+        assert opened == ["async"] * 3
+
+    def test_lagging_replica_falls_back(self, client, auth_headers, replica):
+        """Test that a lagging or unreachable replica isn't used"""
+        opened, monitor = replica
+        monitor.probe = lambda: 30.0
+        assert client.get("/models/").status_code == 200
+
+        def unreachable():
+            raise ConnectionError("replica down")
+        monitor.probe = unreachable
+        monitor._checked_at = None
+        assert client.get("/models/").status_code == 200
+
+        assert opened == []
+
+    def test_no_replica_configured(self, client, db_session, replica):
+        """Test that reads stay on the primary without a replica"""
+        opened, monitor = replica
+        monitor.probe = None
+
+        assert client.get("/models/").status_code == 200
+        assert opened == []
+
+    def test_lag_check_interval(self):
+        """Test that lag is measured at most once per interval"""
+        clock = [0.0]
+        probes = []
+        monitor = ReplicaLagMonitor(probe=lambda: probes.append(1) or 1.0, max_lag=2,
+                                    check_interval=5, clock=lambda: clock[0])
+
+        assert monitor.needs_check()
+        monitor.check()
+        clock[0] = 4
+        assert not monitor.needs_check()
+        clock[0] = 5
+        assert monitor.needs_check()
+        assert monitor.healthy and len(probes) == 1
@@ -0,0 +1,217 @@
+import io
+import os
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+
+from minio.error import S3Error
+from api.storage import start_storage_warm_up
+from shared.storage.client import (
+    ProcessLocalClient,
+    StorageClientConfig,
+    create_http_client,
+    _reset_after_fork,
+)
+from shared.storage.async_service import AsyncStorage
+from shared.storage.minio_service import MinIOService
+from tests.conftest import InMemoryStorage
+
+CONFIG = StorageClientConfig(endpoint="localhost:1", access_key="key", secret_key="secret")
+
+
+class TestStorageClientFactory:
+
+    def test_config_from_env(self, monkeypatch):
+        """Test that pool settings are read from the environment"""
+        monkeypatch.setenv("MINIO_HOST", "storage")
+        monkeypatch.setenv("MINIO_POOL_MAXSIZE", "64")
+        monkeypatch.setenv("MINIO_READ_TIMEOUT", "12.5")
+
+        config = StorageClientConfig.from_env()
+
+        assert config.endpoint == "storage:9000"
+        assert config.pool_maxsize == 64
+        assert config.read_timeout == 12.5
+        assert config.max_retries == StorageClientConfig.max_retries
+
+    def test_http_client_pool(self):
+        """Test pool size, timeouts and retry policy of the HTTP client"""
+        http = create_http_client(StorageClientConfig(
+            endpoint="localhost:1", access_key="key", secret_key="secret",
+            pool_maxsize=16, connect_timeout=2, max_retries=4
+        ))
+
+        assert http.connection_pool_kw["maxsize"] == 16
+        assert http.connection_pool_kw["timeout"].connect_timeout == 2
+        retries = http.connection_pool_kw["retries"]
+        assert retries.total == 4
+        assert {429, 503}.issubset(retries.status_forcelist)
+
+    def test_client_is_shared_within_process(self):
+        """Test that threads of one process reuse the same client"""
+        holder = ProcessLocalClient(CONFIG)
+        assert holder.get() is holder.get()
+
+    def test_client_is_recreated_after_fork(self):
+        """Test that a forked child does not reuse the parent's client"""
+        holder = ProcessLocalClient(CONFIG)
+        parent_client = holder.get()
+
+        with patch("shared.storage.client.os.getpid", return_value=os.getpid() + 1):
+            assert holder.get() is not parent_client
+
+        _reset_after_fork()
+        assert holder._client is None
+
+
+class TestLazyInitialization:
+
+    @pytest.fixture
+    def minio_client(self):
+        client = MagicMock()
+        client.bucket_exists.return_value = True
+        with patch("shared.storage.client.create_minio_client", return_value=client):
+            yield client
+
+    def test_no_network_on_construction(self, minio_client):
+        """Test that creating the service doesn't touch MinIO"""
+        MinIOService(CONFIG)
+        minio_client.bucket_exists.assert_not_called()
+
+    def test_bucket_verified_once(self, minio_client):
+        """Test that the bucket is checked on first use only"""
+        service = MinIOService(CONFIG)
+
+        service.file_exists("a.txt")
+        service.file_exists("b.txt")
+
+        minio_client.bucket_exists.assert_called_once_with("alignment-storage")
+        assert minio_client.stat_object.call_count == 2
+
+    def test_missing_bucket_is_created(self, minio_client):
+        """Test that a missing bucket is created on first use"""
+        minio_client.bucket_exists.return_value = False
+        service = MinIOService(CONFIG)
+
+        assert service.warm_up() is True
+        minio_client.make_bucket.assert_called_once_with("alignment-storage")
+
+    def test_warm_up_retries_after_failure(self, minio_client):
+        """Test that a failed warm-up doesn't prevent later initialization"""
+        minio_client.bucket_exists.side_effect = [ConnectionError("down"), True]
+        service = MinIOService(CONFIG)
+
+        assert service.warm_up() is False
+        assert service.warm_up() is True
+
+    def test_bucket_error_is_not_cached(self, minio_client):
+        """Test that S3 errors during the bucket check are retried on next use"""
+        minio_client.bucket_exists.side_effect = [
+            S3Error("AccessDenied", "denied", "", "", "", None), True
+        ]
+        service = MinIOService(CONFIG)
+
+        assert service.warm_up() is False
+        assert service.warm_up() is True
+
+    def test_warm_up_can_be_disabled(self, monkeypatch):
+        """Test that STORAGE_WARM_UP=false skips the background warm-up"""
+        monkeypatch.setenv("STORAGE_WARM_UP", "false")
+        assert start_storage_warm_up() is None
+
+
+class TestBulkOperations:
+
+    @pytest.fixture
+    def minio_client(self):
+        client = MagicMock()
+        client.bucket_exists.return_value = True
+        client.remove_objects.return_value = iter(())
+        with patch("shared.storage.client.create_minio_client", return_value=client):
+            yield client
+
+    def test_delete_files_in_batches(self, minio_client):
+        """Test that deletes are grouped into requests of at most 1000 keys"""
+        service = MinIOService(CONFIG)
+
+        deleted = service.delete_files(f"file_{i}" for i in range(2500))
+
+        assert deleted == 2500
+        batch_sizes = [len(call.args[1]) for call in minio_client.remove_objects.call_args_list]
+        assert batch_sizes == [1000, 1000, 500]
+
+    def test_delete_errors_are_not_counted(self, minio_client):
+        """Test that keys rejected by the server are reported as not deleted"""
+        minio_client.remove_objects.return_value = iter([MagicMock(name="error")])
+        service = MinIOService(CONFIG)
+
+        assert service.delete_files(["a", "b", "c"]) == 2
+
+    def test_iter_files_is_lazy(self, minio_client):
+        """Test that the listing is consumed as it is iterated"""
+        listed = []
+
+        def list_objects(bucket, prefix, recursive):
+            for i in range(3):
+                listed.append(i)
+                yield MagicMock(object_name=f"{prefix}{i}")
+
+        minio_client.list_objects.side_effect = list_objects
+        files = MinIOService(CONFIG).iter_files("1/")
+
+        assert next(files) == "1/0"
+        assert listed == [0]
+
+    def test_delete_prefixes(self, minio_client):
+        """Test that every prefix is listed and deleted"""
+        minio_client.list_objects.side_effect = lambda bucket, prefix, recursive: iter(
+            [MagicMock(object_name=f"{prefix}a"), MagicMock(object_name=f"{prefix}b")]
+        )
+        service = MinIOService(CONFIG)
+
+        assert service.delete_prefixes(["1/", "2/", "3/"]) == 6
+        assert service.list_files_parallel(["1/", "2/"]) == {"1/": ["1/a", "1/b"], "2/": ["2/a", "2/b"]}
+
+
+class TestAsyncStorage:
+
+    @pytest.mark.asyncio
+    async def test_calls_run_off_the_event_loop(self):
+        """Test that blocking storage calls run on the storage thread pool"""
+        storage = InMemoryStorage()
+        calls = []
+        storage.file_exists = lambda path: calls.append(threading.current_thread().name) or True
+
+        assert await AsyncStorage(storage).file_exists("a.txt") is True
+        assert calls[0].startswith("storage")
+
+    @pytest.mark.asyncio
+    async def test_upload_and_download(self):
+        """Test round trip through the async interface"""
+        async_storage = AsyncStorage(InMemoryStorage())
+
+        await async_storage.upload_file("a.txt", io.BytesIO(b"hello"), 5, "text/plain")
+
+        assert await async_storage.download_file("a.txt") == b"hello"
+        assert (await async_storage.stat_file("a.txt")).size == 5
+        assert await async_storage.list_files("a") == ["a.txt"]
+        assert await async_storage.delete_file("a.txt") is True
+        assert await async_storage.stat_file("a.txt") is None
+
+    @pytest.mark.asyncio
+    async def test_stream_file(self):
+        """Test that chunks are pulled from storage lazily"""
+        storage = InMemoryStorage()
+        storage.objects["big.bin"] = b"x" * (256 * 1024)
+        chunks = await AsyncStorage(storage).stream_file("big.bin", offset=10, length=100_000)
+
+        first = await chunks.__anext__()
+        assert storage.bytes_read == len(first) < 100_000
+
+        rest = [chunk async for chunk in chunks]
+        assert len(first) + sum(map(len, rest)) == 100_000
+
+    @pytest.mark.asyncio
+    async def test_stream_missing_file(self):
+        """Test that streaming a missing file returns None"""
+        assert await AsyncStorage(InMemoryStorage()).stream_file("missing.bin") is None
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import pytest
+from datetime import datetime, timedelta
+
+from api.domains.users.crud import STORAGE_RESERVATION_TIMEOUT, UserService
+from api.domains.users.models import FileStorageMetadata, FileType, User
+from api.domains.users.quota import QuotaExceededError, StorageReservation
+from tests.conftest import TestingAsyncSessionLocal, TestingSessionLocal
+
+MB = 1024 * 1024
+
+
+class TestStorageQuota:
+
+    def _used_storage(self, db_session, user_id):
+        db_session.expire_all()
+        return db_session.query(User.used_storage).filter(User.id == user_id).scalar()
+
+    def test_reserve_storage(self, db_session, test_user):
+        """Test that reservations succeed up to the subscription limit"""
+        assert UserService.reserve_storage(db_session, test_user.id, 60 * MB) is True
+        assert UserService.reserve_storage(db_session, test_user.id, 50 * MB) is False
+        assert UserService.reserve_storage(db_session, test_user.id, 40 * MB) is True
+
+        assert self._used_storage(db_session, test_user.id) == 100 * MB
+
+    def test_concurrent_reservations(self, db_session, test_user):
+        """Test that concurrent reservations never exceed the quota"""
+        results = []
+
+        def reserve():
+            session = TestingSessionLocal()
+            try:
+                results.append(UserService.reserve_storage(session, test_user.id, 20 * MB))
+            finally:
+                session.close()
+
+        threads = [threading.Thread(target=reserve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results.count(True) == 5
+        assert self._used_storage(db_session, test_user.id) == 100 * MB
+
+    def test_release_never_goes_negative(self, db_session, test_user):
+        """Test that releasing more than used floors usage at zero"""
+        UserService.update_user_storage(db_session, test_user.id, 10)
+        UserService.update_user_storage(db_session, test_user.id, -50)
+
+        assert self._used_storage(db_session, test_user.id) == 0
+
+    def _reserved_storage(self, db_session, user_id):
+        db_session.expire_all()
+        return db_session.query(User.reserved_storage).filter(User.id == user_id).scalar()
+
+    def test_reservation_released_on_failure(self, db_session, test_user):
+        """Test that an upload failing inside the block gives the space back"""
+        async def upload():
+            async with TestingAsyncSessionLocal() as db:
+                async with StorageReservation(db, test_user.id, 10 * MB):
+                    assert self._reserved_storage(db_session, test_user.id) == 10 * MB
+                    raise RuntimeError("upload failed")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(upload())
+
+        assert self._reserved_storage(db_session, test_user.id) == 0
+        assert self._used_storage(db_session, test_user.id) == 0
+
+    def test_reservation_settles_into_used_storage(self, db_session, test_user):
+        """Test that settling moves the reservation to used storage with the caller's commit"""
+        async def upload():
+            async with TestingAsyncSessionLocal() as db:
+                async with StorageReservation(db, test_user.id, 10 * MB) as reservation:
+                    await reservation.settle()
+                    await db.commit()
+
+        asyncio.run(upload())
+
+        assert self._used_storage(db_session, test_user.id) == 10 * MB
+        assert self._reserved_storage(db_session, test_user.id) == 0
+
+    def test_reservation_over_quota(self, db_session, test_user):
+        """Test that reservations count against the quota until released"""
+        async def upload():
+            async with TestingAsyncSessionLocal() as db:
+                with pytest.raises(QuotaExceededError):
+                    async with StorageReservation(db, test_user.id, 200 * MB):
+                        pass
+
+                async with StorageReservation(db, test_user.id, 90 * MB):
+                    with pytest.raises(QuotaExceededError):
+                        async with StorageReservation(db, test_user.id, 20 * MB):
+                            pass
+
+        asyncio.run(upload())
+
+        assert self._reserved_storage(db_session, test_user.id) == 0
+        assert self._used_storage(db_session, test_user.id) == 0
+
+    def test_reconcile_keeps_reservations_in_flight(self, db_session, test_user):
+        """Test that reconciliation only drops reservations once they are stale"""
+        test_user.reserved_storage = 10 * MB
+        test_user.reserved_at = datetime.utcnow()
+        db_session.commit()
+
+        UserService.reconcile_storage_usage(db_session)
+        assert self._reserved_storage(db_session, test_user.id) == 10 * MB
+
+        test_user.reserved_at = datetime.utcnow() - timedelta(seconds=STORAGE_RESERVATION_TIMEOUT + 1)
+        db_session.commit()
+        UserService.reconcile_storage_usage(db_session)
+        assert self._reserved_storage(db_session, test_user.id) == 0
+
+    def test_reconcile_storage_usage(self, db_session, test_user):
+        """Test that usage is rebuilt from file metadata"""
+        for size in (100, 250):
+            db_session.add(FileStorageMetadata(
+                user_id=test_user.id, file_type=FileType.AUDIO, original_filename="a.wav",
+                storage_path="a.wav", file_size=size
+            ))
+        test_user.used_storage = 99999
+        db_session.commit()
+
+        assert UserService.reconcile_storage_usage(db_session) == 1
+        assert self._used_storage(db_session, test_user.id) == 350
+        assert UserService.reconcile_storage_usage(db_session) == 0
+
+    def test_scheduled_reconciliation(self, db_session, test_user, monkeypatch):
+        """Test the periodic Celery task that runs the reconciliation job"""
+        import api.database
+        import workers.tasks
+        monkeypatch.setattr(api.database, "SessionLocal", TestingSessionLocal)
+        test_user.used_storage = 12345
+        db_session.commit()
+
+        assert workers.tasks.reconcile_storage_usage.run() == {"corrected_users": 1}
+        assert self._used_storage(db_session, test_user.id) == 0
@@ -0,0 +1,92 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+
+from api.domains.users.crud import UserService
+from api.domains.users.models import FileStorageMetadata, FileType
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+class TestUserFilesEndpoint:
+
+    @pytest.fixture
+    def files(self, db_session, test_user):
+        """Seven files, one per hour; two share a timestamp"""
+        file_types = [FileType.AUDIO, FileType.TEXT, FileType.RESULT]
+        created = [START + timedelta(hours=i) for i in range(6)] + [START + timedelta(hours=5)]
+        for i, created_at in enumerate(created):
+            db_session.add(FileStorageMetadata(
+                user_id=test_user.id,
+                task_id=1 if i < 3 else 2,
+                file_type=file_types[i % 3],
+                original_filename=f"file_{i}",
+                storage_path=f"{test_user.id}/corpus/{i}",
+                file_size=100,
+                created_at=created_at
+            ))
+        db_session.commit()
+        return [
+            row.id for row in db_session.query(FileStorageMetadata).order_by(
+                FileStorageMetadata.created_at.desc(), FileStorageMetadata.id.desc()
+            )
+        ]
+
+    def test_cursor_pagination(self, client, auth_headers, files):
+        """Test that following cursors returns every file exactly once, newest first"""
+        seen, cursor = [], None
+        for _ in range(10):
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/users/files", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            seen.extend(file["id"] for file in response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+
+        assert seen == files
+
+    def test_last_page_has_no_cursor(self, client, auth_headers, files):
+        """Test that a page holding the remaining files has no next cursor"""
+        response = client.get("/users/files", params={"limit": 7}, headers=auth_headers)
+
+        assert len(response.json()) == 7
+        assert "x-next-cursor" not in response.headers
+
+    def test_filters(self, client, auth_headers, files):
+        """Test type, task and date range filters"""
+        response = client.get("/users/files", params={"file_type": "audio"}, headers=auth_headers)
+        assert {file["file_type"] for file in response.json()} == {"audio"}
+        assert len(response.json()) == 3
+
+        response = client.get("/users/files", params={"task_id": 2}, headers=auth_headers)
+        assert len(response.json()) == 4
+
+        response = client.get("/users/files", params={
+            "created_from": (START + timedelta(hours=1)).isoformat(),
+            "created_to": (START + timedelta(hours=3)).isoformat()
+        }, headers=auth_headers)
+        assert [file["original_filename"] for file in response.json()] == ["file_2", "file_1"]
+
+    def test_ndjson_export(self, client, auth_headers, files):
+        """Test that NDJSON mode streams all matching files"""
+        response = client.get("/users/files", params={"format": "ndjson", "limit": 2}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == files
+
+    def test_invalid_parameters(self, client, auth_headers, files):
+        """Test rejection of malformed cursors and unknown file types"""
+        response = client.get("/users/files", params={"cursor": "not-a-cursor"}, headers=auth_headers)
+        assert response.status_code == 400
+
+        response = client.get("/users/files", params={"file_type": "video"}, headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_iter_user_files_in_batches(self, db_session, test_user, files):
+        """Test that keyset batches cover all files, including timestamp ties"""
+        ids = [file.id for file in UserService.iter_user_files(db_session, test_user.id, batch_size=2)]
+
+        assert ids == files
@@ -0,0 +1,139 @@
+import io
+import json
+import wave
+import pytest
+
+from api.cache import TTLCache
+from api.domains.alignment.audio import store_corpus_audio
+from api.domains.alignment.crud import create_alignment_task
+from api.domains.alignment.paths import corpus_file_path, result_file_path
+from api.domains.alignment.schemas import AlignmentQueueCreate, ModelParameter
+from api.domains.alignment.words import load_word_index, word_index_cache
+from shared.results.store import save_alignment_result
+from shared.results.word_index import WordIndex, encode_word_index, normalize_token, word_index_path_for
+from tests.test_audio_segments import add_corpus_file, make_wav
+
+RESULT = {
+    "start": 0,
+    "end": 10,
+    "tiers": {
+        "words": {"type": "interval", "entries": [
+            [0.5, 1.0, "Hello,"],
+            [1.0, 1.2, ""],
+            [1.2, 1.8, "world"],
+            [3.0, 3.5, "hello"],
+            [4.0, 4.2, "<unk>"],
+        ]},
+        "phones": {"type": "interval", "entries": []}
+    }
+}
+
+
+class TestWordIndex:
+
+    def test_normalize_token(self):
+        """Test case folding and punctuation stripping"""
+        assert normalize_token("Hello,") == "hello"
+        assert normalize_token("«Привет»") == "привет"
+        assert normalize_token("don't") == "don't"
+
+    def test_lookup_all_occurrences(self):
+        """Test that all occurrences of a word are returned in order"""
+        index = WordIndex(encode_word_index(RESULT))
+
+        assert index.lookup("HELLO") == [(0.5, 1.0), (3.0, 3.5)]
+        assert index.lookup("world") == [(pytest.approx(1.2), pytest.approx(1.8))]
+        assert index.lookup("missing") == []
+
+    def test_placeholders_are_skipped(self):
+        """Test that silence and unknown-word labels are not indexed"""
+        index = WordIndex(encode_word_index(RESULT))
+
+        assert len(index) == 2
+        assert "<unk>" not in index
+
+    def test_cached_index_expires(self, storage, monkeypatch):
+        """Test that a cached word index is reloaded from storage after its TTL"""
+        import api.domains.alignment.words as words
+        clock = [0.0]
+        monkeypatch.setattr(words, "word_index_cache", TTLCache(2, 10, clock=lambda: clock[0]))
+        storage.objects["1/results/1/1.json"] = json.dumps(RESULT).encode()
+        index = load_word_index(storage, "1/results/1/1.json")
+
+        assert load_word_index(storage, "1/results/1/1.json") is index
+        clock[0] = 11
+        assert load_word_index(storage, "1/results/1/1.json") is not index
+
+    def test_index_built_from_legacy_result(self, storage):
+        """Test that a missing word index is built from the JSON result once"""
+        storage.objects["1/results/1/1.json"] = json.dumps(RESULT).encode()
+
+        index = load_word_index(storage, "1/results/1/1.json")
+
+        assert index.lookup("world")
+        assert word_index_path_for("1/results/1/1.json") in storage.objects
+        assert load_word_index(storage, "1/results/1/1.json") is index
+
+    def test_index_built_from_columnar_result(self, storage):
+        """Test that a missing word index is built from the columnar word sections, not the JSON"""
+        save_alignment_result(storage, "1/results/1/1.json", RESULT)
+        del storage.objects[word_index_path_for("1/results/1/1.json")]
+        # Parsing the JSON would fail
+        storage.objects["1/results/1/1.json"] = b"not read"
+
+        index = load_word_index(storage, "1/results/1/1.json")
+
+        assert index.lookup("hello") == [(0.5, 1.0), (3.0, 3.5)]
+        assert storage.objects[word_index_path_for("1/results/1/1.json")] == encode_word_index(RESULT)
+
+
+class TestWordAudioEndpoint:
+
+    @pytest.fixture
+    def task(self, db_session, test_user, storage):
+        task = create_alignment_task(db_session, AlignmentQueueCreate(
+            original_audio_filename="speech.wav",
+            original_text_filename="speech.txt",
+            acoustic_model=ModelParameter(name="test_acoustic", version="1.0.0"),
+            dictionary_model=ModelParameter(name="test_dictionary", version="1.0.0")
+        ), "audio.wav", "text.txt", test_user.id)
+        add_corpus_file(db_session, task, 1)
+        store_corpus_audio(storage, corpus_file_path(task.user_id, task.id, 1, "wav"), make_wav(10), "wav")
+        save_alignment_result(storage, result_file_path(task.user_id, task.id, 1), RESULT)
+        return task
+
+    def test_word_audio(self, client, storage, task, auth_headers):
+        """Test that the audio of the requested occurrence is returned"""
+        response = client.get(f"/alignment/{task.id}/audio/1/word?word=hello&occurrence=1", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["x-word-occurrences"] == "2"
+        assert response.headers["x-segment-start"] == "3.000"
+        with wave.open(io.BytesIO(response.content)) as wav:
+            assert wav.getnframes() == 8000
+
+    def test_word_index_is_cached(self, client, storage, task, auth_headers):
+        """Test that repeated lookups do not read the index from storage again"""
+        client.get(f"/alignment/{task.id}/audio/1/word?word=hello", headers=auth_headers)
+        index_path = word_index_path_for(result_file_path(task.user_id, task.id, 1))
+        del storage.objects[index_path]
+
+        response = client.get(f"/alignment/{task.id}/audio/1/word?word=world", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert word_index_cache.get(index_path) is not None
+
+    def test_word_not_found(self, client, storage, task, auth_headers):
+        """Test 404 for unknown words and occurrences"""
+        response = client.get(f"/alignment/{task.id}/audio/1/word?word=absent", headers=auth_headers)
+        assert response.status_code == 404
+
+        response = client.get(f"/alignment/{task.id}/audio/1/word?word=world&occurrence=1", headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_result_not_found(self, client, db_session, storage, task, auth_headers):
+        """Test 404 when the corpus file has no result yet"""
+        add_corpus_file(db_session, task, 2)
+        response = client.get(f"/alignment/{task.id}/audio/2/word?word=hello", headers=auth_headers)
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Alignment result not found"
@@ -0,0 +1,101 @@
+"""
+Alignment of the corpus files of a task.
+
+Every corpus file is aligned by its own Celery task, so the files of a
+large corpus are spread over all worker processes, and each result is
+stored as soon as its file is done.
+"""
+
+import logging
+import os
+import tempfile
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from api.domains.alignment.crud import finish_alignment_task, get_corpus_file, set_corpus_file_status
+from api.domains.alignment.models import AlignmentQueue, AlignmentStatus, CorpusFile
+from api.domains.alignment.paths import corpus_file_path, file_extension, result_file_path
+from shared.results import save_alignment_result
+
+logger = logging.getLogger(__name__)
+
+
+# MFA itself will be integrated in Step 5; until then tasks stay pending
+ALIGNER_AVAILABLE = False
+
+
+class AlignmentError(RuntimeError):
+    """Raised when a corpus file cannot be aligned."""
+
+
+class AlignerUnavailable(AlignmentError):
+    """Raised when no aligner is installed; the file is left for a later run."""
+
+
+def run_aligner(audio_path: str, text_path: str, task: AlignmentQueue) -> Dict:
+    """
+    Align one local audio/text pair with the task's models.
+
+    Returns:
+        dict: MFA JSON result
+    """
+    # This is a placeholder - MFA itself will be integrated in Step 5
+    raise AlignerUnavailable("MFA processing not implemented yet (Step 5)")
+
+
+def _download(storage, storage_path: str, local_path: str) -> None:
+    data = storage.download_file(storage_path)
+    if data is None:
+        raise AlignmentError(f"Corpus file {os.path.basename(storage_path)} not found")
+    with open(local_path, "wb") as f:
+        f.write(data)
+
+
+def align_corpus_file(db: Session, storage, corpus_file_id: int) -> Optional[AlignmentStatus]:
+    """
+    Align one corpus file and store its result.
+
+    The file's status is tracked in ``corpus_files``; a failure only fails
+    this file. The task is finished by whichever file completes last.
+    Without an aligner the file goes back to pending instead of failing.
+
+    Args:
+        db: Database session
+        storage: Storage service (e.g. MinIOService)
+        corpus_file_id: Corpus file to align
+
+    Returns:
+        AlignmentStatus: Final status of the file, None if it doesn't exist
+    """
+    corpus_file: CorpusFile = get_corpus_file(db, corpus_file_id)
+    if corpus_file is None:
+        return None
+    task = corpus_file.task
+    set_corpus_file_status(db, corpus_file, AlignmentStatus.PROCESSING)
+
+    try:
+        with tempfile.TemporaryDirectory(prefix=f"corpus-{corpus_file.id}-") as workdir:
+            local_paths = []
+            for filename in (corpus_file.original_audio_filename, corpus_file.original_text_filename):
+                extension = file_extension(filename)
+                local_path = os.path.join(workdir, f"{corpus_file.id}.{extension}")
+                _download(storage, corpus_file_path(task.user_id, task.id, corpus_file.id, extension), local_path)
+                local_paths.append(local_path)
+            result = run_aligner(*local_paths, task)
+        if not save_alignment_result(storage, result_file_path(task.user_id, task.id, corpus_file.id), result):
+            raise AlignmentError("Failed to store alignment result")
+    except AlignerUnavailable as e:
+        logger.warning(f"Corpus file {corpus_file.id} of task {task.id} left pending: {e}")
+        set_corpus_file_status(db, corpus_file, AlignmentStatus.PENDING)
+        return corpus_file.status
+    except Exception as e:
+        logger.error(f"Alignment of corpus file {corpus_file.id} of task {task.id} failed: {e}")
+        set_corpus_file_status(db, corpus_file, AlignmentStatus.FAILED, str(e))
+    else:
+        set_corpus_file_status(db, corpus_file, AlignmentStatus.COMPLETED)
+
+    task_status = finish_alignment_task(db, task.id)
+    if task_status is not None:
+        logger.info(f"Alignment task {task.id} finished: {task_status.value}")
+    return corpus_file.status
@@ -0,0 +1,55 @@
+"""
+Background refresh of the model catalog.
+
+The refresh pulls the mfa-models repository and syncs the catalog, which
+takes from seconds to minutes, so it runs on a worker instead of in an API
+request. Refreshes are single-flight: one requested while another is
+pending or running joins it.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from api.domains.models.crud import claim_catalog_refresh, finish_catalog_refresh, start_catalog_refresh
+from api.domains.models.models import CatalogRefresh
+from api.domains.models.services.mfa_service import MFAModelService
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_catalog(db: Session, refresh_id: Optional[int] = None) -> Optional[CatalogRefresh]:
+    """
+    Run a catalog refresh.
+
+    Args:
+        db: Database session
+        refresh_id: Refresh started by the API; None starts one here
+            (scheduled refreshes) unless one is already active
+
+    Returns:
+        CatalogRefresh: The finished refresh, None if there was nothing to run
+    """
+    if refresh_id is None:
+        refresh, created = start_catalog_refresh(db)
+        if not created:
+            logger.info(f"Catalog refresh {refresh.id} already in progress, skipping")
+            return None
+        refresh_id = refresh.id
+
+    # A redelivered message must not run the refresh twice
+    if not claim_catalog_refresh(db, refresh_id):
+        logger.info(f"Catalog refresh {refresh_id} already claimed")
+        return None
+
+    try:
+        updated_models, updated_languages = asyncio.run(MFAModelService().update_models_from_github(db))
+    except Exception as e:
+        logger.error(f"Catalog refresh {refresh_id} failed: {e}")
+        finish_catalog_refresh(db, refresh_id, error=str(e))
+    else:
+        finish_catalog_refresh(db, refresh_id, updated_models, updated_languages)
+        logger.info(f"Catalog refresh {refresh_id} finished: {updated_models} models, {updated_languages} languages")
+    return db.get(CatalogRefresh, refresh_id, populate_existing=True)
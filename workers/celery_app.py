@@ -3,7 +3,9 @@ Celery application configuration for alignment workers.
 """
 
 import os
+import threading
 from celery import Celery
+from celery.signals import worker_process_init
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -35,7 +37,40 @@ celery_app.conf.update(
 celery_app.conf.task_routes = {
     'workers.tasks.ping_task': {'queue': 'celery'},
     'workers.tasks.process_alignment_task': {'queue': 'celery'},
+    'workers.tasks.process_corpus_file': {'queue': 'celery'},
+    'workers.tasks.refresh_model_catalog': {'queue': 'celery'},
+    'workers.tasks.reconcile_storage_usage': {'queue': 'celery'},
+    'workers.tasks.republish_alignment_tasks': {'queue': 'celery'},
 }
 
+# Periodic jobs (run `celery beat`); an interval of 0 disables the job
+MODEL_CATALOG_REFRESH_INTERVAL = int(os.getenv('MODEL_CATALOG_REFRESH_INTERVAL', str(6 * 60 * 60)))
+STORAGE_RECONCILE_INTERVAL = int(os.getenv('STORAGE_RECONCILE_INTERVAL', str(24 * 60 * 60)))
+ALIGNMENT_REPUBLISH_INTERVAL = int(os.getenv('ALIGNMENT_REPUBLISH_INTERVAL', str(5 * 60)))
+celery_app.conf.beat_schedule = {
+    name: {'task': task, 'schedule': interval}
+    for name, task, interval in (
+        ('refresh-model-catalog', 'workers.tasks.refresh_model_catalog', MODEL_CATALOG_REFRESH_INTERVAL),
+        ('reconcile-storage-usage', 'workers.tasks.reconcile_storage_usage', STORAGE_RECONCILE_INTERVAL),
+        ('republish-alignment-tasks', 'workers.tasks.republish_alignment_tasks', ALIGNMENT_REPUBLISH_INTERVAL),
+    )
+    if interval > 0
+}
+
+
+@worker_process_init.connect
+def warm_up_storage(**kwargs):
+    """Open this child's MinIO pool without delaying its startup."""
+    from shared.storage import minio_service
+    threading.Thread(target=minio_service.warm_up, name="storage-warm-up", daemon=True).start()
+
+
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    """Drop connections inherited from the parent; the child opens its own."""
+    from api.database import engine
+    engine.dispose(close=False)
+
+
 if __name__ == '__main__':
     celery_app.start()
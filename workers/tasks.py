@@ -4,6 +4,7 @@ Celery tasks for alignment processing.
 
 import time
 from datetime import datetime
+from celery import group
 from workers.celery_app import celery_app
 
 
@@ -40,7 +41,11 @@ def ping_task(self, message: str = "ping"):
 @celery_app.task(bind=True, name='workers.tasks.process_alignment_task')
 def process_alignment_task(self, task_id: int):
     """
-    Process MFA alignment task (placeholder for Step 5).
+    Start an alignment task by fanning its corpus out to the workers.
+    
+    Every corpus file still to be aligned gets its own
+    ``process_corpus_file`` task, so files are aligned in parallel and
+    their results become available one by one.
     
     Args:
         task_id: ID of alignment task from database
@@ -48,9 +53,121 @@ def process_alignment_task(self, task_id: int):
     Returns:
         dict: Processing result
     """
-    # This is a placeholder - will be implemented in Step 5
+    from api.database import SessionLocal
+    from api.domains.alignment.crud import finish_alignment_task, start_alignment_task
+    from workers.alignment import ALIGNER_AVAILABLE
+
+    if not ALIGNER_AVAILABLE:
+        # Leave the task pending rather than failing every file
+        return {
+            'task_id': task_id,
+            'status': 'placeholder',
+            'message': 'MFA processing not implemented yet (Step 5)'
+        }
+
+    with SessionLocal() as db:
+        corpus_file_ids = start_alignment_task(db, task_id)
+        if corpus_file_ids is None:
+            return {'task_id': task_id, 'status': 'not_found'}
+        if not corpus_file_ids:
+            # Redelivered after all files were aligned
+            status = finish_alignment_task(db, task_id)
+            return {'task_id': task_id, 'status': status.value if status else 'finished'}
+
+    group(process_corpus_file.s(task_id, corpus_file_id) for corpus_file_id in corpus_file_ids).apply_async()
     return {
         'task_id': task_id,
-        'status': 'placeholder',
-        'message': 'MFA processing not implemented yet (Step 5)'
+        'status': 'processing',
+        'corpus_files': len(corpus_file_ids)
     }
+
+
+@celery_app.task(bind=True, name='workers.tasks.process_corpus_file')
+def process_corpus_file(self, task_id: int, corpus_file_id: int):
+    """
+    Align one corpus file of an alignment task.
+    
+    Args:
+        task_id: ID of alignment task from database
+        corpus_file_id: ID of the corpus file of that task
+        
+    Returns:
+        dict: Processing result
+    """
+    from api.database import SessionLocal
+    from shared.storage import minio_service
+    from workers.alignment import align_corpus_file
+
+    with SessionLocal() as db:
+        status = align_corpus_file(db, minio_service, corpus_file_id)
+    return {
+        'task_id': task_id,
+        'corpus_file_id': corpus_file_id,
+        'status': status.value if status else 'not_found'
+    }
+
+
+@celery_app.task(bind=True, name='workers.tasks.refresh_model_catalog')
+def refresh_model_catalog(self, refresh_id: int = None):
+    """
+    Refresh the model catalog from the mfa-models repository.
+    
+    Args:
+        refresh_id: Refresh started through the API; None for scheduled refreshes
+        
+    Returns:
+        dict: Refresh result
+    """
+    from api.database import SessionLocal
+    from workers.catalog import refresh_catalog
+
+    with SessionLocal() as db:
+        refresh = refresh_catalog(db, refresh_id)
+        if refresh is None:
+            return {'refresh_id': refresh_id, 'status': 'skipped'}
+        return {
+            'refresh_id': refresh.id,
+            'status': refresh.status.value,
+            'updated_models': refresh.updated_models,
+            'updated_languages': refresh.updated_languages
+        }
+
+
+@celery_app.task(bind=True, name='workers.tasks.reconcile_storage_usage')
+def reconcile_storage_usage(self):
+    """
+    Correct drift of users' storage usage from their file metadata.
+    
+    Returns:
+        dict: Number of corrected users
+    """
+    from cleanup.reconcile_storage import main
+
+    return {'corrected_users': main()}
+
+
+@celery_app.task(bind=True, name='workers.tasks.republish_alignment_tasks')
+def republish_alignment_tasks(self, min_age: int = 60):
+    """
+    Publish pending tasks whose enqueue failed when they were created.
+    
+    Batch tasks get their Celery ids before being published, so a broker
+    outage leaves them pending with ``enqueued_at`` unset. They are
+    published again under the same Celery ids.
+    
+    Args:
+        min_age: Seconds a task must exist before it is considered lost
+        
+    Returns:
+        dict: Number of republished tasks
+    """
+    from api.database import SessionLocal
+    from api.domains.alignment.crud import get_unpublished_alignment_tasks, mark_alignment_tasks_enqueued
+    from api.domains.alignment.queue import CeleryTaskQueue
+
+    with SessionLocal() as db:
+        tasks = get_unpublished_alignment_tasks(db, min_age)
+        if tasks:
+            CeleryTaskQueue().enqueue([(task.id, task.celery_task_id) for task in tasks])
+            mark_alignment_tasks_enqueued(db, [task.id for task in tasks])
+        return {'republished_tasks': len(tasks)}